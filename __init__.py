@@ -1,26 +1,21 @@
-from .models.users import UserSchema, UserLoginSchema, UserCreateSchema, Role
-from .models.tests import (
-    TestCreateSchema,
-    TestSchema,
-    QuestionCreateSchema,
-    QuestionSchema,
-    AnswerCreateSchema,
-    AnswerSchema,
-    Level,
-    QuestionType,
-)
+"""
+Shared Pydantic models for Interview Prep App.
+Exported names are resolved lazily from `models` on first access.
+"""
+from typing import Any, List
 
-__all__ = [
-    "UserSchema",
-    "UserLoginSchema",
-    "UserCreateSchema",
-    "Role",
-    "TestCreateSchema",
-    "TestSchema",
-    "QuestionCreateSchema",
-    "QuestionSchema",
-    "AnswerCreateSchema",
-    "AnswerSchema",
-    "Level",
-    "QuestionType",
-]
+from . import models
+
+__all__ = list(models.__all__)
+
+
+def __getattr__(name: str) -> Any:
+    if name not in __all__:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(models, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,40 @@
+"""
+Payload size and speed of `to_bytes`/`from_bytes` against `model_dump_json`/`model_validate_json`
+for a TestSchema with 20 and 50 questions.
+
+Run from the repository root:
+    python -m benchmarks.codec
+"""
+import timeit
+
+from models import TestSchema
+from benchmarks import data
+
+NUMBER = 500
+
+
+def make_test(number_of_questions: int) -> TestSchema:
+    return TestSchema.model_validate(data.rows(data.test_row, 1, number_of_questions=number_of_questions)[0])
+
+
+def per_second(function) -> float:
+    return NUMBER / min(timeit.repeat(function, number=NUMBER, repeat=5))
+
+
+def main():
+    for number_of_questions in (20, 50):
+        test = make_test(number_of_questions)
+        json_payload = test.model_dump_json().encode()
+        binary_payload = test.to_bytes()
+        assert TestSchema.from_bytes(binary_payload).model_dump_json() == test.model_dump_json()
+        print(f"TestSchema with {number_of_questions} questions")
+        print(f"  size      json {len(json_payload):>8,} B   binary {len(binary_payload):>8,} B "
+              f"({len(binary_payload) / len(json_payload):.0%})")
+        print(f"  dump      json {per_second(test.model_dump_json):>8,.0f}/s   "
+              f"binary {per_second(test.to_bytes):>8,.0f}/s")
+        print(f"  load      json {per_second(lambda: TestSchema.model_validate_json(json_payload)):>8,.0f}/s   "
+              f"binary {per_second(lambda: TestSchema.from_bytes(binary_payload)):>8,.0f}/s")
+
+
+if __name__ == '__main__':
+    main()
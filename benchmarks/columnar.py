@@ -0,0 +1,67 @@
+"""
+Export of solved tests for analytics: `model_dump()` into lists of dicts against the columnar
+writer (and Parquet through pyarrow, when installed).
+
+Run from the repository root:
+    python -m benchmarks.columnar [--tests 2000]
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+from typing import List
+
+from models import TestSchema, iter_chunks, read_columnar, write_columnar, write_parquet
+from models import columnar
+from benchmarks import data
+
+
+def measure(function):
+    """
+    Best time of 3 runs, then peak traced memory of a separate run (tracing slows Python code down).
+    """
+    seconds = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        function()
+        seconds = min(seconds, time.perf_counter() - start)
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak
+
+
+def dump_rows(tests):
+    return [test.model_dump() for test in tests]
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tests", type=int, default=2_000)
+    args = parser.parse_args(argv)
+    tests = [TestSchema.model_validate(row) for row in data.rows(data.test_row, args.tests)]
+    print(f"{args.tests:,} tests with 20 questions")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "tests.col")
+        cases = [
+            ("model_dump()", lambda: dump_rows(tests)),
+            ("columns in memory", lambda: list(iter_chunks(tests))),
+            ("columnar file", lambda: write_columnar(tests, path)),
+        ]
+        if columnar.pa is not None:
+            cases.append(("parquet", lambda: write_parquet(tests, directory)))
+        for name, function in cases:
+            seconds, peak = measure(function)
+            print(f"  {name:<18} {args.tests / seconds:>9,.0f} tests/s   peak {peak / 2**20:>7.1f} MiB")
+
+        seconds, _ = measure(lambda: sum(chunk["score"].to_numpy().sum() if columnar.np is not None else
+                                         sum(chunk["score"].to_pylist())
+                                         for chunk in read_columnar(path).chunks("questions")))
+        print(f"  mean score over the mapped file in {seconds * 1000:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
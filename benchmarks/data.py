@@ -0,0 +1,127 @@
+"""
+Deterministic synthetic payloads (raw dicts, as received by the services) for benchmarks.
+"""
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from models import Level, QuestionType, Role
+
+SKILLS = ['Python', 'SQL', 'Docker', 'Django', 'FastAPI', 'Kubernetes', 'Git', 'Linux', 'AWS', 'Redis']
+POSITIONS = ['Backend Developer', 'Data Engineer', 'DevOps Engineer', 'Software Developer', 'QA Engineer']
+FIRST_NAMES = ['Alice', 'Bob', 'Carol', 'Dave', 'Eve', 'Frank', 'Grace', 'Heidi']
+SURNAMES = ['Smith', 'Brown', 'Nowak', 'Kowalski', 'Doe', 'Miller', 'Wilson']
+
+
+def _uuid(rng: random.Random) -> str:
+    return str(UUID(int=rng.getrandbits(128), version=4))
+
+
+def user_create_row(rng: random.Random) -> Dict[str, Any]:
+    first_name = rng.choice(FIRST_NAMES)
+    surname = rng.choice(SURNAMES)
+    password = f"Str0ng!{rng.getrandbits(32):08x}Pass"
+    return {
+        'first_name': first_name,
+        'surname': surname,
+        'email': f"{first_name}.{surname}{rng.randrange(10_000)}@example.com".lower(),
+        'password': password,
+        'confirm_password': password,
+    }
+
+
+def user_login_row(rng: random.Random) -> Dict[str, Any]:
+    return {
+        'username': f"{rng.choice(FIRST_NAMES)}.{rng.choice(SURNAMES)}{rng.randrange(10_000)}@example.com".lower(),
+        'password': f"Str0ng!{rng.getrandbits(32):08x}Pass",
+    }
+
+
+def user_row(rng: random.Random) -> Dict[str, Any]:
+    first_name = rng.choice(FIRST_NAMES)
+    surname = rng.choice(SURNAMES)
+    created = datetime(2024, 1, 1, tzinfo=timezone.utc) + timedelta(seconds=rng.randrange(30_000_000))
+    return {
+        'id': _uuid(rng),
+        'first_name': first_name,
+        'surname': surname,
+        'username_email': f"{first_name}.{surname}{rng.randrange(10_000)}@example.com".lower(),
+        'roles': [Role.REGULAR.value] + ([Role.MANAGER.value] if rng.random() < 0.1 else []),
+        'tests': [],
+        'create_datetime': created.isoformat(),
+    }
+
+
+def test_create_row(rng: random.Random) -> Dict[str, Any]:
+    return {
+        'user_id': _uuid(rng),
+        'position': rng.choice(POSITIONS),
+        'level': rng.choice(list(Level)).value,
+        'number_of_question': rng.randint(1, 50),
+        'type_of_question': [question_type.value for question_type in
+                             rng.sample(list(QuestionType), rng.randint(1, len(QuestionType)))],
+        'skills_or_tools': rng.sample(SKILLS, rng.randint(1, 4)),
+    }
+
+
+def question_row(rng: random.Random, test_id: str, number: int,
+                 question_type: Optional[QuestionType] = None) -> Dict[str, Any]:
+    question_type = question_type or rng.choice(list(QuestionType))
+    if question_type is QuestionType.TRUE_FALSE:
+        possible_answers = {'A': 'TRUE', 'B': 'FALSE'}
+        correct_answers = [rng.choice('AB')]
+    else:
+        keys = 'ABCDE'[:rng.randint(3, 5)]
+        possible_answers = {key: f"Answer {key} for question {number}" for key in keys}
+        if question_type is QuestionType.SINGLE_CHOICE:
+            correct_answers = [rng.choice(keys)]
+        else:
+            correct_answers = sorted(rng.sample(keys, rng.randint(1, len(keys))))
+    return {
+        'id': _uuid(rng),
+        'test_id': test_id,
+        'question_number': number,
+        'question_text': f"Question {number}: which statement about {rng.choice(SKILLS)} is true?",
+        'question_type': question_type.value,
+        'possible_answers': possible_answers,
+        'correct_answers': correct_answers,
+    }
+
+
+def question_create_row(rng: random.Random, question_type: Optional[QuestionType] = None) -> Dict[str, Any]:
+    row = question_row(rng, _uuid(rng), rng.randint(1, 50), question_type)
+    del row['id']
+    return row
+
+
+def answer_create_row(rng: random.Random) -> Dict[str, Any]:
+    return {'question_id': _uuid(rng), 'answer_choice': rng.sample('ABCDE', rng.randint(1, 2))}
+
+
+def answer_row(rng: random.Random) -> Dict[str, Any]:
+    return {'id': _uuid(rng), **answer_create_row(rng)}
+
+
+def test_row(rng: random.Random, number_of_questions: int = 20) -> Dict[str, Any]:
+    row = test_create_row(rng)
+    test_id = _uuid(rng)
+    questions = [question_row(rng, test_id, number) for number in range(1, number_of_questions + 1)]
+    answers = [{'id': _uuid(rng), 'question_id': question['id'],
+                'answer_choice': rng.sample(list(question['possible_answers']), 1)}
+               for question in questions if rng.random() < 0.8]
+    row.update({
+        'id': test_id,
+        'number_of_question': number_of_questions,
+        'type_of_question': [question_type.value for question_type in QuestionType],
+        'is_solved': bool(answers) and len(answers) == len(questions),
+        'questions': questions,
+        'answers': answers,
+        'result': None,
+    })
+    return row
+
+
+def rows(factory, count: int, seed: int = 0, **kwargs) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    return [factory(rng, **kwargs) for _ in range(count)]
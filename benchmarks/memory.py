@@ -0,0 +1,61 @@
+"""
+Memory held by a cache of validated questions, answers and users: regular models against the
+interned frozen variants, for payloads where the same records arrive many times.
+
+Run from the repository root:
+    python -m benchmarks.memory
+"""
+import gc
+import random
+import tracemalloc
+
+from models import (AnswerSchema, FrozenAnswerSchema, FrozenQuestionSchema, FrozenUserSchema, QuestionSchema,
+                    UserSchema)
+from benchmarks import data
+
+DISTINCT = 2_000
+TOTAL = 20_000
+
+
+def answer_row(rng: random.Random):
+    return {'id': data._uuid(rng), 'question_id': data._uuid(rng), 'answer_choice': [rng.choice('ABCDE')]}
+
+
+def question_row(rng: random.Random):
+    return data.question_row(rng, data._uuid(rng), rng.randint(1, 50))
+
+
+def payload(factory):
+    distinct = data.rows(factory, DISTINCT)
+    rng = random.Random(1)
+    # Every record repeated, as decoded from separate requests: equal, but not identical, dicts.
+    return [dict(rng.choice(distinct)) for _ in range(TOTAL)]
+
+
+def held(build, rows) -> int:
+    gc.collect()
+    tracemalloc.start()
+    cache = build(rows)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del cache
+    return size
+
+
+def main():
+    print(f"{TOTAL:,} records, {DISTINCT:,} distinct")
+    for name, regular, frozen, factory in (
+            ('AnswerSchema', AnswerSchema, FrozenAnswerSchema, answer_row),
+            ('QuestionSchema', QuestionSchema, FrozenQuestionSchema, question_row),
+            ('UserSchema', UserSchema, FrozenUserSchema, data.user_row)):
+        rows = payload(factory)
+        regular.model_validate(rows[0])
+        frozen.intern(rows[0])
+        plain = held(lambda items: [regular.model_validate(item) for item in items], rows)
+        interned = held(lambda items: [frozen.intern(item) for item in items], rows)
+        print(f"  {name:<16} regular {plain / 2**20:>7.2f} MiB   interned {interned / 2**20:>7.2f} MiB "
+              f"({interned / plain:.0%})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""
+Scaling of `validate_parallel` across worker counts for bulk imports of questions and users.
+
+Run from the repository root:
+    python -m benchmarks.parallel [--rows 200000] [--chunk-size 5000]
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List
+
+from models import QuestionCreateSchema, UserCreateSchema, validate_parallel
+from benchmarks import data
+
+
+def question_create_row(rng):
+    row = data.question_row(rng, data._uuid(rng), rng.randint(1, 50))
+    del row['id']
+    return row
+
+
+def worker_counts() -> List[int]:
+    cpus = os.cpu_count() or 1
+    counts = [1]
+    while counts[-1] * 2 <= cpus:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != cpus:
+        counts.append(cpus)
+    return counts
+
+
+def elapsed(model: type, rows: list, workers: int, chunk_size: int) -> float:
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Workers are started and their adapters built before timing.
+        list(validate_parallel(model, rows[:chunk_size * workers], chunk_size=chunk_size, executor=executor))
+        start = time.perf_counter()
+        for _ in validate_parallel(model, rows, chunk_size=chunk_size, executor=executor):
+            pass
+        return time.perf_counter() - start
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--chunk-size", type=int, default=5_000)
+    args = parser.parse_args(argv)
+
+    for model, factory in ((QuestionCreateSchema, question_create_row), (UserCreateSchema, data.user_create_row)):
+        rows = data.rows(factory, args.rows)
+        start = time.perf_counter()
+        for _ in validate_parallel(model, rows, workers=1, chunk_size=args.chunk_size):
+            pass
+        baseline = time.perf_counter() - start
+        print(f"{model.__name__}, {args.rows:,} rows")
+        print(f"  in-process {args.rows / baseline:>10,.0f} rows/s")
+        for workers in worker_counts():
+            seconds = elapsed(model, rows, workers, args.chunk_size)
+            print(f"  {workers:>2} workers {args.rows / seconds:>10,.0f} rows/s  x{baseline / seconds:.2f}")
+
+
+if __name__ == '__main__':
+    main()
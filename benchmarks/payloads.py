@@ -0,0 +1,40 @@
+"""
+Payload generation throughput (dicts and JSON bytes, 20% mutated) and a fuzz run for every
+exported schema: payloads per second, rejected share, slowest validation and failures.
+
+Run from the repository root:
+    python -m benchmarks.payloads
+"""
+import time
+from collections import deque
+
+from pydantic import BaseModel
+
+import models
+from models import TestSchema, TestSummarySchema, fuzz, iter_payloads
+
+COUNT = 20_000
+# Tests carry whole question lists, oversized ones included.
+SMALL_COUNT = 500
+MODELS = [getattr(models, name) for name in models.__all__
+          if isinstance(getattr(models, name), type) and issubclass(getattr(models, name), BaseModel)]
+
+
+def rate(model: type, count: int, as_json: bool) -> float:
+    start = time.perf_counter()
+    deque(iter_payloads(model, count, seed=1, as_json=as_json), maxlen=0)
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    print(f"{'schema':<22} {'dicts/s':>10} {'json/s':>10}   fuzz: {'rejected':>8} {'max ms':>8}  failures")
+    for model in MODELS:
+        count = SMALL_COUNT if model in (TestSchema, TestSummarySchema) else COUNT
+        report = fuzz(model, count, seed=2)
+        failures = len(report.crashes) + len(report.slow) + len(report.mismatches)
+        print(f"{model.__name__:<22} {rate(model, count, False):>10.0f} {rate(model, count, True):>10.0f}"
+              f"         {report.rejected / report.checked:>8.0%} {report.max_seconds * 1000:>8.2f}  {failures}")
+
+
+if __name__ == '__main__':
+    main()
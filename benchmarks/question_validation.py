@@ -0,0 +1,91 @@
+"""
+Question validation rate: the former Python-only validator versus the current
+QuestionCreateSchema and the discriminated QuestionCreateVariant union.
+QuestionSchema and TestSchema.questions validate like QuestionCreateSchema - only
+`question_create_adapter` takes the core-level path.
+
+Run from the repository root:
+    python -m benchmarks.question_validation
+"""
+import timeit
+from typing import Dict, List
+from uuid import UUID
+
+from pydantic import BaseModel, Field, model_validator
+
+from models import QuestionCreateSchema, QuestionType, question_create_adapter
+
+NUMBER = 20_000
+
+ROWS = [
+    {
+        'test_id': '3f97fc69-9253-40c2-94c7-f8307ff70302',
+        'question_number': 1,
+        'question_text': 'Is Python dynamically typed?',
+        'question_type': QuestionType.TRUE_FALSE,
+        'possible_answers': {'A': 'TRUE', 'B': 'FALSE'},
+        'correct_answers': ['A']
+    },
+    {
+        'test_id': '3f97fc69-9253-40c2-94c7-f8307ff70302',
+        'question_number': 2,
+        'question_text': 'What is Python?',
+        'question_type': QuestionType.SINGLE_CHOICE,
+        'possible_answers': {'A': 'Dog', 'B': 'Programing Language', 'C': 'Snake'},
+        'correct_answers': ['B']
+    },
+    {
+        'test_id': '3f97fc69-9253-40c2-94c7-f8307ff70302',
+        'question_number': 3,
+        'question_text': 'Which are Python web frameworks?',
+        'question_type': QuestionType.MULTIPLE_CHOICE,
+        'possible_answers': {'A': 'Django', 'B': 'Flask', 'C': 'Spring', 'D': 'FastAPI'},
+        'correct_answers': ['A', 'B', 'D']
+    },
+]
+
+
+class LegacyQuestionCreateSchema(BaseModel):
+    """
+    Copy of the validator as it was before the answer checks were moved to pydantic-core.
+    """
+    test_id: UUID
+    question_number: int
+    question_text: str
+    question_type: QuestionType
+    possible_answers: Dict[str, str] = Field(..., min_length=2)
+    correct_answers: List[str] = Field(..., min_length=1)
+
+    @model_validator(mode="after")
+    def validate_answers(self):
+        invalid_keys = [key for key in self.correct_answers if key not in self.possible_answers]
+        if invalid_keys:
+            raise ValueError(f"Invalid keys in correct_answers: {invalid_keys}")
+
+        if self.question_type == QuestionType.TRUE_FALSE and len(self.possible_answers) != 2:
+            raise ValueError("For TRUE_FALSE question, possible answers have only two options: TRUE or FALSE")
+
+        if self.question_type in {QuestionType.TRUE_FALSE, QuestionType.SINGLE_CHOICE}:
+            if len(self.correct_answers) != 1:
+                raise ValueError(f"For question_type '{self.question_type}' requires exactly one correct answer.")
+
+        return self
+
+
+def rate(validate) -> float:
+    seconds = min(timeit.repeat(lambda: [validate(row) for row in ROWS], number=NUMBER // len(ROWS), repeat=7))
+    return NUMBER / seconds
+
+
+def main():
+    results = {
+        'before (python validator)': rate(LegacyQuestionCreateSchema.model_validate),
+        'after (QuestionCreateSchema)': rate(QuestionCreateSchema.model_validate),
+        'after (QuestionCreateVariant)': rate(question_create_adapter.validate_python),
+    }
+    for name, value in results.items():
+        print(f"{name:<32} {value:>12,.0f} questions/s")
+
+
+if __name__ == '__main__':
+    main()
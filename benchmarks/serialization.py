@@ -0,0 +1,47 @@
+"""
+Response serialization: `model_dump_json` per model against cached views (`BaseSchema.view`)
+for 10k users and 1k tests, full and with fields left out.
+
+Run from the repository root:
+    python -m benchmarks.serialization
+"""
+import timeit
+
+from models import TestSchema, UserSchema
+from benchmarks import data
+
+REPEAT = 5
+
+
+def seconds(function) -> float:
+    return min(timeit.repeat(function, number=1, repeat=REPEAT))
+
+
+def compare(title: str, models: list, exclude=None):
+    model = type(models[0])
+    view = model.view(exclude=exclude)
+    assert view.to_json(models[0]).decode() == models[0].model_dump_json(exclude=exclude)
+    cases = [
+        ("model_dump_json per model", lambda: [item.model_dump_json(exclude=exclude) for item in models]),
+        ("view.to_json per model", lambda: [view.to_json(item) for item in models]),
+        ("view.list_to_json", lambda: view.list_to_json(models)),
+    ]
+    print(title)
+    baseline = None
+    for name, function in cases:
+        elapsed = seconds(function)
+        baseline = baseline or elapsed
+        print(f"  {name:<28} {elapsed * 1000:>8.1f} ms  x{baseline / elapsed:.2f}")
+
+
+def main():
+    users = [UserSchema.model_validate(row) for row in data.rows(data.user_row, 10_000)]
+    tests = [TestSchema.model_validate(row) for row in data.rows(data.test_row, 1_000)]
+    compare("10k UserSchema", users)
+    compare("10k UserSchema, public view", users, exclude=UserSchema.internal_fields)
+    compare("1k TestSchema", tests)
+    compare("1k TestSchema without questions and answers", tests, exclude={"questions", "answers"})
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,162 @@
+"""
+Validation benchmark suite covering every exported schema.
+
+For every case it measures model_validate, model_dump, model_dump_json and a JSON
+round trip (model_dump_json + model_validate_json): operations per second and peak
+memory allocated by one operation (tracemalloc).
+
+Run from the repository root:
+    python -m benchmarks.suite run --output baseline.json
+    python -m benchmarks.suite compare baseline.json --threshold 0.1
+
+`compare` exits with status 1 when any throughput drops, or peak allocation grows,
+by more than the threshold against the baseline.
+"""
+import argparse
+import json
+import platform
+import sys
+import timeit
+import tracemalloc
+from typing import Any, Callable, Dict, List, Tuple
+
+import pydantic
+
+from models import (AnswerCreateSchema, AnswerSchema, FrozenAnswerSchema, FrozenQuestionSchema, FrozenUserSchema,
+                    MultipleChoiceQuestion, QuestionCreateSchema, QuestionSchema, QuestionType, SingleChoiceQuestion,
+                    TestCreateSchema, TestSchema, TestSummarySchema, TrueFalseQuestion, UserCreateSchema,
+                    UserLoginSchema, UserSchema, registry)
+from benchmarks import data
+
+Result = Dict[str, Dict[str, float]]
+
+QUESTION_TEST_ID = '3f97fc69-9253-40c2-94c7-f8307ff70302'
+
+CASES: List[Tuple[str, type, Callable[[], Dict[str, Any]]]] = [
+    ('UserCreateSchema', UserCreateSchema, lambda: data.rows(data.user_create_row, 1)[0]),
+    ('UserLoginSchema', UserLoginSchema, lambda: data.rows(data.user_login_row, 1)[0]),
+    ('UserSchema', UserSchema, lambda: data.rows(data.user_row, 1)[0]),
+    ('FrozenUserSchema', FrozenUserSchema, lambda: data.rows(data.user_row, 1)[0]),
+    ('QuestionCreateSchema', QuestionCreateSchema, lambda: data.rows(data.question_create_row, 1)[0]),
+    ('TrueFalseQuestion', TrueFalseQuestion,
+     lambda: data.rows(data.question_create_row, 1, question_type=QuestionType.TRUE_FALSE)[0]),
+    ('SingleChoiceQuestion', SingleChoiceQuestion,
+     lambda: data.rows(data.question_create_row, 1, question_type=QuestionType.SINGLE_CHOICE)[0]),
+    ('MultipleChoiceQuestion', MultipleChoiceQuestion,
+     lambda: data.rows(data.question_create_row, 1, question_type=QuestionType.MULTIPLE_CHOICE)[0]),
+    ('QuestionSchema', QuestionSchema, lambda: data.rows(data.question_row, 1, test_id=QUESTION_TEST_ID, number=1)[0]),
+    ('FrozenQuestionSchema', FrozenQuestionSchema,
+     lambda: data.rows(data.question_row, 1, test_id=QUESTION_TEST_ID, number=1)[0]),
+    ('AnswerCreateSchema', AnswerCreateSchema, lambda: data.rows(data.answer_create_row, 1)[0]),
+    ('AnswerSchema', AnswerSchema, lambda: data.rows(data.answer_row, 1)[0]),
+    ('FrozenAnswerSchema', FrozenAnswerSchema, lambda: data.rows(data.answer_row, 1)[0]),
+    ('TestCreateSchema', TestCreateSchema, lambda: data.rows(data.test_create_row, 1)[0]),
+    ('TestSchema[1]', TestSchema, lambda: data.rows(data.test_row, 1, number_of_questions=1)[0]),
+    ('TestSchema[20]', TestSchema, lambda: data.rows(data.test_row, 1, number_of_questions=20)[0]),
+    ('TestSchema[50]', TestSchema, lambda: data.rows(data.test_row, 1, number_of_questions=50)[0]),
+    ('TestSummarySchema[20]', TestSummarySchema, lambda: data.rows(data.test_row, 1, number_of_questions=20)[0]),
+]
+# Exported schemas without a case are reported by `run`.
+UNCOVERED = sorted(set(registry.exported_models()) - {model.__name__ for _, model, _ in CASES})
+
+
+def operations(model: type, row: Dict[str, Any]) -> Dict[str, Callable[[], Any]]:
+    instance = model.model_validate(row)
+    payload = instance.model_dump_json()
+    return {
+        'validate': lambda: model.model_validate(row),
+        'dump_python': instance.model_dump,
+        'dump_json': instance.model_dump_json,
+        'json_round_trip': lambda: model.model_validate_json(instance.model_dump_json()),
+        'validate_json': lambda: model.model_validate_json(payload),
+    }
+
+
+def measure(function: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=repeat, number=number))
+    function()
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {'ops_per_sec': number / best, 'peak_alloc_bytes': peak}
+
+
+def run(repeat: int = 5) -> Result:
+    if UNCOVERED:
+        print(f'Exported schemas without a benchmark case: {", ".join(UNCOVERED)}', file=sys.stderr)
+    results: Result = {}
+    for name, model, make_row in CASES:
+        for operation, function in operations(model, make_row()).items():
+            results[f'{name}.{operation}'] = measure(function, repeat)
+    return results
+
+
+def environment() -> Dict[str, str]:
+    return {'python': platform.python_version(), 'pydantic': pydantic.VERSION, 'machine': platform.machine()}
+
+
+def compare(baseline: Result, current: Result, threshold: float) -> List[str]:
+    regressions = []
+    for key, values in sorted(current.items()):
+        previous = baseline.get(key)
+        if previous is None:
+            continue
+        speed = values['ops_per_sec'] / previous['ops_per_sec'] - 1
+        # Peak allocation below 1 KiB is mostly tracing noise, so it is compared against at least 1 KiB.
+        memory = (values['peak_alloc_bytes'] - previous['peak_alloc_bytes']) / max(previous['peak_alloc_bytes'], 1024)
+        flags = []
+        if speed < -threshold:
+            flags.append(f'throughput {speed:+.1%}')
+        if memory > threshold:
+            flags.append(f'peak allocation {memory:+.1%}')
+        print(f'{key:<36} {values["ops_per_sec"]:>12,.0f}/s {speed:+7.1%}   '
+              f'{values["peak_alloc_bytes"]:>10,} B {memory:+7.1%}   {"REGRESSION" if flags else ""}')
+        if flags:
+            regressions.append(f'{key}: {", ".join(flags)}')
+    return regressions
+
+
+def print_results(results: Result) -> None:
+    for key, values in results.items():
+        print(f'{key:<36} {values["ops_per_sec"]:>12,.0f}/s {values["peak_alloc_bytes"]:>12,} B')
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest='command', required=True)
+    run_parser = commands.add_parser('run', help='run the suite and optionally store the results as a baseline')
+    run_parser.add_argument('--output', help='path of the JSON baseline to write')
+    run_parser.add_argument('--repeat', type=int, default=5)
+    compare_parser = commands.add_parser('compare', help='run the suite and compare it with a baseline')
+    compare_parser.add_argument('baseline', help='path of a JSON baseline written by `run --output`')
+    compare_parser.add_argument('--threshold', type=float, default=0.1, help='allowed relative change, default 0.1')
+    compare_parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    results = run(args.repeat)
+    if args.command == 'run':
+        print_results(results)
+        if args.output:
+            with open(args.output, 'w') as file:
+                json.dump({'environment': environment(), 'results': results}, file, indent=2)
+        return 0
+
+    with open(args.baseline) as file:
+        baseline = json.load(file)
+    regressions = compare(baseline['results'], results, args.threshold)
+    if regressions:
+        print(f'\n{len(regressions)} regression(s) beyond {args.threshold:.0%}:')
+        for regression in regressions:
+            print(f'  {regression}')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,72 @@
+"""
+UserSchema timestamps: the previous `create_datetime: datetime` field with a string default frozen at
+import time against the `Timestamp` field with a per-instance default, for 10k users created without a timestamp, from ISO strings
+(all distinct / 100 distinct, as in batch imports), epoch ints and datetimes, and JSON output
+in both formats.
+
+Run from the repository root:
+    python -m benchmarks.timestamps
+"""
+import random
+import timeit
+from datetime import datetime, timedelta, timezone
+from typing import Annotated
+
+from pydantic import Field
+
+from models import Timestamp, TimestampFormat, UserSchema, configure_email_cache, utc_now
+from benchmarks import data
+
+REPEAT = 5
+USERS = 10_000
+
+
+# Defaults are not validated - users created without a timestamp kept the import time as a string.
+class PreviousUserSchema(UserSchema):
+    create_datetime: datetime = Field(default=datetime.now(timezone.utc).isoformat())
+
+
+class CompactUserSchema(UserSchema):
+    create_datetime: Annotated[datetime, Timestamp(TimestampFormat.EPOCH_MILLIS)] = Field(default_factory=utc_now)
+
+
+def seconds(function) -> float:
+    return min(timeit.repeat(function, number=1, repeat=REPEAT))
+
+
+def with_timestamps(rows, values):
+    return [{**row, 'create_datetime': value} for row, value in zip(rows, values)]
+
+
+def main():
+    # Emails are cached so that the timestamp field is not hidden behind email validation.
+    configure_email_cache(2 * USERS)
+    rng = random.Random(7)
+    rows = list(data.rows(data.user_row, USERS))
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    moments = [start + timedelta(seconds=rng.randrange(30_000_000)) for _ in range(USERS)]
+    batches = [start + timedelta(seconds=rng.randrange(100)) for _ in range(USERS)]
+    inputs = [
+        ("no timestamp", [{key: value for key, value in row.items() if key != 'create_datetime'} for row in rows]),
+        ("ISO strings, distinct", with_timestamps(rows, [moment.isoformat() for moment in moments])),
+        ("ISO strings, 100 distinct", with_timestamps(rows, [moment.isoformat() for moment in batches])),
+        ("epoch ints", with_timestamps(rows, [int(moment.timestamp()) for moment in moments])),
+        ("datetimes", with_timestamps(rows, moments)),
+    ]
+    print(f"validate_many, {USERS // 1000}k users")
+    for name, payload in inputs:
+        previous = seconds(lambda: PreviousUserSchema.validate_many(payload))
+        current = seconds(lambda: UserSchema.validate_many(payload))
+        print(f"  {name:<28} {previous * 1000:>8.1f} ms -> {current * 1000:>8.1f} ms  x{previous / current:.2f}")
+
+    users = UserSchema.validate_many(inputs[-1][1]).valid.values()
+    print(f"model_dump_json, {USERS // 1000}k users")
+    for name, model in [("ISO", UserSchema), ("epoch millis", CompactUserSchema)]:
+        models = [model.model_validate(user.__dict__) for user in users]
+        elapsed = seconds(lambda: [item.model_dump_json() for item in models])
+        size = sum(len(item.model_dump_json()) for item in models)
+        print(f"  {name:<28} {elapsed * 1000:>8.1f} ms  {size / 1024:>8.0f} KiB")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,9 +1,73 @@
-from .users import UserSchema, UserCreateSchema, UserLoginSchema, Role
-from .tests import (TestSchema,
-                    QuestionSchema,
-                    QuestionType,
-                    Level,
-                    TestCreateSchema,
-                    QuestionCreateSchema,
-                    AnswerCreateSchema,
-                    AnswerSchema)
+"""
+Names are imported lazily on first access (PEP 562), so e.g. importing `UserLoginSchema`
+does not load the tests models, email_validator or NumPy.
+"""
+from importlib import import_module
+from typing import Any, Dict, List
+
+_SUBMODULES: Dict[str, List[str]] = {
+    "users": ["UserSchema",
+              "UserCreateSchema",
+              "UserLoginSchema",
+              "Role",
+              "RoleSet",
+              "CachedEmailStr",
+              "configure_email_cache",
+              "email_cache"],
+    "tests": ["TestSchema",
+              "QuestionSchema",
+              "QuestionType",
+              "Level",
+              "TestCreateSchema",
+              "QuestionCreateSchema",
+              "AnswerCreateSchema",
+              "AnswerSchema",
+              "TrueFalseQuestion",
+              "SingleChoiceQuestion",
+              "MultipleChoiceQuestion",
+              "QuestionCreateVariant",
+              "question_create_adapter",
+              "TestSummarySchema",
+              "TestIndex"],
+    "timestamps": ["Timestamp", "TimestampFormat", "to_epoch_millis", "utc_now"],
+    "passwords": ["PasswordPolicy", "PasswordViolation"],
+    "base": ["BulkValidationResult", "ModelView", "trusted_mode", "set_trusted_sample_rate"],
+    "lazy": ["LazyList", "LazyModelList"],
+    "streaming": ["JsonArraySplitter",
+                  "aiter_json_array",
+                  "iter_json_array",
+                  "iter_ndjson",
+                  "write_json_array",
+                  "write_ndjson"],
+    "instrumentation": ["enable_instrumentation",
+                        "disable_instrumentation",
+                        "instrumentation_enabled",
+                        "reset_instrumentation",
+                        "instrumentation_snapshot",
+                        "prometheus_text"],
+    "registry": ["SchemaRegistry", "schema_registry"],
+    "scoring": ["encode_question", "encode_test", "question_score", "score_test", "score_tests", "with_result"],
+    "columnar": ["Column", "ColumnarChunk", "ColumnarFile", "iter_chunks", "read_columnar", "write_columnar",
+                 "write_parquet"],
+    "question_bank": ["QuestionBank", "SearchHit"],
+    "cache": ["QuestionSetCache", "MemoryQuestionSetCache", "FileQuestionSetCache"],
+    "parallel": ["validate_parallel"],
+    "payloads": ["Payload", "PayloadGenerator", "FuzzFailure", "FuzzReport", "iter_payloads", "fuzz"],
+    "frozen": ["FrozenAnswerSchema", "FrozenQuestionSchema", "FrozenUserSchema", "FrozenDict"],
+}
+_NAMES = {name: submodule for submodule, names in _SUBMODULES.items() for name in names}
+
+__all__ = list(_NAMES)
+
+
+def __getattr__(name: str) -> Any:
+    submodule = _NAMES.get(name)
+    if submodule is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{submodule}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
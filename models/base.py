@@ -0,0 +1,353 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from inspect import signature
+from typing import Annotated, Any, ClassVar, Dict, FrozenSet, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union, get_args, get_origin
+import random
+
+from pydantic import BaseModel, ConfigDict, TypeAdapter, ValidationError, WrapValidator
+from pydantic_core import SchemaSerializer, SchemaValidator, core_schema
+
+from . import codec
+
+_trusted_mode: ContextVar[bool] = ContextVar("trusted_mode", default=False)
+_trusted_sample_rate = 0.0
+
+
+class BulkValidationResult(NamedTuple):
+    """
+    Outcome of validating a batch of rows:
+    * valid - validated models keyed by their index in the input,
+    * errors - pydantic error dicts keyed by the index of the rejected row.
+    """
+    valid: Dict[int, BaseModel]
+    errors: Dict[int, List[Dict[str, Any]]]
+
+
+@lru_cache(maxsize=None)
+def list_adapter(model: type) -> TypeAdapter:
+    """
+    Cached `TypeAdapter(List[model])`, so the list core schema is built once per model.
+    """
+    return TypeAdapter(List[model])
+
+
+class _RowErrors:
+    """
+    Placeholder of a rejected row in `validate_many` results.
+    """
+    __slots__ = ("errors",)
+
+    def __init__(self, errors: List[Dict[str, Any]]):
+        self.errors = errors
+
+
+def _collect_row_errors(value: Any, handler: core_schema.ValidatorFunctionWrapHandler) -> Any:
+    try:
+        return handler(value)
+    except ValidationError as exc:
+        return _RowErrors(exc.errors())
+
+
+@lru_cache(maxsize=None)
+def rows_adapter(model: type) -> TypeAdapter:
+    """
+    Cached list adapter returning `_RowErrors` in place of rejected rows, so a batch with invalid
+    rows is validated in a single pass.
+    """
+    return TypeAdapter(List[Annotated[model, WrapValidator(_collect_row_errors)]])
+
+
+def set_trusted_sample_rate(rate: float) -> None:
+    """
+    Debug setting: fraction of trusted rows (0.0 - 1.0) that still go through full validation.
+    """
+    global _trusted_sample_rate
+    if not 0.0 <= rate <= 1.0:
+        raise ValueError("Sample rate must be between 0.0 and 1.0.")
+    _trusted_sample_rate = rate
+
+
+@contextmanager
+def trusted_mode() -> Iterator[None]:
+    """
+    Within this block `model_validate` and `validate_many` of every schema build models
+    from trusted data without validation - see `BaseSchema.from_trusted`.
+    Library paths that promise validation (`from_bytes(validate=True)`, file caches, `fuzz`)
+    call the core validator and validate regardless.
+    """
+    token = _trusted_mode.set(True)
+    try:
+        yield
+    finally:
+        _trusted_mode.reset(token)
+
+
+@lru_cache(maxsize=None)
+def nested_schema_fields(model: type) -> Tuple[Tuple[str, type, bool], ...]:
+    """
+    Fields of `model` holding library schemas, as (name, schema, is_list) tuples.
+    Optional[...] wrappers are unwrapped.
+    """
+    nested = []
+    for name, field in model.model_fields.items():
+        annotation = field.annotation
+        if get_origin(annotation) is Union:
+            args = [arg for arg in get_args(annotation) if arg is not type(None)]
+            if len(args) == 1:
+                annotation = args[0]
+        is_list = get_origin(annotation) is list
+        if is_list:
+            args = get_args(annotation)
+            annotation = args[0] if args else None
+        if isinstance(annotation, type) and issubclass(annotation, BaseSchema):
+            nested.append((name, annotation, is_list))
+    return tuple(nested)
+
+
+@lru_cache(maxsize=None)
+def fields_validator(model: type) -> SchemaValidator:
+    """
+    Validator of `model` without its model-level after validators, used for `validate_assignment`
+    of single fields - field types, constraints and field validators still apply.
+    """
+    if not model.__pydantic_complete__:
+        model.model_rebuild()
+    schema = model.__pydantic_core_schema__
+    definitions = None
+    if schema["type"] == "definitions":
+        definitions = schema["definitions"]
+        schema = schema["schema"]
+    ref = schema.get("ref")
+    while schema["type"] == "function-after":
+        schema = schema["schema"]
+    schema = dict(schema)
+    if ref is not None:
+        schema["ref"] = ref
+    if definitions is not None:
+        schema = core_schema.definitions_schema(schema, definitions)
+    return SchemaValidator(schema)
+
+
+@lru_cache(maxsize=None)
+def view_serializer(model: type, include: Optional[FrozenSet[str]], exclude: FrozenSet[str],
+                    many: bool = False) -> SchemaSerializer:
+    """
+    Serializer of `model` (or of `List[model]` with `many`) restricted to the top-level fields
+    in `include` and not in `exclude`. Built once per combination - nothing is filtered per call.
+    """
+    if not model.__pydantic_complete__:
+        model.model_rebuild()
+    schema = model.__pydantic_core_schema__
+    definitions = None
+    if schema["type"] == "definitions":
+        definitions = schema["definitions"]
+        schema = schema["schema"]
+    # Model validators wrap the model schema, they do not take part in serialization.
+    while schema["type"].startswith("function-"):
+        schema = schema["schema"]
+    fields = schema["schema"]["fields"]
+    unknown = ((include or frozenset()) | exclude) - fields.keys()
+    if unknown:
+        raise ValueError(f"Unknown fields of {model.__name__}: {sorted(unknown)}")
+    fields_schema = dict(schema["schema"], fields={
+        name: field for name, field in fields.items()
+        if (include is None or name in include) and name not in exclude})
+    schema = {key: value for key, value in schema.items() if key != "ref"}
+    schema["schema"] = fields_schema
+    if many:
+        schema = core_schema.list_schema(schema)
+    if definitions is not None:
+        schema = core_schema.definitions_schema(schema, definitions)
+    return SchemaSerializer(schema)
+
+
+class ModelView:
+    """
+    Precompiled serializer of a model restricted to some top-level fields, see `BaseSchema.view`.
+    Output equals `model_dump_json` / `model_dump` with the same include/exclude.
+    """
+    __slots__ = ("model", "include", "exclude", "_serializer", "_list_serializer")
+
+    def __init__(self, model: type, include: Optional[FrozenSet[str]], exclude: FrozenSet[str]):
+        self.model = model
+        self.include = include
+        self.exclude = exclude
+        self._serializer = view_serializer(model, include, exclude)
+        self._list_serializer = view_serializer(model, include, exclude, many=True)
+
+    def to_json(self, model: BaseModel) -> bytes:
+        return self._serializer.to_json(model)
+
+    def to_python(self, model: BaseModel, mode: str = "python") -> Dict[str, Any]:
+        return self._serializer.to_python(model, mode=mode)
+
+    def list_to_json(self, models: Iterable[BaseModel]) -> bytes:
+        """
+        JSON array of `models` in a single serializer call.
+        """
+        return self._list_serializer.to_json(models if isinstance(models, list) else list(models))
+
+
+@lru_cache(maxsize=None)
+def _model_view(model: type, include: Optional[FrozenSet[str]], exclude: FrozenSet[str]) -> ModelView:
+    return ModelView(model, include, exclude)
+
+
+class _PatchValidationInfo:
+    """
+    Minimal stand-in for `ValidationInfo` passed to model validators re-run by `apply_patch`.
+    """
+    mode = "python"
+    data = None
+    field_name = None
+
+    def __init__(self, context: Optional[Any], config: Dict[str, Any]):
+        self.context = context
+        self.config = config
+
+
+class BaseSchema(BaseModel):
+    """
+    Common base for all library models.
+    Core schemas are built on first use (`defer_build`), which keeps imports cheap.
+    """
+    model_config = ConfigDict(defer_build=True)
+
+    # Validator name -> fields it reads, see `apply_patch`. Field validators listed here re-validate
+    # their field when one of these fields is patched.
+    patch_dependencies: ClassVar[Dict[str, FrozenSet[str]]] = {}
+
+    @classmethod
+    def validate_many(cls, rows: Iterable[Any]) -> BulkValidationResult:
+        """
+        Validates a batch of raw rows in a single pydantic-core call.
+        Invalid rows do not stop the batch - their errors are collected per index in the same pass.
+        """
+        rows = list(rows)
+        if _trusted_mode.get():
+            return cls._construct_many_trusted(rows)
+        models = rows_adapter(cls).validate_python(rows)
+        valid: Dict[int, BaseModel] = {}
+        errors: Dict[int, List[Dict[str, Any]]] = {}
+        for index, model in enumerate(models):
+            if type(model) is _RowErrors:
+                errors[index] = model.errors
+            else:
+                valid[index] = model
+        return BulkValidationResult(valid=valid, errors=errors)
+
+    def apply_patch(self, patch: Dict[str, Any], context: Optional[Any] = None):
+        """
+        Returns a copy with `patch` applied, validating only the patched fields.
+        * fields are validated in declaration order, so field validators see the patched values
+          of the fields declared before them,
+        * fields whose validators declare `patch_dependencies` are re-validated when one of those
+          fields changes, e.g. `confirm_password` when only `password` is patched,
+        * model after-validators run once, at the end, and only if one of their `patch_dependencies`
+          fields changed (validators without declared dependencies always run).
+        Unchanged nested models are shared with this instance.
+        """
+        cls = type(self)
+        validator = fields_validator(cls)
+        model = self.model_copy()
+        changed = set(patch)
+        names = set(patch)
+        for name, decorator in cls.__pydantic_decorators__.field_validators.items():
+            dependencies = cls.patch_dependencies.get(name)
+            if dependencies is not None and not dependencies.isdisjoint(changed):
+                names.update(field for field in decorator.info.fields if field in cls.model_fields)
+        order = {name: position for position, name in enumerate(cls.model_fields)}
+        for name in sorted(names, key=lambda name: order.get(name, len(order))):
+            value = patch[name] if name in patch else getattr(model, name)
+            validator.validate_assignment(model, name, value, context=context)
+
+        for name, decorator in cls.__pydantic_decorators__.model_validators.items():
+            if decorator.info.mode != "after":
+                continue
+            dependencies = cls.patch_dependencies.get(name)
+            if dependencies is not None and dependencies.isdisjoint(changed):
+                continue
+            function = decorator.func
+            try:
+                if len(signature(function).parameters) > 1:
+                    result = function(model, _PatchValidationInfo(context, cls.model_config))
+                else:
+                    result = function(model)
+            except (ValueError, AssertionError) as error:
+                raise ValidationError.from_exception_data(cls.__name__, [
+                    {"type": "value_error", "loc": (), "input": patch, "ctx": {"error": error}}
+                ]) from error
+            if isinstance(result, cls):
+                model = result
+        return model
+
+    @classmethod
+    def view(cls, include: Optional[Iterable[str]] = None, exclude: Optional[Iterable[str]] = None) -> ModelView:
+        """
+        Cached serializer of the top-level fields in `include` and not in `exclude`. Keep the view
+        for hot paths, e.g. `PUBLIC_USER = UserSchema.view(exclude={"roles"})` and then
+        `PUBLIC_USER.list_to_json(users)` - no field plan is computed per call.
+        """
+        if isinstance(include, (dict, str)) or isinstance(exclude, (dict, str)):
+            raise TypeError("Views take collections of top-level field names, use model_dump_json for nested filters.")
+        return _model_view(cls, frozenset(include) if include is not None else None, frozenset(exclude or ()))
+
+    def to_bytes(self) -> bytes:
+        """
+        Compact binary form of the model, see `models.codec`.
+        """
+        return codec.encode(self)
+
+    @classmethod
+    def from_bytes(cls, data: bytes, validate: bool = False):
+        """
+        Rebuilds the model from `to_bytes` output. The payload is trusted unless `validate` is set.
+        """
+        model = codec.decode(cls, data)
+        if validate:
+            return cls.__pydantic_validator__.validate_python(model.model_dump())
+        return model
+
+    @classmethod
+    def _construct_many_trusted(cls, rows: List[Any]) -> BulkValidationResult:
+        valid: Dict[int, BaseModel] = {}
+        errors: Dict[int, List[Dict[str, Any]]] = {}
+        for index, row in enumerate(rows):
+            try:
+                valid[index] = cls.from_trusted(row)
+            except ValidationError as exc:
+                errors[index] = exc.errors()
+        return BulkValidationResult(valid=valid, errors=errors)
+
+    @classmethod
+    def model_validate(cls, obj: Any, *, strict: Optional[bool] = None, from_attributes: Optional[bool] = None,
+                       context: Optional[Any] = None):
+        if _trusted_mode.get() and isinstance(obj, dict):
+            return cls.from_trusted(obj)
+        return super().model_validate(obj, strict=strict, from_attributes=from_attributes, context=context)
+
+    @classmethod
+    def from_trusted(cls, data: Dict[str, Any]):
+        """
+        Builds the model from already validated data (e.g. DB rows) with `model_construct`,
+        nested schemas included, so no validation is run.
+        Values have to be of the field types already, as returned by `model_dump()`.
+        With `set_trusted_sample_rate` a fraction of rows is fully validated instead.
+        """
+        if _trusted_sample_rate and random.random() < _trusted_sample_rate:
+            return super().model_validate(data)
+        return cls._construct_trusted(data)
+
+    @classmethod
+    def _construct_trusted(cls, data: Dict[str, Any]):
+        values = dict(data)
+        for name, model, is_list in nested_schema_fields(cls):
+            value = values.get(name)
+            if value is None:
+                continue
+            if is_list:
+                values[name] = [item if isinstance(item, model) else model._construct_trusted(item) for item in value]
+            elif not isinstance(value, model):
+                values[name] = model._construct_trusted(value)
+        return cls.model_construct(**values)
@@ -0,0 +1,197 @@
+"""
+Caches of generated question sets keyed on `TestCreateSchema.fingerprint()`, so logically identical
+generation requests reuse questions instead of regenerating them.
+"""
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from os import PathLike
+from threading import Lock
+from typing import Callable, Dict, List, Optional, Tuple, Union
+import os
+import tempfile
+import time
+
+from pydantic_core import from_json, to_json
+
+from .tests import (MultipleChoiceQuestion, QuestionCreateSchema, QuestionSchema, SingleChoiceQuestion,
+                    TestCreateSchema, TrueFalseQuestion)
+
+FILE_FORMAT = 1
+FILE_PREFIX = "qset-"
+FILE_SUFFIX = ".json"
+TEMPORARY_PREFIX = ".qset-"
+TEMPORARY_SUFFIX = ".tmp"
+# Temporary files older than this are left over by interrupted writes and removed by `clear`.
+STALE_TEMPORARY_SECONDS = 3600
+QUESTION_MODELS = (QuestionCreateSchema, QuestionSchema, TrueFalseQuestion, SingleChoiceQuestion,
+                   MultipleChoiceQuestion)
+
+Key = Union[TestCreateSchema, str]
+
+
+def _fingerprint(key: Key) -> str:
+    return key if isinstance(key, str) else key.fingerprint()
+
+
+class QuestionSetCache(ABC):
+    """
+    Interface of question set caches. Keys are generation requests or their fingerprints.
+    Implementations provide `_load`, `_store`, `delete` and `clear`.
+    """
+
+    def get(self, request: Key) -> Optional[List[QuestionCreateSchema]]:
+        return self._load(_fingerprint(request))
+
+    def set(self, request: Key, questions: List[QuestionCreateSchema]) -> None:
+        self._store(_fingerprint(request), list(questions))
+
+    def get_or_generate(self, request: TestCreateSchema,
+                        generate: Callable[[TestCreateSchema], List[QuestionCreateSchema]]) -> List[QuestionCreateSchema]:
+        """
+        Cached questions for `request`, calling `generate(request)` and storing the result on a miss.
+        """
+        key = request.fingerprint()
+        questions = self._load(key)
+        if questions is None:
+            questions = list(generate(request))
+            self._store(key, questions)
+        return questions
+
+    @abstractmethod
+    def _load(self, key: str) -> Optional[List[QuestionCreateSchema]]:
+        ...
+
+    @abstractmethod
+    def _store(self, key: str, questions: List[QuestionCreateSchema]) -> None:
+        ...
+
+    @abstractmethod
+    def delete(self, request: Key) -> None:
+        ...
+
+    @abstractmethod
+    def clear(self) -> None:
+        ...
+
+
+class MemoryQuestionSetCache(QuestionSetCache):
+    """
+    Thread-safe in-process LRU cache, entries expire `ttl` seconds after being stored (None - never).
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None, clock: Callable[[], float] = time.monotonic):
+        if maxsize < 1:
+            raise ValueError("Cache size must be a positive integer.")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = Lock()
+        self._entries: "OrderedDict[str, Tuple[float, List[QuestionCreateSchema]]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _load(self, key: str) -> Optional[List[QuestionCreateSchema]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, questions = entry
+            if expires < self._clock():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return list(questions)
+
+    def _store(self, key: str, questions: List[QuestionCreateSchema]) -> None:
+        expires = float("inf") if self.ttl is None else self._clock() + self.ttl
+        with self._lock:
+            self._entries[key] = (expires, questions)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, request: Key) -> None:
+        with self._lock:
+            self._entries.pop(_fingerprint(request), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class FileQuestionSetCache(QuestionSetCache):
+    """
+    Cache shared between processes: one JSON file per request in `directory`, written atomically.
+    * entries expire `ttl` seconds after being stored (None - never), judged by the file modification time,
+    * questions come back as the classes they were stored as - QUESTION_MODELS and `models`
+      (extra question classes) are allowed, storing other classes raises TypeError,
+    * only files named `qset-*.json` (and its temporary files) are touched, the directory can be shared.
+    """
+
+    def __init__(self, directory: Union[str, PathLike], ttl: Optional[float] = None,
+                 clock: Callable[[], float] = time.time, models: Tuple[type, ...] = ()):
+        self.directory = os.fspath(directory)
+        self.ttl = ttl
+        self._clock = clock
+        self._models: Dict[str, type] = {model.__name__: model for model in (*QUESTION_MODELS, *models)}
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{FILE_PREFIX}{key}{FILE_SUFFIX}")
+
+    def _load(self, key: str) -> Optional[List[QuestionCreateSchema]]:
+        path = self._path(key)
+        try:
+            if self.ttl is not None and os.path.getmtime(path) + self.ttl < self._clock():
+                os.remove(path)
+                return None
+            with open(path, "rb") as file:
+                payload = file.read()
+        except FileNotFoundError:
+            return None
+        document = from_json(payload)
+        if document.get("format") != FILE_FORMAT:
+            return None
+        return [self._models[name].__pydantic_validator__.validate_python(data)
+                for name, data in document["questions"]]
+
+    def _store(self, key: str, questions: List[QuestionCreateSchema]) -> None:
+        for question in questions:
+            if self._models.get(type(question).__name__) is not type(question):
+                raise TypeError(f"{type(question).__name__} is not a question model of this cache.")
+        payload = to_json({"format": FILE_FORMAT, "questions": [
+            [type(question).__name__, question.model_dump(mode="json")] for question in questions]})
+        descriptor, temporary = tempfile.mkstemp(dir=self.directory, prefix=TEMPORARY_PREFIX, suffix=TEMPORARY_SUFFIX)
+        try:
+            with os.fdopen(descriptor, "wb") as file:
+                file.write(payload)
+            os.replace(temporary, self._path(key))
+        except BaseException:
+            try:
+                os.unlink(temporary)
+            except FileNotFoundError:
+                pass
+            raise
+
+    def delete(self, request: Key) -> None:
+        try:
+            os.remove(self._path(_fingerprint(request)))
+        except FileNotFoundError:
+            pass
+
+    def clear(self) -> None:
+        """
+        Removes the cache files and temporary files left by interrupted writes.
+        """
+        stale = self._clock() - STALE_TEMPORARY_SECONDS
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            try:
+                if name.startswith(FILE_PREFIX) and name.endswith(FILE_SUFFIX):
+                    os.remove(path)
+                elif (name.startswith(TEMPORARY_PREFIX) and name.endswith(TEMPORARY_SUFFIX)
+                      and os.path.getmtime(path) < stale):
+                    os.remove(path)
+            except FileNotFoundError:
+                pass
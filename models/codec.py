@@ -0,0 +1,368 @@
+"""
+Compact binary encoding of library models, used by `BaseSchema.to_bytes` / `BaseSchema.from_bytes`.
+
+Layout: MAGIC, VERSION, string table, body. The body holds field values in declaration order:
+* UUID - 16 raw bytes,
+* Enum - 1 byte index of the member,
+* int - zigzag varint, float - 8 byte double, bool - 1 byte,
+* str - varint length + UTF-8; dict keys and items of List[str] (answer keys) are indexes into
+  the string table written once per payload,
+* Optional - presence byte, List/Dict - varint length + items,
+* lazily validated lists (types with `from_items`, e.g. LazyModelList) - as lists of their items,
+* integer-backed sets (types with `from_int`, e.g. RoleSet) - varint of the mask,
+* nested models - their fields, recursively,
+* anything else - str or JSON bytes behind a 1 byte tag.
+"""
+from datetime import datetime
+from enum import Enum
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Literal, Tuple, Union, get_args, get_origin
+from uuid import UUID
+import struct
+
+from pydantic import BaseModel
+from pydantic_core import from_json, to_json
+
+MAGIC = b"IP"
+VERSION = 1
+
+_DOUBLE = struct.Struct("<d")
+_object_setattr = object.__setattr__
+
+
+class _Writer:
+    __slots__ = ("buffer", "strings")
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self.strings: Dict[str, int] = {}
+
+
+class _Reader:
+    __slots__ = ("data", "pos", "strings")
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self.pos = 0
+        self.strings: List[str] = []
+
+
+Encoder = Callable[[Any, _Writer], None]
+Decoder = Callable[[_Reader], Any]
+
+
+def _write_varint(value: int, buffer: bytearray) -> None:
+    while value > 0x7F:
+        buffer.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def _read_varint(reader: _Reader) -> int:
+    data = reader.data
+    pos = reader.pos
+    byte = data[pos]
+    pos += 1
+    if byte < 0x80:
+        reader.pos = pos
+        return byte
+    value = byte & 0x7F
+    shift = 7
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            reader.pos = pos
+            return value
+        shift += 7
+
+
+def _write_str(value: str, buffer: bytearray) -> None:
+    raw = value.encode()
+    _write_varint(len(raw), buffer)
+    buffer += raw
+
+
+def _read_str(reader: _Reader) -> str:
+    size = _read_varint(reader)
+    start = reader.pos
+    reader.pos = start + size
+    return str(reader.data[start:reader.pos], "utf-8")
+
+
+def _encode_str(value: str, writer: _Writer) -> None:
+    _write_str(value, writer.buffer)
+
+
+def _encode_interned(value: str, writer: _Writer) -> None:
+    strings = writer.strings
+    index = strings.get(value)
+    if index is None:
+        index = strings[value] = len(strings)
+    _write_varint(index, writer.buffer)
+
+
+def _decode_interned(reader: _Reader) -> str:
+    return reader.strings[_read_varint(reader)]
+
+
+def _encode_int(value: int, writer: _Writer) -> None:
+    # Zigzag without a fixed width - Python ints are unbounded.
+    _write_varint(value << 1 if value >= 0 else ((-value) << 1) - 1, writer.buffer)
+
+
+def _decode_int(reader: _Reader) -> int:
+    value = _read_varint(reader)
+    return (value >> 1) ^ -(value & 1)
+
+
+def _encode_float(value: float, writer: _Writer) -> None:
+    writer.buffer += _DOUBLE.pack(value)
+
+
+def _decode_float(reader: _Reader) -> float:
+    start = reader.pos
+    reader.pos = start + 8
+    return _DOUBLE.unpack_from(reader.data, start)[0]
+
+
+def _encode_bool(value: bool, writer: _Writer) -> None:
+    writer.buffer.append(1 if value else 0)
+
+
+def _decode_bool(reader: _Reader) -> bool:
+    reader.pos += 1
+    return reader.data[reader.pos - 1] == 1
+
+
+def _encode_uuid(value: UUID, writer: _Writer) -> None:
+    writer.buffer += value.bytes
+
+
+def _decode_uuid(reader: _Reader) -> UUID:
+    start = reader.pos
+    reader.pos = start + 16
+    return UUID(int=int.from_bytes(reader.data[start:reader.pos], "big"))
+
+
+def _encode_datetime(value: datetime, writer: _Writer) -> None:
+    _write_str(value if isinstance(value, str) else value.isoformat(), writer.buffer)
+
+
+def _decode_datetime(reader: _Reader) -> datetime:
+    return datetime.fromisoformat(_read_str(reader))
+
+
+def _encode_dynamic(value: Any, writer: _Writer) -> None:
+    if isinstance(value, str):
+        writer.buffer.append(0)
+        _write_str(value, writer.buffer)
+    else:
+        raw = to_json(value)
+        writer.buffer.append(1)
+        _write_varint(len(raw), writer.buffer)
+        writer.buffer += raw
+
+
+def _decode_dynamic(reader: _Reader) -> Any:
+    tag = reader.data[reader.pos]
+    reader.pos += 1
+    if tag == 0:
+        return _read_str(reader)
+    size = _read_varint(reader)
+    start = reader.pos
+    reader.pos = start + size
+    return from_json(bytes(reader.data[start:reader.pos]))
+
+
+def _enum_codec(enum: type) -> Tuple[Encoder, Decoder]:
+    members = list(enum)
+    indexes = {member: index for index, member in enumerate(members)}
+
+    def encode(value: Enum, writer: _Writer) -> None:
+        writer.buffer.append(indexes[value])
+
+    def decode(reader: _Reader) -> Enum:
+        reader.pos += 1
+        return members[reader.data[reader.pos - 1]]
+
+    return encode, decode
+
+
+def _mask_codec(mask_type: type) -> Tuple[Encoder, Decoder]:
+
+    def encode(value: Any, writer: _Writer) -> None:
+        _write_varint(int(mask_type(value)), writer.buffer)
+
+    def decode(reader: _Reader) -> Any:
+        return mask_type.from_int(_read_varint(reader))
+
+    return encode, decode
+
+
+def _items_codec(list_type: type, item_type: Any) -> Tuple[Encoder, Decoder]:
+    encode_list, decode_list = _list_codec(_codec_for(item_type, interned=True))
+
+    def encode(value: Any, writer: _Writer) -> None:
+        encode_list(list(value), writer)
+
+    def decode(reader: _Reader) -> Any:
+        return list_type.from_items(decode_list(reader), item_type)
+
+    return encode, decode
+
+
+def _optional_codec(codec: Tuple[Encoder, Decoder]) -> Tuple[Encoder, Decoder]:
+    encode_item, decode_item = codec
+
+    def encode(value: Any, writer: _Writer) -> None:
+        if value is None:
+            writer.buffer.append(0)
+        else:
+            writer.buffer.append(1)
+            encode_item(value, writer)
+
+    def decode(reader: _Reader) -> Any:
+        reader.pos += 1
+        return decode_item(reader) if reader.data[reader.pos - 1] else None
+
+    return encode, decode
+
+
+def _list_codec(codec: Tuple[Encoder, Decoder]) -> Tuple[Encoder, Decoder]:
+    encode_item, decode_item = codec
+
+    def encode(value: List[Any], writer: _Writer) -> None:
+        _write_varint(len(value), writer.buffer)
+        for item in value:
+            encode_item(item, writer)
+
+    def decode(reader: _Reader) -> List[Any]:
+        return [decode_item(reader) for _ in range(_read_varint(reader))]
+
+    return encode, decode
+
+
+def _dict_codec(key_codec: Tuple[Encoder, Decoder], value_codec: Tuple[Encoder, Decoder]) -> Tuple[Encoder, Decoder]:
+    encode_key, decode_key = key_codec
+    encode_value, decode_value = value_codec
+
+    def encode(value: Dict[Any, Any], writer: _Writer) -> None:
+        _write_varint(len(value), writer.buffer)
+        for key, item in value.items():
+            encode_key(key, writer)
+            encode_value(item, writer)
+
+    def decode(reader: _Reader) -> Dict[Any, Any]:
+        result = {}
+        for _ in range(_read_varint(reader)):
+            key = decode_key(reader)
+            result[key] = decode_value(reader)
+        return result
+
+    return encode, decode
+
+
+_SCALAR_CODECS: Dict[Any, Tuple[Encoder, Decoder]] = {
+    str: (_encode_str, _read_str),
+    bool: (_encode_bool, _decode_bool),
+    int: (_encode_int, _decode_int),
+    float: (_encode_float, _decode_float),
+    UUID: (_encode_uuid, _decode_uuid),
+    datetime: (_encode_datetime, _decode_datetime),
+}
+_INTERNED = (_encode_interned, _decode_interned)
+_DYNAMIC = (_encode_dynamic, _decode_dynamic)
+
+
+def _codec_for(annotation: Any, interned: bool = False) -> Tuple[Encoder, Decoder]:
+    origin = get_origin(annotation)
+    args = get_args(annotation)
+    if origin is Union:
+        non_null = [arg for arg in args if arg is not type(None)]
+        codec = _codec_for(non_null[0]) if len(non_null) == 1 else _DYNAMIC
+        return _optional_codec(codec) if len(non_null) < len(args) else codec
+    if origin is Literal and args and isinstance(args[0], Enum):
+        return _enum_codec(type(args[0]))
+    if origin is list:
+        return _list_codec(_codec_for(args[0], interned=True) if args else _DYNAMIC)
+    if isinstance(origin, type) and hasattr(origin, "from_items") and args:
+        return _items_codec(origin, args[0])
+    if origin is dict:
+        return _dict_codec(_codec_for(args[0], interned=True), _codec_for(args[1])) if args else _DYNAMIC
+    if annotation is str and interned:
+        return _INTERNED
+    if isinstance(annotation, type):
+        if issubclass(annotation, BaseModel):
+            return _model_codec(annotation)
+        if issubclass(annotation, Enum):
+            return _enum_codec(annotation)
+        if hasattr(annotation, "from_int"):
+            return _mask_codec(annotation)
+        for scalar, codec in _SCALAR_CODECS.items():
+            if issubclass(annotation, scalar):
+                return codec
+    return _DYNAMIC
+
+
+@lru_cache(maxsize=None)
+def _model_codec(model: type) -> Tuple[Encoder, Decoder]:
+    fields = [(name, _codec_for(field.annotation)) for name, field in model.model_fields.items()]
+    encoders = [(name, codec[0]) for name, codec in fields]
+    decoders = [(name, codec[1]) for name, codec in fields]
+
+    def encode(value: BaseModel, writer: _Writer) -> None:
+        values = value.__dict__
+        for name, encode_field in encoders:
+            encode_field(values[name], writer)
+
+    names = frozenset(name for name, _ in fields)
+    has_private = bool(model.__private_attributes__)
+
+    def decode(reader: _Reader) -> BaseModel:
+        values = {name: decode_field(reader) for name, decode_field in decoders}
+        if has_private:
+            return model.model_construct(**values)
+        # Same as model_construct when every field is set and there are no private attributes.
+        instance = model.__new__(model)
+        _object_setattr(instance, "__dict__", values)
+        _object_setattr(instance, "__pydantic_fields_set__", set(names))
+        _object_setattr(instance, "__pydantic_extra__", None)
+        _object_setattr(instance, "__pydantic_private__", None)
+        return instance
+
+    return encode, decode
+
+
+def encode(value: BaseModel) -> bytes:
+    writer = _Writer()
+    _model_codec(type(value))[0](value, writer)
+    header = bytearray(MAGIC)
+    header.append(VERSION)
+    _write_varint(len(writer.strings), header)
+    for string in writer.strings:
+        _write_str(string, header)
+    return bytes(header + writer.buffer)
+
+
+def decode(model: type, data: bytes) -> BaseModel:
+    """
+    Rebuilds the model with `model_construct` - the payload is expected to come from `encode`.
+    """
+    if data[:2] != MAGIC or len(data) < 3:
+        raise ValueError("Not an encoded model payload.")
+    if data[2] != VERSION:
+        raise ValueError(f"Unsupported payload version: {data[2]}")
+    reader = _Reader(memoryview(data))
+    reader.pos = 3
+    try:
+        reader.strings = [_read_str(reader) for _ in range(_read_varint(reader))]
+        result = _model_codec(model)[1](reader)
+    except (IndexError, struct.error, UnicodeDecodeError) as error:
+        raise ValueError("Truncated or malformed model payload.") from error
+    if reader.pos > len(data):
+        raise ValueError("Truncated or malformed model payload.")
+    if reader.pos != len(data):
+        raise ValueError("Unexpected data after the encoded model.")
+    return result
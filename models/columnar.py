@@ -0,0 +1,594 @@
+"""
+Columnar export of tests for analytics. Batches of TestSchema are flattened into three tables of
+typed column arrays, in Arrow memory layout:
+* tests - the TestSchema fields without questions and answers,
+* questions - the QuestionSchema fields and `score` (0.0 - 1.0, as graded by `score_test`),
+* answers - the AnswerSchema fields and `test_id`.
+
+Column layouts (validity of Optional fields is a separate bitmap, LSB first):
+* UUID - 16 bytes per row, int - int64, float - float64, bool - bitmap,
+* str - int32 offsets + UTF-8 data,
+* Enum - uint8 codes into the dictionary of member values,
+* List - int32 offsets + child column, Dict[str, str] - int32 offsets + key and value columns.
+
+File layout: MAGIC, chunks of 8-byte aligned buffers, JSON footer (schemas, buffer offsets),
+footer length (uint64), MAGIC. `read_columnar` memory-maps the file, columns are views of the
+mapping - nothing is parsed or validated on open.
+
+With pyarrow installed chunks convert to Arrow record batches without copying and `write_parquet`
+writes Parquet files.
+"""
+from abc import ABC, abstractmethod
+from array import array
+from enum import Enum
+from functools import lru_cache
+from itertools import accumulate, chain, compress
+from typing import Any, Dict, Iterable, Iterator, List, Tuple, Union, get_args, get_origin
+from uuid import UUID
+import json
+import mmap
+import os
+import struct
+
+from .base import nested_schema_fields
+from .scoring import encode_test, question_score
+from .tests import AnswerSchema, QuestionSchema, TestSchema
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+MAGIC = b"IPCOL\x00\x00\x01"
+VERSION = 1
+CHUNK_SIZE = 64 * 1024
+
+_FOOTER_LENGTH = struct.Struct("<Q")
+_MAX_OFFSET = 2 ** 31 - 1
+
+# Column spec: {"kind": ..., "nullable": bool, "dictionary": [...], "children": [specs]}
+Spec = Dict[str, Any]
+
+
+def _pack_bits(flags: List[Any]) -> bytearray:
+    bits = bytearray((len(flags) + 7) // 8)
+    for index in compress(range(len(flags)), flags):
+        bits[index >> 3] |= 1 << (index & 7)
+    return bits
+
+
+def _get_bit(buffer, index: int) -> bool:
+    return bool(buffer[index >> 3] >> (index & 7) & 1)
+
+
+def _offsets(lengths: Iterable[int]) -> array:
+    offsets = array("i", accumulate(lengths, initial=0))
+    if offsets[-1] > _MAX_OFFSET:
+        raise ValueError("Column chunk exceeds 2 GiB, use a smaller chunk size.")
+    return offsets
+
+
+class _Encoder(ABC):
+    """
+    Encodes the values of one column chunk into its buffers, a whole column at a time.
+    """
+    kind: str
+
+    def __init__(self, nullable: bool):
+        self.nullable = nullable
+
+    def spec(self) -> Spec:
+        return {"kind": self.kind, "nullable": self.nullable,
+                "children": [child.spec() for child in self.children()]}
+
+    def children(self) -> List["_Encoder"]:
+        return []
+
+    def encode(self, values: List[Any]) -> "Column":
+        buffers: Dict[str, Any] = {}
+        if self.nullable:
+            present = [value is not None for value in values]
+            if not all(present):
+                buffers["validity"] = _pack_bits(present)
+                values = [value if value is not None else self.null for value in values]
+        children = self._encode(values, buffers)
+        return Column(self.spec(), len(values), {name: memoryview(buffer).cast("B") for name, buffer in buffers.items()},
+                      children)
+
+    @abstractmethod
+    def _encode(self, values: List[Any], buffers: Dict[str, Any]) -> List["Column"]:
+        ...
+
+
+class _NumberEncoder(_Encoder):
+    null = 0
+
+    def __init__(self, kind: str, nullable: bool):
+        super().__init__(nullable)
+        self.kind = kind
+
+    def _encode(self, values: List[Any], buffers: Dict[str, Any]) -> List["Column"]:
+        buffers["data"] = array(_TYPECODES[self.kind], values)
+        return []
+
+
+class _BoolEncoder(_Encoder):
+    kind = "bool"
+    null = False
+
+    def _encode(self, values: List[Any], buffers: Dict[str, Any]) -> List["Column"]:
+        buffers["data"] = _pack_bits(values)
+        return []
+
+
+class _UUIDEncoder(_Encoder):
+    kind = "uuid"
+    null = UUID(int=0)
+
+    def _encode(self, values: List[Any], buffers: Dict[str, Any]) -> List["Column"]:
+        buffers["data"] = b"".join([(value if isinstance(value, UUID) else UUID(value)).bytes for value in values])
+        return []
+
+
+class _StringEncoder(_Encoder):
+    kind = "str"
+    null = ""
+
+    def _encode(self, values: List[Any], buffers: Dict[str, Any]) -> List["Column"]:
+        encoded = [value.encode() for value in values]
+        buffers["offsets"] = _offsets(map(len, encoded))
+        buffers["data"] = b"".join(encoded)
+        return []
+
+
+class _DictionaryEncoder(_Encoder):
+    kind = "dictionary"
+
+    def __init__(self, enum: type, nullable: bool):
+        super().__init__(nullable)
+        self.enum = enum
+        self.null = next(iter(enum))
+        self.codes = {member: index for index, member in enumerate(enum)}
+
+    def spec(self) -> Spec:
+        spec = super().spec()
+        spec["dictionary"] = [member.value for member in self.enum]
+        return spec
+
+    def _encode(self, values: List[Any], buffers: Dict[str, Any]) -> List["Column"]:
+        codes = self.codes
+        try:
+            buffers["data"] = bytes([codes[value] for value in values])
+        except KeyError:
+            # Trusted (unvalidated) models may hold raw values instead of members.
+            buffers["data"] = bytes([codes[self.enum(value)] for value in values])
+        return []
+
+
+class _ListEncoder(_Encoder):
+    kind = "list"
+    null = ()
+
+    def __init__(self, child: _Encoder, nullable: bool):
+        super().__init__(nullable)
+        self.child = child
+
+    def children(self) -> List[_Encoder]:
+        return [self.child]
+
+    def _encode(self, values: List[Any], buffers: Dict[str, Any]) -> List["Column"]:
+        buffers["offsets"] = _offsets(map(len, values))
+        return [self.child.encode(list(chain.from_iterable(values)))]
+
+
+class _MapEncoder(_Encoder):
+    kind = "map"
+    null = {}
+
+    def __init__(self, keys: _Encoder, items: _Encoder, nullable: bool):
+        super().__init__(nullable)
+        self.keys = keys
+        self.items = items
+
+    def children(self) -> List[_Encoder]:
+        return [self.keys, self.items]
+
+    def _encode(self, values: List[Any], buffers: Dict[str, Any]) -> List["Column"]:
+        buffers["offsets"] = _offsets(map(len, values))
+        return [self.keys.encode(list(chain.from_iterable(values))),
+                self.items.encode(list(chain.from_iterable(value.values() for value in values)))]
+
+
+_TYPECODES = {"int": "q", "float": "d"}
+
+
+def _encoder_for(annotation: Any, nullable: bool = False) -> _Encoder:
+    origin = get_origin(annotation)
+    args = get_args(annotation)
+    if origin is Union:
+        non_null = [arg for arg in args if arg is not type(None)]
+        if len(non_null) == 1:
+            return _encoder_for(non_null[0], nullable=len(non_null) < len(args))
+    elif origin is list and args:
+        return _ListEncoder(_encoder_for(args[0]), nullable)
+    elif origin is dict and args:
+        return _MapEncoder(_encoder_for(args[0]), _encoder_for(args[1]), nullable)
+    elif isinstance(annotation, type):
+        if issubclass(annotation, Enum):
+            return _DictionaryEncoder(annotation, nullable)
+        if issubclass(annotation, UUID):
+            return _UUIDEncoder(nullable)
+        if issubclass(annotation, bool):
+            return _BoolEncoder(nullable)
+        if issubclass(annotation, int):
+            return _NumberEncoder("int", nullable)
+        if issubclass(annotation, float):
+            return _NumberEncoder("float", nullable)
+        if issubclass(annotation, str):
+            return _StringEncoder(nullable)
+    raise TypeError(f"Unsupported column type: {annotation!r}")
+
+
+@lru_cache(maxsize=None)
+def _table_columns(model: type, extra: Tuple[Tuple[str, Any], ...] = ()) -> Tuple[Tuple[str, _Encoder], ...]:
+    nested = {name for name, _, _ in nested_schema_fields(model)}
+    columns = [(name, _encoder_for(field.annotation))
+               for name, field in model.model_fields.items() if name not in nested]
+    columns += [(name, _encoder_for(annotation)) for name, annotation in extra]
+    return tuple(columns)
+
+
+TABLES: Dict[str, Tuple[type, Tuple[Tuple[str, Any], ...]]] = {
+    "tests": (TestSchema, ()),
+    "questions": (QuestionSchema, (("score", float),)),
+    "answers": (AnswerSchema, (("test_id", UUID),)),
+}
+
+
+class Column:
+    """
+    Read-only view of one column chunk. Items are rebuilt on access - UUID, str, list, dict,
+    the dictionary value (enum value) for dictionary columns.
+    """
+
+    def __init__(self, spec: Spec, length: int, buffers: Dict[str, memoryview], children: List["Column"]):
+        self.spec = spec
+        self.kind: str = spec["kind"]
+        self.length = length
+        self.buffers = buffers
+        self.children = children
+        self.validity = buffers.get("validity")
+        data = buffers.get("data")
+        if self.kind in _TYPECODES:
+            data = data.cast(_TYPECODES[self.kind])
+        self._data = data
+        self._offsets = buffers["offsets"].cast("i") if "offsets" in buffers else None
+        self._dictionary = None
+
+    def __len__(self) -> int:
+        return self.length
+
+    def is_null(self, index: int) -> bool:
+        return self.validity is not None and not _get_bit(self.validity, index)
+
+    def __getitem__(self, index: int) -> Any:
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError("Column index out of range")
+        if self.is_null(index):
+            return None
+        kind = self.kind
+        if kind in ("int", "float"):
+            return self._data[index]
+        if kind == "bool":
+            return _get_bit(self._data, index)
+        if kind == "uuid":
+            return UUID(bytes=bytes(self._data[index * 16:index * 16 + 16]))
+        if kind == "str":
+            return str(self._data[self._offsets[index]:self._offsets[index + 1]], "utf-8")
+        if kind == "dictionary":
+            return self.dictionary[self._data[index]]
+        start, end = self._offsets[index], self._offsets[index + 1]
+        if kind == "list":
+            child = self.children[0]
+            return [child[position] for position in range(start, end)]
+        keys, values = self.children
+        return {keys[position]: values[position] for position in range(start, end)}
+
+    @property
+    def dictionary(self) -> List[str]:
+        if self._dictionary is None:
+            self._dictionary = list(self.spec["dictionary"])
+        return self._dictionary
+
+    def to_pylist(self) -> List[Any]:
+        return [self[index] for index in range(self.length)]
+
+    def to_numpy(self):
+        """
+        Zero-copy NumPy view of the values: int64/float64 numbers, uint8 dictionary codes,
+        (n, 16) uint8 UUID bytes, bool values (a copy, unpacked from the bitmap).
+        Null rows hold 0. Strings, lists and maps are not supported.
+        """
+        if np is None:
+            raise ImportError("NumPy is required for to_numpy().")
+        if self.kind in _TYPECODES:
+            return np.frombuffer(self._data, dtype=np.int64 if self.kind == "int" else np.float64, count=self.length)
+        if self.kind == "dictionary":
+            return np.frombuffer(self._data, dtype=np.uint8, count=self.length)
+        if self.kind == "uuid":
+            return np.frombuffer(self._data, dtype=np.uint8, count=self.length * 16).reshape(self.length, 16)
+        if self.kind == "bool":
+            bits = np.unpackbits(np.frombuffer(self._data, dtype=np.uint8), bitorder="little")
+            return bits[:self.length].astype(bool)
+        raise TypeError(f"{self.kind} columns have no NumPy representation.")
+
+    def to_arrow(self):
+        """
+        Zero-copy Arrow array over the column buffers.
+        """
+        if pa is None:
+            raise ImportError("pyarrow is required for to_arrow().")
+        validity = pa.py_buffer(self.validity) if self.validity is not None else None
+        kind = self.kind
+        if kind == "dictionary":
+            codes = pa.Array.from_buffers(pa.uint8(), self.length, [validity, pa.py_buffer(self._data)])
+            return pa.DictionaryArray.from_arrays(codes, pa.array(self.dictionary, pa.string()))
+        if kind == "list":
+            child = self.children[0].to_arrow()
+            return pa.Array.from_buffers(pa.list_(child.type), self.length,
+                                         [validity, pa.py_buffer(self._offsets)], children=[child])
+        if kind == "map":
+            keys, values = (child.to_arrow() for child in self.children)
+            entries = pa.StructArray.from_arrays([keys, values], fields=[pa.field("key", keys.type, nullable=False),
+                                                                        pa.field("value", values.type)])
+            return pa.Array.from_buffers(pa.map_(keys.type, values.type), self.length,
+                                         [validity, pa.py_buffer(self._offsets)], children=[entries])
+        arrow_type = _ARROW_TYPES[kind]()
+        buffers = [validity]
+        if self._offsets is not None:
+            buffers.append(pa.py_buffer(self._offsets))
+        buffers.append(pa.py_buffer(self._data))
+        return pa.Array.from_buffers(arrow_type, self.length, buffers)
+
+
+_ARROW_TYPES = {
+    "int": lambda: pa.int64(),
+    "float": lambda: pa.float64(),
+    "bool": lambda: pa.bool_(),
+    "uuid": lambda: pa.binary(16),
+    "str": lambda: pa.string(),
+}
+
+
+class ColumnarChunk:
+    """
+    Up to `chunk_size` rows of one table, as named columns.
+    """
+
+    def __init__(self, table: str, length: int, columns: Dict[str, Column]):
+        self.table = table
+        self.length = length
+        self.columns = columns
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __getitem__(self, name: str) -> Column:
+        return self.columns[name]
+
+    def to_pylist(self) -> List[Dict[str, Any]]:
+        values = [column.to_pylist() for column in self.columns.values()]
+        return [dict(zip(self.columns, row)) for row in zip(*values)]
+
+    def to_arrow(self):
+        if pa is None:
+            raise ImportError("pyarrow is required for to_arrow().")
+        return pa.RecordBatch.from_arrays([column.to_arrow() for column in self.columns.values()],
+                                          names=list(self.columns))
+
+
+class _TableBuilder:
+    """
+    Collects the rows of one table chunk, columns are encoded on flush.
+    """
+
+    def __init__(self, table: str):
+        model, extra = TABLES[table]
+        self.table = table
+        self.columns = _table_columns(model, extra)
+        self.extra = [name for name, _ in extra]
+        self.rows: List[Dict[str, Any]] = []
+        self.extra_values: Dict[str, List[Any]] = {name: [] for name in self.extra}
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def append(self, row: Any, **extra: Any) -> None:
+        self.rows.append(row.__dict__)
+        for name, value in extra.items():
+            self.extra_values[name].append(value)
+
+    def flush(self) -> ColumnarChunk:
+        rows, self.rows = self.rows, []
+        columns = {}
+        for name, encoder in self.columns:
+            if name in self.extra_values:
+                values, self.extra_values[name] = self.extra_values[name], []
+            else:
+                values = [row[name] for row in rows]
+            columns[name] = encoder.encode(values)
+        return ColumnarChunk(self.table, len(rows), columns)
+
+
+def iter_chunks(tests: Iterable[TestSchema], chunk_size: int = CHUNK_SIZE,
+                partial_credit: bool = False) -> Iterator[ColumnarChunk]:
+    """
+    Flattens tests into chunks of the tests, questions and answers tables, at most `chunk_size`
+    rows each. Only the unfinished chunk of every table is kept in memory.
+    """
+    if chunk_size < 1:
+        raise ValueError("Chunk size must be a positive integer.")
+    builders = {table: _TableBuilder(table) for table in TABLES}
+    tests_table, questions_table, answers_table = builders["tests"], builders["questions"], builders["answers"]
+    for test in tests:
+        tests_table.append(test)
+        for question, encoded in zip(test.questions, encode_test(test)):
+            questions_table.append(question, score=question_score(encoded, partial_credit))
+        for answer in test.answers:
+            answers_table.append(answer, test_id=test.id)
+        for builder in builders.values():
+            if len(builder) >= chunk_size:
+                yield builder.flush()
+    for builder in builders.values():
+        if len(builder):
+            yield builder.flush()
+
+
+def _write_buffers(column: Column, file, position: int) -> Tuple[Dict[str, Any], int]:
+    buffers = {}
+    for name, buffer in column.buffers.items():
+        padding = -position % 8
+        file.write(bytes(padding))
+        position += padding
+        file.write(buffer)
+        buffers[name] = [position, len(buffer)]
+        position += len(buffer)
+    children = []
+    for child in column.children:
+        layout, position = _write_buffers(child, file, position)
+        children.append(layout)
+    return {"length": column.length, "buffers": buffers, "children": children}, position
+
+
+def write_columnar(tests: Iterable[TestSchema], path: Union[str, os.PathLike], chunk_size: int = CHUNK_SIZE,
+                   partial_credit: bool = False) -> Dict[str, int]:
+    """
+    Writes the tests as a memory-mappable columnar file. Returns the number of rows per table.
+    """
+    footer: Dict[str, Any] = {"version": VERSION, "tables": {}}
+    for table, (model, extra) in TABLES.items():
+        footer["tables"][table] = {
+            "columns": [[name, encoder.spec()] for name, encoder in _table_columns(model, extra)],
+            "chunks": [],
+        }
+    with open(path, "wb") as file:
+        file.write(MAGIC)
+        position = len(MAGIC)
+        for chunk in iter_chunks(tests, chunk_size, partial_credit):
+            columns = {}
+            for name, column in chunk.columns.items():
+                columns[name], position = _write_buffers(column, file, position)
+            footer["tables"][chunk.table]["chunks"].append({"length": chunk.length, "columns": columns})
+        raw = json.dumps(footer, separators=(",", ":")).encode()
+        file.write(raw)
+        file.write(_FOOTER_LENGTH.pack(len(raw)))
+        file.write(MAGIC)
+    return {table: sum(chunk["length"] for chunk in layout["chunks"]) for table, layout in footer["tables"].items()}
+
+
+class ColumnarFile:
+    """
+    Memory-mapped columnar file written by `write_columnar`. Columns are views of the mapping,
+    the file stays mapped while any of them is referenced.
+    """
+
+    def __init__(self, path: Union[str, os.PathLike]):
+        with open(path, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._mmap)
+        tail = len(MAGIC) + _FOOTER_LENGTH.size
+        if len(view) < len(MAGIC) + tail or view[:len(MAGIC)] != MAGIC or view[-len(MAGIC):] != MAGIC:
+            view.release()
+            raise ValueError("Not a columnar file.")
+        footer_length = _FOOTER_LENGTH.unpack(view[-tail:-len(MAGIC)])[0]
+        footer = json.loads(bytes(view[-tail - footer_length:-tail]))
+        view.release()
+        if footer.get("version") != VERSION:
+            raise ValueError(f"Unsupported columnar file version: {footer.get('version')}")
+        self._tables: Dict[str, Any] = footer["tables"]
+
+    @property
+    def tables(self) -> List[str]:
+        return list(self._tables)
+
+    def num_rows(self, table: str) -> int:
+        return sum(chunk["length"] for chunk in self._tables[table]["chunks"])
+
+    def _column(self, spec: Spec, layout: Dict[str, Any]) -> Column:
+        buffers = {name: memoryview(self._mmap)[offset:offset + size]
+                   for name, (offset, size) in layout["buffers"].items()}
+        children = [self._column(child_spec, child_layout)
+                    for child_spec, child_layout in zip(spec["children"], layout["children"])]
+        return Column(spec, layout["length"], buffers, children)
+
+    def chunks(self, table: str) -> Iterator[ColumnarChunk]:
+        layout = self._tables[table]
+        specs = dict(layout["columns"])
+        for chunk in layout["chunks"]:
+            yield ColumnarChunk(table, chunk["length"], {name: self._column(specs[name], column_layout)
+                                                         for name, column_layout in chunk["columns"].items()})
+
+    def to_pylist(self, table: str) -> List[Dict[str, Any]]:
+        return [row for chunk in self.chunks(table) for row in chunk.to_pylist()]
+
+    def to_arrow(self, table: str):
+        if pa is None:
+            raise ImportError("pyarrow is required for to_arrow().")
+        batches = [chunk.to_arrow() for chunk in self.chunks(table)]
+        if not batches:
+            return pa.Table.from_batches([], schema=_arrow_schema(table))
+        return pa.Table.from_batches(batches)
+
+    def close(self) -> None:
+        """
+        Unmaps the file - only possible once no column views are left.
+        """
+        self._mmap.close()
+
+    def __enter__(self) -> "ColumnarFile":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        try:
+            self.close()
+        except BufferError:
+            pass
+
+
+def read_columnar(path: Union[str, os.PathLike]) -> ColumnarFile:
+    return ColumnarFile(path)
+
+
+def _arrow_schema(table: str):
+    empty = _TableBuilder(table).flush()
+    return empty.to_arrow().schema
+
+
+def write_parquet(tests: Iterable[TestSchema], directory: Union[str, os.PathLike], chunk_size: int = CHUNK_SIZE,
+                  partial_credit: bool = False) -> Dict[str, int]:
+    """
+    Writes `<table>.parquet` files (tests, questions, answers) to `directory`, requires pyarrow.
+    Returns the number of rows per table.
+    """
+    if pa is None:
+        raise ImportError("pyarrow is required for write_parquet().")
+    os.makedirs(directory, exist_ok=True)
+    writers = {table: pq.ParquetWriter(os.path.join(directory, f"{table}.parquet"), _arrow_schema(table))
+               for table in TABLES}
+    counts = dict.fromkeys(TABLES, 0)
+    try:
+        for chunk in iter_chunks(tests, chunk_size, partial_credit):
+            writers[chunk.table].write_batch(chunk.to_arrow())
+            counts[chunk.table] += chunk.length
+    finally:
+        for writer in writers.values():
+            writer.close()
+    return counts
@@ -0,0 +1,151 @@
+"""
+Immutable, hashable variants of the question, answer and user models for large in-process caches.
+
+* `intern` returns one shared instance per distinct value (weak-value pool, entries disappear
+  together with the last reference to the instance),
+* small containers - answer keys, possible answers - are deduplicated across instances (role sets
+  are shared per value by RoleSet itself),
+  answer keys are interned strings,
+* other nested values (e.g. test dicts of a user) are deep-frozen by `frozen_value`.
+
+Field values are stored in the per-instance `__dict__` pydantic requires, so the models are
+frozen but not slotted.
+"""
+from sys import intern as intern_string
+from threading import Lock
+from typing import Annotated, Any, Dict, Tuple, TypeVar
+from weakref import WeakValueDictionary
+
+from pydantic import AfterValidator, ConfigDict, Field
+
+from .tests import AnswerSchema, QuestionSchema
+from .users import UserSchema
+
+ModelT = TypeVar("ModelT", bound="FrozenMixin")
+
+# Upper bound of deduplicated tuples - they cannot be weakly referenced, so the table keeps them alive.
+MAX_SHARED_TUPLES = 4096
+
+_lock = Lock()
+_models: "WeakValueDictionary[Tuple[Any, ...], Any]" = WeakValueDictionary()
+_mappings: "WeakValueDictionary[Tuple[Tuple[str, str], ...], FrozenDict]" = WeakValueDictionary()
+_tuples: Dict[Tuple[Any, ...], Tuple[Any, ...]] = {}
+
+
+class FrozenDict(Dict[str, str]):
+    """
+    Hashable dict that rejects modification.
+    """
+    __slots__ = ("_hash", "__weakref__")
+
+    def __hash__(self) -> int:
+        try:
+            return self._hash
+        except AttributeError:
+            self._hash = hash(frozenset(self.items()))
+            return self._hash
+
+    def _immutable(self, *args, **kwargs):
+        raise TypeError("FrozenDict is immutable")
+
+    __setitem__ = __delitem__ = clear = pop = popitem = setdefault = update = __ior__ = _immutable
+
+    def __reduce__(self):
+        return FrozenDict, (dict(self),)
+
+
+def shared_tuple(value: Tuple[Any, ...]) -> Tuple[Any, ...]:
+    """
+    One shared tuple per distinct value, string items interned.
+    """
+    value = tuple(intern_string(item) if type(item) is str else item for item in value)
+    with _lock:
+        shared = _tuples.get(value)
+        if shared is None:
+            if len(_tuples) >= MAX_SHARED_TUPLES:
+                return value
+            shared = _tuples[value] = value
+    return shared
+
+
+def shared_mapping(value: Dict[str, str]) -> FrozenDict:
+    """
+    One shared FrozenDict per distinct mapping, keys interned.
+    """
+    key = tuple((intern_string(item), answer) for item, answer in value.items())
+    with _lock:
+        shared = _mappings.get(key)
+        if shared is None:
+            shared = _mappings[key] = FrozenDict(key)
+    return shared
+
+
+def frozen_value(value: Any) -> Any:
+    """
+    Hashable copy of a JSON-like value - dicts become FrozenDicts, lists and tuples become tuples,
+    sets become frozensets. Other unhashable values are rejected.
+    """
+    if isinstance(value, dict):
+        return FrozenDict((key, frozen_value(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(frozen_value(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(frozen_value(item) for item in value)
+    try:
+        hash(value)
+    except TypeError:
+        raise ValueError(f"{type(value).__name__} values cannot be frozen.") from None
+    return value
+
+
+SharedStrTuple = Annotated[Tuple[str, ...], AfterValidator(shared_tuple)]
+SharedMapping = Annotated[Dict[str, str], AfterValidator(shared_mapping)]
+FrozenValue = Annotated[Any, AfterValidator(frozen_value)]
+
+
+class FrozenMixin:
+
+    @classmethod
+    def intern(cls, data: Any) -> ModelT:
+        """
+        Validates `data` (or takes a model of this class) and returns the pooled equal instance.
+        Validation runs inside `trusted_mode` too - the shared containers are built by the validators.
+        """
+        model = data if type(data) is cls else cls.__pydantic_validator__.validate_python(data)
+        key = (cls, tuple(model.__dict__.values()))
+        with _lock:
+            pooled = _models.get(key)
+            if pooled is None:
+                _models[key] = pooled = model
+        return pooled
+
+    @classmethod
+    def from_bytes(cls, data: bytes, validate: bool = False) -> ModelT:
+        """
+        Rebuilds the model from `to_bytes` output and returns the pooled instance. The decoded values
+        are always validated - shared containers are built by the validators.
+        """
+        return cls.intern(dict(super().from_bytes(data).__dict__))
+
+
+class FrozenAnswerSchema(FrozenMixin, AnswerSchema):
+    model_config = ConfigDict(frozen=True)
+
+    answer_choice: SharedStrTuple = ()
+
+
+class FrozenQuestionSchema(FrozenMixin, QuestionSchema):
+    model_config = ConfigDict(frozen=True)
+
+    possible_answers: SharedMapping = Field(..., min_length=2)
+    correct_answers: SharedStrTuple = Field(..., min_length=1)
+
+
+class FrozenUserSchema(FrozenMixin, UserSchema):
+    model_config = ConfigDict(frozen=True)
+
+    tests: Tuple[FrozenValue, ...] = ()
+
+
+def pool_size() -> int:
+    return len(_models)
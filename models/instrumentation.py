@@ -0,0 +1,206 @@
+"""
+Opt-in validation metrics of all library models: validation count, latency histogram and
+failures by model, field and error type.
+
+Instrumentation wraps `BaseSchema.__init__`, `model_validate`, `model_validate_json`,
+`model_validate_strings` and `validate_many` only while enabled, so it costs nothing when disabled.
+* only top-level validations are recorded, nested models are validated inside pydantic-core,
+* `validate_many` records every row with the mean row latency of its batch, failures per row,
+* validations through TypeAdapters (`question_create_adapter`, `LazyModelList.materialize`) and
+  chunks validated in `validate_parallel` worker processes are not recorded.
+"""
+from bisect import bisect_left
+from functools import wraps
+from threading import Lock
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from pydantic import ValidationError
+
+from .base import BaseSchema
+
+LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005,
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0,
+)
+METRIC_PREFIX = "interview_prep_validation"
+
+_INSTRUMENTED_CLASSMETHODS = ("model_validate", "model_validate_json", "model_validate_strings")
+
+
+class _ModelStats:
+    __slots__ = ("count", "failures", "latency_sum", "buckets", "errors")
+
+    def __init__(self):
+        self.count = 0
+        self.failures = 0
+        self.latency_sum = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.errors: Dict[Tuple[str, str], int] = {}
+
+
+_lock = Lock()
+_stats: Dict[str, _ModelStats] = {}
+_originals: Dict[str, Any] = {}
+
+
+def _error_field(loc: Tuple[Any, ...]) -> str:
+    """
+    Dotted field path without list indexes, `__root__` for model-level errors.
+    """
+    return ".".join(str(part) for part in loc if not isinstance(part, int)) or "__root__"
+
+
+def _record(model: str, seconds: float, failures: List[List[Dict[str, Any]]], count: int = 1) -> None:
+    """
+    Records `count` validations taking `seconds` in total, `failures` - error lists of the failed ones.
+    """
+    bucket = bisect_left(LATENCY_BUCKETS, seconds / count)
+    with _lock:
+        stats = _stats.get(model)
+        if stats is None:
+            stats = _stats[model] = _ModelStats()
+        stats.count += count
+        stats.latency_sum += seconds
+        stats.buckets[bucket] += count
+        stats.failures += len(failures)
+        for errors in failures:
+            for details in errors:
+                key = (_error_field(details["loc"]), details["type"])
+                stats.errors[key] = stats.errors.get(key, 0) + 1
+
+
+def _timed(function: Callable[..., Any], model_of: Callable[[Any], type]) -> Callable[..., Any]:
+    @wraps(function)
+    def wrapper(first, *args, **kwargs):
+        start = perf_counter()
+        try:
+            result = function(first, *args, **kwargs)
+        except ValidationError as error:
+            errors = error.errors(include_url=False, include_context=False, include_input=False)
+            _record(model_of(first).__name__, perf_counter() - start, [errors])
+            raise
+        _record(model_of(first).__name__, perf_counter() - start, [])
+        return result
+    return wrapper
+
+
+def _timed_batch(function: Callable[..., Any]) -> Callable[..., Any]:
+    @wraps(function)
+    def wrapper(cls, rows, *args, **kwargs):
+        rows = list(rows)
+        start = perf_counter()
+        result = function(cls, rows, *args, **kwargs)
+        if rows:
+            _record(cls.__name__, perf_counter() - start, list(result.errors.values()), len(rows))
+        return result
+    return wrapper
+
+
+def enable_instrumentation() -> None:
+    with _lock:
+        if _originals:
+            return
+        _originals["__init__"] = BaseSchema.__dict__.get("__init__")
+        init = BaseSchema.__init__
+        BaseSchema.__init__ = _timed(lambda self, **data: init(self, **data), type)
+        for name in _INSTRUMENTED_CLASSMETHODS:
+            _originals[name] = BaseSchema.__dict__.get(name)
+            function = getattr(BaseSchema, name).__func__
+            setattr(BaseSchema, name, classmethod(_timed(function, lambda cls: cls)))
+        _originals["validate_many"] = BaseSchema.__dict__.get("validate_many")
+        setattr(BaseSchema, "validate_many", classmethod(_timed_batch(BaseSchema.validate_many.__func__)))
+
+
+def disable_instrumentation() -> None:
+    with _lock:
+        for name, original in _originals.items():
+            if original is None:
+                delattr(BaseSchema, name)
+            else:
+                setattr(BaseSchema, name, original)
+        _originals.clear()
+
+
+def instrumentation_enabled() -> bool:
+    return bool(_originals)
+
+
+def reset_instrumentation() -> None:
+    with _lock:
+        _stats.clear()
+
+
+def instrumentation_snapshot() -> Dict[str, Dict[str, Any]]:
+    """
+    Copy of the collected metrics keyed by model name:
+    count, failures, latency_sum (seconds), cumulative latency `buckets` keyed by upper bound
+    and `errors` as {field: {error type: count}}.
+    """
+    with _lock:
+        snapshot = {}
+        for model, stats in _stats.items():
+            cumulative = 0
+            buckets = {}
+            for bound, count in zip(LATENCY_BUCKETS + (float("inf"),), stats.buckets):
+                cumulative += count
+                buckets[bound] = cumulative
+            errors: Dict[str, Dict[str, int]] = {}
+            for (field, error_type), count in stats.errors.items():
+                errors.setdefault(field, {})[error_type] = count
+            snapshot[model] = {
+                "count": stats.count,
+                "failures": stats.failures,
+                "latency_sum": stats.latency_sum,
+                "buckets": buckets,
+                "errors": errors,
+            }
+        return snapshot
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _bound(value: float) -> str:
+    return "+Inf" if value == float("inf") else repr(value)
+
+
+def prometheus_text(snapshot: Optional[Dict[str, Dict[str, Any]]] = None) -> str:
+    """
+    Metrics in the Prometheus text exposition format.
+    """
+    if snapshot is None:
+        snapshot = instrumentation_snapshot()
+    lines = [
+        f"# HELP {METRIC_PREFIX}_total Number of model validations.",
+        f"# TYPE {METRIC_PREFIX}_total counter",
+    ]
+    lines += [f'{METRIC_PREFIX}_total{{model="{_label(model)}"}} {stats["count"]}'
+              for model, stats in snapshot.items()]
+    lines += [
+        f"# HELP {METRIC_PREFIX}_failures_total Number of failed model validations.",
+        f"# TYPE {METRIC_PREFIX}_failures_total counter",
+    ]
+    lines += [f'{METRIC_PREFIX}_failures_total{{model="{_label(model)}"}} {stats["failures"]}'
+              for model, stats in snapshot.items()]
+    lines += [
+        f"# HELP {METRIC_PREFIX}_errors_total Number of validation errors by field and error type.",
+        f"# TYPE {METRIC_PREFIX}_errors_total counter",
+    ]
+    for model, stats in snapshot.items():
+        for field, types in stats["errors"].items():
+            for error_type, count in types.items():
+                lines.append(f'{METRIC_PREFIX}_errors_total{{model="{_label(model)}",field="{_label(field)}",'
+                             f'type="{_label(error_type)}"}} {count}')
+    lines += [
+        f"# HELP {METRIC_PREFIX}_seconds Model validation latency.",
+        f"# TYPE {METRIC_PREFIX}_seconds histogram",
+    ]
+    for model, stats in snapshot.items():
+        model_label = _label(model)
+        for bound, count in stats["buckets"].items():
+            lines.append(f'{METRIC_PREFIX}_seconds_bucket{{model="{model_label}",le="{_bound(bound)}"}} {count}')
+        lines.append(f'{METRIC_PREFIX}_seconds_sum{{model="{model_label}"}} {stats["latency_sum"]!r}')
+        lines.append(f'{METRIC_PREFIX}_seconds_count{{model="{model_label}"}} {stats["count"]}')
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,110 @@
+from collections.abc import Sequence
+from typing import Annotated, Any, Generic, Iterator, List, Optional, TypeVar
+
+from pydantic import GetCoreSchemaHandler, TypeAdapter
+from pydantic_core import core_schema
+
+from .base import list_adapter
+
+ItemT = TypeVar("ItemT")
+
+
+class LazyModelList(Sequence, Generic[ItemT]):
+    """
+    Read-only list of models kept as the raw payload until an item is accessed.
+    The first access validates the whole list once and caches the models.
+    """
+    __slots__ = ("_raw", "_items", "_adapter")
+
+    def __init__(self, raw: List[Any], adapter: TypeAdapter):
+        self._raw = raw
+        self._items: Optional[List[ItemT]] = None
+        self._adapter = adapter
+
+    @classmethod
+    def from_items(cls, items: List[ItemT], item_type: Any) -> "LazyModelList[ItemT]":
+        """
+        Already materialized list of validated `items`, e.g. decoded by `models.codec`.
+        """
+        lazy = cls(items, list_adapter(item_type))
+        lazy._items = items
+        return lazy
+
+    @property
+    def materialized(self) -> bool:
+        return self._items is not None
+
+    def materialize(self) -> List[ItemT]:
+        if self._items is None:
+            self._items = self._adapter.validate_python(self._raw)
+        return self._items
+
+    def __getitem__(self, index):
+        return self.materialize()[index]
+
+    def __iter__(self) -> Iterator[ItemT]:
+        return iter(self.materialize())
+
+    def __len__(self) -> int:
+        return len(self._raw)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, LazyModelList):
+            if self._items is None and other._items is None:
+                return self._raw == other._raw
+            return self.materialize() == other.materialize()
+        if isinstance(other, list):
+            return self.materialize() == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        if self._items is None:
+            return f"LazyModelList(<{len(self._raw)} not validated>)"
+        return f"LazyModelList({self._items!r})"
+
+    def dump(self, mode: str = "python") -> List[Any]:
+        """
+        Raw payload while nothing was accessed, serialized models afterwards.
+        """
+        if self._items is None:
+            return self._raw
+        return self._adapter.dump_python(self._items, mode=mode)
+
+
+class LazyList:
+    """
+    Field type of a list validated on first access: `LazyList[Model]`, or
+    `Annotated[LazyModelList[Model], LazyList(Model, min_length=1)]` with a length constraint.
+    """
+
+    def __init__(self, item_type: Any, min_length: Optional[int] = None):
+        self.item_type = item_type
+        self.min_length = min_length
+
+    def __class_getitem__(cls, item_type: Any) -> Any:
+        return Annotated[LazyModelList[item_type], cls(item_type)]
+
+    def __get_pydantic_core_schema__(self, _source: Any, handler: GetCoreSchemaHandler) -> core_schema.CoreSchema:
+        adapter = list_adapter(self.item_type)
+        min_length = self.min_length or 0
+
+        def wrap(value: Any, validator: core_schema.ValidatorFunctionWrapHandler) -> LazyModelList:
+            if isinstance(value, LazyModelList):
+                return value
+            if not isinstance(value, list) or len(value) < min_length:
+                # Full validation of invalid input, only to raise the standard errors.
+                validator(value)
+            # A copy - later changes to the caller's list must not bypass the length check.
+            return LazyModelList(list(value), adapter)
+
+        def serialize(value: Any, info: core_schema.SerializationInfo) -> List[Any]:
+            if isinstance(value, LazyModelList):
+                return value.dump(info.mode)
+            return value
+
+        # The inner list schema is used for errors and the JSON schema only, items are not validated here.
+        return core_schema.no_info_wrap_validator_function(
+            wrap,
+            core_schema.list_schema(handler.generate_schema(self.item_type), min_length=self.min_length),
+            serialization=core_schema.plain_serializer_function_ser_schema(serialize, info_arg=True),
+        )
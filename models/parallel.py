@@ -0,0 +1,101 @@
+"""
+Bulk validation of large imports on a process pool.
+"""
+import os
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from pydantic_core import from_json
+
+from .base import BaseSchema, BulkValidationResult, _trusted_mode, trusted_mode
+
+# Inputs of at most this many chunks are validated in-process - starting workers costs more.
+MIN_PARALLEL_CHUNKS = 2
+
+
+def _decode(row: Any) -> Any:
+    return from_json(row) if isinstance(row, (bytes, bytearray, str)) else row
+
+
+def _validate_chunk(model: type, start: int, rows: List[Any], trusted: bool) -> BulkValidationResult:
+    """
+    Validates one chunk; rows may be dicts or JSON documents (bytes/str).
+    Indexes of the result are positions in the whole input.
+    """
+    decoded: List[Any] = []
+    positions: List[int] = []
+    errors: Dict[int, List[Dict[str, Any]]] = {}
+    for position, row in enumerate(rows, start):
+        try:
+            decoded.append(_decode(row))
+        except ValueError as exc:
+            errors[position] = [{"type": "json_invalid", "loc": (), "msg": f"Invalid JSON: {exc}", "input": row}]
+            continue
+        positions.append(position)
+
+    if trusted:
+        with trusted_mode():
+            result = model.validate_many(decoded)
+    else:
+        result = model.validate_many(decoded)
+    valid = {positions[index]: value for index, value in result.valid.items()}
+    errors.update((positions[index], value) for index, value in result.errors.items())
+    return BulkValidationResult(valid=valid, errors=dict(sorted(errors.items())))
+
+
+def _chunks(rows: Iterable[Any], chunk_size: int) -> Iterator[Tuple[int, List[Any]]]:
+    iterator = iter(rows)
+    start = 0
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield start, chunk
+        start += len(chunk)
+
+
+def validate_parallel(model: type, rows: Iterable[Any], workers: Optional[int] = None, chunk_size: int = 5_000,
+                      executor: Optional[Executor] = None) -> Iterator[BulkValidationResult]:
+    """
+    Validates `rows` (dicts or JSON bytes/str per row) with `model.validate_many` on a process pool.
+    * yields one BulkValidationResult per chunk, in input order, indexes relative to the whole input,
+    * rows are read lazily and at most two chunks per worker are in flight,
+    * small inputs (up to MIN_PARALLEL_CHUNKS chunks) or workers=1 are validated in-process,
+    * `executor` - reuse an existing pool instead of starting one per call,
+    * a `trusted_mode` active at the call applies inside the workers as well,
+    * arguments are checked at the call, not on the first result.
+    """
+    if not (isinstance(model, type) and issubclass(model, BaseSchema)):
+        raise TypeError(f"{model!r} is not a library schema.")
+    if chunk_size < 1:
+        raise ValueError("Chunk size must be a positive integer.")
+    return _validate_chunks(model, _chunks(rows, chunk_size), workers or os.cpu_count() or 1, executor,
+                            _trusted_mode.get())
+
+
+def _validate_chunks(model: type, chunks: Iterator[Tuple[int, List[Any]]], workers: int,
+                     executor: Optional[Executor], trusted: bool) -> Iterator[BulkValidationResult]:
+    head = list(islice(chunks, MIN_PARALLEL_CHUNKS + 1))
+    if (workers == 1 and executor is None) or len(head) <= MIN_PARALLEL_CHUNKS:
+        for start, chunk in head:
+            yield _validate_chunk(model, start, chunk, trusted)
+        for start, chunk in chunks:
+            yield _validate_chunk(model, start, chunk, trusted)
+        return
+
+    pool = executor or ProcessPoolExecutor(max_workers=workers)
+    try:
+        pending = deque()
+        for start, chunk in head:
+            pending.append(pool.submit(_validate_chunk, model, start, chunk, trusted))
+        for start, chunk in chunks:
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+            pending.append(pool.submit(_validate_chunk, model, start, chunk, trusted))
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        if executor is None:
+            pool.shutdown(cancel_futures=True)
@@ -0,0 +1,78 @@
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Tuple
+import string
+
+DEFAULT_SPECIAL_CHARACTERS = "!@#$%^&*(),.?\":{}|<>"
+
+
+class PasswordViolation(NamedTuple):
+    code: str
+    message: str
+
+
+class PasswordPolicy:
+    """
+    Password rules checked in a single scan of the password:
+    * at least `min_length` characters,
+    * at least one lowercase letter, uppercase letter and digit (each can be switched off),
+    * at least one character from `special_characters` (empty string switches it off).
+    """
+
+    def __init__(self,
+                 min_length: int = 10,
+                 require_lowercase: bool = True,
+                 require_uppercase: bool = True,
+                 require_digit: bool = True,
+                 special_characters: str = DEFAULT_SPECIAL_CHARACTERS):
+        self.min_length = min_length
+        self.require_lowercase = require_lowercase
+        self.require_uppercase = require_uppercase
+        self.require_digit = require_digit
+        self.special_characters = special_characters
+
+        character_classes: List[Tuple[FrozenSet[str], PasswordViolation]] = []
+        if require_lowercase:
+            character_classes.append((frozenset(string.ascii_lowercase), PasswordViolation(
+                "lowercase", "Password must contain at least one lowercase letter.")))
+        if require_uppercase:
+            character_classes.append((frozenset(string.ascii_uppercase), PasswordViolation(
+                "uppercase", "Password must contain at least one uppercase letter.")))
+        if require_digit:
+            character_classes.append((frozenset(string.digits), PasswordViolation(
+                "digit", "Password must contain at least one digit.")))
+        if special_characters:
+            character_classes.append((frozenset(special_characters), PasswordViolation(
+                "special", "Password must contain at least one special character.")))
+        self._character_classes = tuple(character_classes)
+        self._too_short = PasswordViolation(
+            "min_length", f"Password must be at least {min_length} characters long.")
+
+    def check(self, password: str) -> List[PasswordViolation]:
+        """
+        Returns every broken rule, an empty list for a valid password.
+        """
+        violations = [self._too_short] if len(password) < self.min_length else []
+        characters = set(password)
+        for character_class, violation in self._character_classes:
+            if characters.isdisjoint(character_class):
+                violations.append(violation)
+        return violations
+
+    def check_many(self, passwords: Iterable[str]) -> Dict[int, List[PasswordViolation]]:
+        """
+        Bulk pre-check, returns violations keyed by the index of each invalid password.
+        """
+        result = {}
+        for index, password in enumerate(passwords):
+            violations = self.check(password)
+            if violations:
+                result[index] = violations
+        return result
+
+    def validate(self, password: str) -> str:
+        """
+        Raises ValueError listing every broken rule, one per line.
+        """
+        violations = self.check(password)
+        if violations:
+            raise ValueError("".join(f"{violation.message}\n" for violation in violations))
+        return password
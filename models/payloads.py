@@ -0,0 +1,540 @@
+"""
+Synthetic request payloads for load tests and fuzzing, generated from the field constraints
+of the schemas (`max_length`, `min_length`/`min_items`, `ge`/`le`, enums, nested models):
+* valid payloads - model rules fill in what constraints cannot express (password policy,
+  answers matching the question type, consistent test questions),
+* mutations - invalid payloads breaking one constraint or rule, oversized tests, and
+  random garbage values,
+* `iter_payloads` - lazy deterministic stream of dicts or JSON bytes for replay against services,
+* `fuzz` - checks that validation raises nothing but ValidationError within a time budget.
+"""
+from datetime import datetime, timedelta, timezone
+from enum import Enum
+from functools import lru_cache
+from typing import (Annotated, Any, Callable, Dict, FrozenSet, Iterator, List, Literal, NamedTuple, Optional, Tuple, Union,
+                    get_args, get_origin)
+from uuid import UUID
+import random
+import time
+
+from pydantic import BaseModel, ValidationError
+from pydantic_core import to_json
+
+from .lazy import LazyModelList
+from .tests import Level, QuestionCreateSchema, QuestionType, TestCreateSchema, TestSchema, TestSummarySchema
+from .users import CachedEmailStr, Role, RoleSet, UserCreateSchema, UserLoginSchema
+
+VALID = "valid"
+# Used when a field has no upper bound.
+DEFAULT_MAX_ITEMS = 5
+DEFAULT_MAX_TEXT = 60
+DEFAULT_INT_RANGE = (1, 1000)
+OVERSIZED_QUESTIONS = 1_000
+
+_WORDS = ("python", "sql", "docker", "cache", "index", "query", "thread", "process", "memory", "network",
+          "request", "schema", "service", "queue", "deploy", "test", "model", "value", "error", "latency")
+_EPOCH = datetime(2020, 1, 1, tzinfo=timezone.utc)
+
+
+class Payload(NamedTuple):
+    model: type
+    kind: str
+    # Expected outcome of validation, None for random garbage.
+    valid: Optional[bool]
+    data: Union[Dict[str, Any], bytes]
+
+
+class FuzzFailure(NamedTuple):
+    payload: Payload
+    reason: str
+
+
+class FuzzReport(NamedTuple):
+    checked: int
+    accepted: int
+    rejected: int
+    # Validation raised something other than ValidationError.
+    crashes: List[FuzzFailure]
+    # Validation took longer than the time budget.
+    slow: List[FuzzFailure]
+    # A payload expected to be valid was rejected, or an invalid one was accepted.
+    mismatches: List[FuzzFailure]
+    max_seconds: float
+
+    @property
+    def ok(self) -> bool:
+        return not (self.crashes or self.slow or self.mismatches)
+
+
+class _Field(NamedTuple):
+    name: str
+    annotation: Any
+    required: bool
+    min_length: Optional[int]
+    max_length: Optional[int]
+    ge: Optional[float]
+    le: Optional[float]
+
+
+def _bound(metadata: List[Any], name: str) -> Any:
+    values = [getattr(item, name) for item in metadata if getattr(item, name, None) is not None]
+    return values[-1] if values else None
+
+
+@lru_cache(maxsize=None)
+def _fields(model: type) -> Tuple[_Field, ...]:
+    fields = []
+    for name, field in model.model_fields.items():
+        metadata = field.metadata
+        ge, gt = _bound(metadata, "ge"), _bound(metadata, "gt")
+        le, lt = _bound(metadata, "le"), _bound(metadata, "lt")
+        fields.append(_Field(name, field.annotation, field.is_required(),
+                             _bound(metadata, "min_length"), _bound(metadata, "max_length"),
+                             ge if gt is None else gt + 1, le if lt is None else lt - 1))
+    return tuple(fields)
+
+
+def _optional(annotation: Any) -> Tuple[Any, bool]:
+    if get_origin(annotation) is Union:
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        if len(args) == 1:
+            return args[0], True
+    return annotation, False
+
+
+def _is_list(annotation: Any) -> bool:
+    """
+    Lists, lazily validated lists and homogeneous tuples (`Tuple[X, ...]`).
+    """
+    origin = get_origin(annotation)
+    if origin is tuple:
+        args = get_args(annotation)
+        return len(args) == 2 and args[1] is Ellipsis
+    return origin in (list, List, LazyModelList)
+
+
+def _is_dict(annotation: Any) -> bool:
+    return get_origin(annotation) in (dict, Dict)
+
+
+class PayloadGenerator:
+    """
+    Deterministic generator of payloads (plain JSON-compatible dicts) for the given `seed`.
+    * `valid(model)` - payload accepted by `model`,
+    * `invalid(model, mutation=None)` - payload altered by a (random) mutation of `mutations(model)`,
+    * `stream(model, ...)` - lazy stream of both.
+    """
+
+    def __init__(self, seed: int = 0, mutation_ratio: float = 0.2, oversized_questions: int = OVERSIZED_QUESTIONS):
+        if not 0 <= mutation_ratio <= 1:
+            raise ValueError("Mutation ratio must be between 0 and 1.")
+        self.seed = seed
+        self.mutation_ratio = mutation_ratio
+        self.oversized_questions = oversized_questions
+        self.rng = random.Random(seed)
+
+    # Values
+
+    def uuid(self) -> str:
+        return str(UUID(int=self.rng.getrandbits(128), version=4))
+
+    def text(self, min_length: int = 0, max_length: Optional[int] = None) -> str:
+        max_length = DEFAULT_MAX_TEXT if max_length is None else max_length
+        length = self.rng.randint(min_length, max(min_length, min(max_length, min_length + DEFAULT_MAX_TEXT)))
+        words = []
+        size = -1
+        while size < length:
+            word = self.rng.choice(_WORDS)
+            words.append(word)
+            size += len(word) + 1
+        return " ".join(words)[:length]
+
+    def email(self) -> str:
+        return f"{self.rng.choice(_WORDS)}.{self.rng.getrandbits(32):x}@example.com"
+
+    def timestamp(self) -> Union[str, int]:
+        moment = _EPOCH + timedelta(seconds=self.rng.randrange(200_000_000))
+        return moment.isoformat() if self.rng.random() < 0.7 else int(moment.timestamp())
+
+    def value(self, annotation: Any, field: Optional[_Field] = None) -> Any:
+        """
+        Random valid value of `annotation` within the bounds of `field`.
+        """
+        rng = self.rng
+        annotation, _ = _optional(annotation)
+        min_length = field.min_length if field and field.min_length is not None else 0
+        max_length = field.max_length if field else None
+        if isinstance(annotation, type):
+            if issubclass(annotation, BaseModel):
+                return self.valid(annotation)
+            if issubclass(annotation, Enum):
+                return rng.choice(list(annotation)).value
+            if annotation is CachedEmailStr:
+                return self.email()
+            if annotation is RoleSet:
+                return [role.value for role in rng.sample(list(Role), rng.randint(1, 2))]
+            if annotation is bool:
+                return rng.random() < 0.5
+            if annotation is int:
+                low = int(field.ge) if field and field.ge is not None else DEFAULT_INT_RANGE[0]
+                high = int(field.le) if field and field.le is not None else max(low, DEFAULT_INT_RANGE[1])
+                return rng.randint(low, high)
+            if annotation is float:
+                return round(rng.uniform(field.ge if field and field.ge is not None else 0,
+                                         field.le if field and field.le is not None else 100), 3)
+            if annotation is str:
+                return self.text(min_length, max_length)
+            if annotation is UUID:
+                return self.uuid()
+            if annotation is datetime:
+                return self.timestamp()
+        if get_origin(annotation) is Literal:
+            value = rng.choice(get_args(annotation))
+            return value.value if isinstance(value, Enum) else value
+        if _is_list(annotation) or _is_dict(annotation):
+            high = max_length if max_length is not None else min_length + DEFAULT_MAX_ITEMS
+            return self.items(annotation, rng.randint(min_length, max(min_length, high)))
+        raise TypeError(f"Payloads of {annotation!r} are not supported.")
+
+    def items(self, annotation: Any, count: int) -> Union[List[Any], Dict[str, Any]]:
+        annotation, _ = _optional(annotation)
+        if _is_dict(annotation):
+            value_type = get_args(annotation)[1]
+            return {chr(ord("A") + index) if index < 26 else f"K{index}": self.value(value_type)
+                    for index in range(count)}
+        item_type = get_args(annotation)[0] if get_args(annotation) else Any
+        if get_origin(item_type) is Annotated:
+            item_type = get_args(item_type)[0]
+        # Untyped items (UserSchema.tests) get ids.
+        if item_type is Any:
+            item_type = UUID
+        return [self.value(item_type) for _ in range(count)]
+
+    # Payloads
+
+    def valid(self, model: type) -> Dict[str, Any]:
+        rules = _rules(model, _VALID_RULES)
+        generated_by_rules = frozenset().union(*(fields for _, fields in rules))
+        payload = {}
+        for field in _fields(model):
+            if field.name in generated_by_rules or (not field.required and self.rng.random() < 0.2):
+                continue
+            payload[field.name] = self.value(field.annotation, field)
+        for rule, _ in rules:
+            rule(self, model, payload)
+        return payload
+
+    def mutations(self, model: type) -> List[str]:
+        return list(_mutations(model))
+
+    def invalid(self, model: type, mutation: Optional[str] = None) -> Tuple[str, Optional[bool], Dict[str, Any]]:
+        """
+        Valid payload altered by `mutation` (random one by default), returned as
+        (mutation, expected validity, payload).
+        """
+        mutations = _mutations(model)
+        if mutation is None:
+            mutation = self.rng.choice(list(mutations))
+        elif mutation not in mutations:
+            raise ValueError(f"Unknown mutation of {model.__name__}: {mutation!r}")
+        apply, expected = mutations[mutation]
+        payload = self.valid(model)
+        apply(self, model, payload)
+        return mutation, expected, payload
+
+    def stream(self, model: type, count: Optional[int] = None, as_json: bool = False) -> Iterator[Payload]:
+        """
+        `count` payloads (endless for None), a `mutation_ratio` share of them mutated.
+        """
+        produced = 0
+        while count is None or produced < count:
+            if self.rng.random() < self.mutation_ratio:
+                kind, expected, data = self.invalid(model)
+            else:
+                kind, expected, data = VALID, True, self.valid(model)
+            yield Payload(model, kind, expected, to_json(data) if as_json else data)
+            produced += 1
+
+
+# Model rules, looked up along the MRO so subclasses (QuestionSchema, the question variants,
+# TestSchema) share them.
+
+Rule = Callable[[PayloadGenerator, type, Dict[str, Any]], None]
+Mutation = Tuple[Rule, Optional[bool]]
+
+
+def _rules(model: type, table: Dict[type, Any]) -> List[Any]:
+    return [table[base] for base in reversed(model.__mro__) if base in table]
+
+
+def _password(generator: PayloadGenerator, model: type, payload: Dict[str, Any]) -> None:
+    rng = generator.rng
+    policy = model.password_policy
+    characters = [rng.choice("abcdefghijkmnopqrstuvwxyz"), rng.choice("ABCDEFGHJKLMNPQRSTUVWXYZ"),
+                  rng.choice("23456789")]
+    if policy.special_characters:
+        characters.append(rng.choice(policy.special_characters))
+    while len(characters) < max(policy.min_length, 4) + rng.randrange(8):
+        characters.append(rng.choice("abcdefghijkmnopqrstuvwxyzABCDEFGHJKLMNPQRSTUVWXYZ23456789"))
+    rng.shuffle(characters)
+    payload["password"] = payload["confirm_password"] = "".join(characters)
+
+
+def _answers(generator: PayloadGenerator, model: type, payload: Dict[str, Any]) -> None:
+    rng = generator.rng
+    question_type = QuestionType(payload["question_type"])
+    if question_type is QuestionType.TRUE_FALSE:
+        payload["possible_answers"] = {"A": "TRUE", "B": "FALSE"}
+        payload["correct_answers"] = [rng.choice("AB")]
+        return
+    keys = list(payload["possible_answers"]) if len(payload["possible_answers"]) >= 2 else ["A", "B", "C"]
+    payload["possible_answers"] = {key: generator.text(1, 40) for key in keys}
+    count = 1 if question_type is QuestionType.SINGLE_CHOICE else rng.randint(1, len(keys))
+    payload["correct_answers"] = sorted(rng.sample(keys, count))
+
+
+def _question_types(generator: PayloadGenerator, model: type, payload: Dict[str, Any]) -> None:
+    payload["type_of_question"] = [question_type.value for question_type in
+                                   generator.rng.sample(list(QuestionType), generator.rng.randint(1, 3))]
+
+
+def _questions(generator: PayloadGenerator, model: type, payload: Dict[str, Any], count: Optional[int] = None) -> None:
+    """
+    Questions numbered from 1 belonging to the test, answers to some of them.
+    """
+    rng = generator.rng
+    question_model = _item_model(model, "questions")
+    if count is None:
+        count = payload.get("number_of_question", rng.randint(1, 20))
+    questions = [generator.valid(question_model) for _ in range(count)]
+    for number, question in enumerate(questions, 1):
+        question["test_id"] = payload["id"]
+        question["question_number"] = number
+    answers = [{"id": generator.uuid(), "question_id": question["id"],
+                "answer_choice": rng.sample(list(question["possible_answers"]), 1)}
+               for question in questions if rng.random() < 0.5]
+    payload.update(questions=questions, answers=answers, is_solved=len(answers) == len(questions))
+
+
+def _credentials(generator: PayloadGenerator, model: type, payload: Dict[str, Any]) -> None:
+    payload["username"] = generator.email()
+    payload["password"] = generator.text(1)
+
+
+def _item_model(model: type, name: str) -> type:
+    return get_args(model.model_fields[name].annotation)[0]
+
+
+# Rules with the fields they set, those are not generated from constraints first.
+_VALID_RULES: Dict[type, Tuple[Rule, FrozenSet[str]]] = {
+    UserCreateSchema: (_password, frozenset({"password", "confirm_password"})),
+    QuestionCreateSchema: (_answers, frozenset({"correct_answers"})),
+    TestCreateSchema: (_question_types, frozenset({"type_of_question"})),
+    TestSchema: (_questions, frozenset({"questions", "answers", "is_solved"})),
+    TestSummarySchema: (_questions, frozenset({"questions", "answers", "is_solved"})),
+    UserLoginSchema: (_credentials, frozenset({"username", "password"})),
+}
+
+
+def _pick(generator: PayloadGenerator, model: type, condition: Callable[[_Field], bool]) -> _Field:
+    return generator.rng.choice([field for field in _fields(model) if condition(field)])
+
+
+def _missing_field(generator: PayloadGenerator, model: type, payload: Dict[str, Any]) -> None:
+    payload.pop(_pick(generator, model, lambda field: field.required).name, None)
+
+
+def _too_long(generator: PayloadGenerator, model: type, payload: Dict[str, Any]) -> None:
+    field = _pick(generator, model, lambda field: field.max_length is not None)
+    length = field.max_length + generator.rng.randint(1, 20)
+    if _optional(field.annotation)[0] is str:
+        payload[field.name] = (generator.text(field.max_length, field.max_length) + "x" * length)[:length]
+    else:
+        payload[field.name] = generator.items(field.annotation, length)
+
+
+def _too_short(generator: PayloadGenerator, model: type, payload: Dict[str, Any]) -> None:
+    field = _pick(generator, model, lambda field: field.min_length)
+    length = generator.rng.randrange(field.min_length)
+    if _optional(field.annotation)[0] is str:
+        payload[field.name] = generator.text(length, length)
+    else:
+        payload[field.name] = generator.items(field.annotation, length)
+
+
+def _out_of_range(generator: PayloadGenerator, model: type, payload: Dict[str, Any]) -> None:
+    field = _pick(generator, model, lambda field: field.ge is not None or field.le is not None)
+    below = field.le is None or (field.ge is not None and generator.rng.random() < 0.5)
+    offset = generator.rng.randint(1, 100)
+    payload[field.name] = int(field.ge) - offset if below else int(field.le) + offset
+
+
+def _wrong_type(generator: PayloadGenerator, model: type, payload: Dict[str, Any]) -> None:
+    field = generator.rng.choice(_fields(model))
+    payload[field.name] = [{"unexpected": 1}] if _is_dict(_optional(field.annotation)[0]) else {"unexpected": [1]}
+
+
+def _garbage_value(rng: random.Random, depth: int = 0) -> Any:
+    choice = rng.randrange(12 if depth < 3 else 9)
+    if choice == 0:
+        return None
+    if choice == 1:
+        return rng.random() < 0.5
+    if choice == 2:
+        return rng.choice([0, -1, 2 ** 63, -2 ** 63 - 1, 10 ** 30])
+    if choice == 3:
+        return rng.choice([0.0, -0.5, 1e308, -1e-308])
+    if choice == 4:
+        return ""
+    if choice == 5:
+        return "x" * rng.choice([1, 256, 65_536])
+    if choice == 6:
+        return rng.choice(["\u0000", "‮", "😀" * 8, " ", "null", "TRUE", "2024-13-45", "A" * 10])
+    if choice == 7:
+        return str(UUID(int=rng.getrandbits(128)))
+    if choice == 8:
+        nested: Any = 1
+        for _ in range(rng.randint(1, 64)):
+            nested = [nested] if rng.random() < 0.5 else {"a": nested}
+        return nested
+    if choice == 9:
+        return [_garbage_value(rng, depth + 1) for _ in range(rng.randint(0, 5))]
+    if choice == 10:
+        return {rng.choice(["A", "", "id", "\u0000"]): _garbage_value(rng, depth + 1) for _ in range(rng.randint(0, 5))}
+    return [rng.choice(list(Level)).value, rng.choice(list(QuestionType)).value]
+
+
+def _garbage(generator: PayloadGenerator, model: type, payload: Dict[str, Any]) -> None:
+    for _ in range(generator.rng.randint(1, 3)):
+        payload[generator.rng.choice(_fields(model)).name] = _garbage_value(generator.rng)
+
+
+def _weak_password(generator: PayloadGenerator, model: type, payload: Dict[str, Any]) -> None:
+    policy = model.password_policy
+    password = payload["password"]
+    weakened = [character for character in password if not character.isdigit()] if policy.require_digit else []
+    if not weakened or generator.rng.random() < 0.5:
+        weakened = list(password[:policy.min_length - 1])
+    payload["password"] = payload["confirm_password"] = "".join(weakened)
+
+
+def _password_mismatch(generator: PayloadGenerator, model: type, payload: Dict[str, Any]) -> None:
+    payload["confirm_password"] = payload["password"] + generator.rng.choice("aZ9!")
+
+
+def _empty_credential(generator: PayloadGenerator, model: type, payload: Dict[str, Any]) -> None:
+    payload[generator.rng.choice(["username", "password"])] = ""
+
+
+def _true_false_options(generator: PayloadGenerator, model: type, payload: Dict[str, Any]) -> None:
+    payload["question_type"] = QuestionType.TRUE_FALSE.value
+    payload["possible_answers"] = {"A": "TRUE", "B": "FALSE", "C": generator.text(1, 20)}
+    payload["correct_answers"] = ["A"]
+
+
+def _single_choice_answers(generator: PayloadGenerator, model: type, payload: Dict[str, Any]) -> None:
+    payload["question_type"] = QuestionType.SINGLE_CHOICE.value
+    payload["possible_answers"] = {key: generator.text(1, 20) for key in "ABCD"}
+    payload["correct_answers"] = sorted(generator.rng.sample("ABCD", generator.rng.randint(2, 4)))
+
+
+def _unknown_correct_answer(generator: PayloadGenerator, model: type, payload: Dict[str, Any]) -> None:
+    payload["correct_answers"] = payload["correct_answers"][:-1] + ["Z"]
+
+
+def _duplicate_question_types(generator: PayloadGenerator, model: type, payload: Dict[str, Any]) -> None:
+    question_type = generator.rng.choice(list(QuestionType)).value
+    payload["type_of_question"] = [question_type, question_type]
+
+
+def _invalid_question(generator: PayloadGenerator, model: type, payload: Dict[str, Any]) -> None:
+    mutation = generator.rng.choice(["true_false_options", "single_choice_answers", "unknown_correct_answer"])
+    _, _, question = generator.invalid(_item_model(model, "questions"), mutation)
+    payload["questions"][generator.rng.randrange(len(payload["questions"]))] = question
+
+
+def _oversized_questions(generator: PayloadGenerator, model: type, payload: Dict[str, Any]) -> None:
+    _questions(generator, model, payload, generator.oversized_questions)
+
+
+_MUTATIONS: Dict[type, Dict[str, Mutation]] = {
+    UserCreateSchema: {"weak_password": (_weak_password, False),
+                       "password_mismatch": (_password_mismatch, False)},
+    UserLoginSchema: {"empty_credential": (_empty_credential, False)},
+    QuestionCreateSchema: {"true_false_options": (_true_false_options, False),
+                           "single_choice_answers": (_single_choice_answers, False),
+                           "unknown_correct_answer": (_unknown_correct_answer, False)},
+    TestCreateSchema: {"duplicate_question_types": (_duplicate_question_types, False)},
+    # Valid, but far more questions than a generated test has - for sizing request bodies.
+    TestSchema: {"invalid_question": (_invalid_question, False),
+                 "oversized_questions": (_oversized_questions, True)},
+    # Questions of a summary are validated on access, so an invalid question is not rejected up front.
+    TestSummarySchema: {"oversized_questions": (_oversized_questions, True)},
+}
+
+
+@lru_cache(maxsize=None)
+def _mutations(model: type) -> Dict[str, Mutation]:
+    fields = _fields(model)
+    mutations: Dict[str, Mutation] = {"wrong_type": (_wrong_type, False), "garbage": (_garbage, None)}
+    if any(field.required for field in fields):
+        mutations["missing_field"] = (_missing_field, False)
+    if any(field.max_length is not None for field in fields):
+        mutations["too_long"] = (_too_long, False)
+    if any(field.min_length for field in fields):
+        mutations["too_short"] = (_too_short, False)
+    if any(field.ge is not None or field.le is not None for field in fields):
+        mutations["out_of_range"] = (_out_of_range, False)
+    for table in _rules(model, _MUTATIONS):
+        mutations.update(table)
+    return mutations
+
+
+def iter_payloads(model: type, count: Optional[int] = None, seed: int = 0, mutation_ratio: float = 0.2,
+                  as_json: bool = False, oversized_questions: int = OVERSIZED_QUESTIONS) -> Iterator[Payload]:
+    """
+    Lazy deterministic stream of `count` payloads for `model` (endless for None):
+    * a `mutation_ratio` share is mutated, see `PayloadGenerator.mutations`,
+    * `as_json` - payload data as JSON bytes, ready to replay against a service.
+    """
+    generator = PayloadGenerator(seed, mutation_ratio, oversized_questions)
+    return generator.stream(model, count, as_json)
+
+
+def fuzz(model: type, count: int = 10_000, seed: int = 0, time_budget: float = 0.05, mutation_ratio: float = 0.5,
+         as_json: bool = True, oversized_questions: int = OVERSIZED_QUESTIONS) -> FuzzReport:
+    """
+    Validates `count` generated payloads with `model` and reports:
+    * crashes - exceptions other than ValidationError,
+    * slow payloads - validation longer than `time_budget` seconds,
+    * mismatches - valid payloads rejected or invalid payloads accepted.
+    """
+    # The first validation builds the (deferred) schema, it is not timed.
+    model.__pydantic_validator__.validate_python(PayloadGenerator(seed).valid(model))
+    validator = model.__pydantic_validator__
+    validate = validator.validate_json if as_json else validator.validate_python
+    accepted = rejected = 0
+    crashes, slow, mismatches = [], [], []
+    max_seconds = 0.0
+    for payload in iter_payloads(model, count, seed, mutation_ratio, as_json, oversized_questions):
+        start = time.perf_counter()
+        try:
+            validate(payload.data)
+            outcome = True
+        except ValidationError:
+            outcome = False
+        except Exception as exc:
+            crashes.append(FuzzFailure(payload, f"{type(exc).__name__}: {exc}"))
+            continue
+        finally:
+            elapsed = time.perf_counter() - start
+        max_seconds = max(max_seconds, elapsed)
+        if outcome:
+            accepted += 1
+        else:
+            rejected += 1
+        if elapsed > time_budget:
+            slow.append(FuzzFailure(payload, f"validation took {elapsed * 1000:.1f} ms"))
+        if payload.valid is not None and payload.valid != outcome:
+            mismatches.append(FuzzFailure(payload, "rejected" if payload.valid else "accepted"))
+    return FuzzReport(count, accepted, rejected, crashes, slow, mismatches, max_seconds)
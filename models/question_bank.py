@@ -0,0 +1,249 @@
+"""
+In-process index of a question bank:
+* inverted token index over `question_text` for ranked text search,
+* filter indexes by question type, skill and level for selecting questions for a TestCreateSchema,
+* MinHash signatures of word shingles with LSH buckets for near-duplicate detection.
+
+Every lookup touches only the postings/buckets of the queried values, not the whole bank.
+Questions are added and removed incrementally. `save`/`load` store the questions with their
+tokens and signatures, so a warm start only rebuilds the dictionaries.
+"""
+from collections import defaultdict
+from hashlib import blake2b
+from heapq import nsmallest
+from math import log
+from os import PathLike
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple, Union
+from uuid import UUID
+import random
+import re
+
+from pydantic_core import from_json, to_json
+
+from .base import list_adapter
+from .tests import Level, QuestionSchema, QuestionType, TestCreateSchema, TestSchema, normalize_skill
+
+VERSION = 1
+
+_TOKEN = re.compile(r"\w+")
+_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN.findall(text.casefold())
+
+
+def _stable_hash(value: str) -> int:
+    return int.from_bytes(blake2b(value.encode(), digest_size=4).digest(), "little")
+
+
+class SearchHit(NamedTuple):
+    question: QuestionSchema
+    score: float
+
+
+class _Entry(NamedTuple):
+    question: QuestionSchema
+    tokens: Tuple[str, ...]
+    skills: Tuple[str, ...]
+    level: Optional[Level]
+    signature: Tuple[int, ...]
+    order: int
+
+
+class QuestionBank:
+    """
+    Index of questions, see the module docstring.
+    * num_perm - MinHash signature length, bands * rows_per_band,
+    * shingle_size - words per shingle,
+    * threshold - default estimated Jaccard similarity of near duplicates.
+    """
+
+    def __init__(self, num_perm: int = 64, bands: int = 16, shingle_size: int = 3, threshold: float = 0.8,
+                 seed: int = 1):
+        if num_perm % bands:
+            raise ValueError("num_perm has to be a multiple of bands.")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.shingle_size = shingle_size
+        self.threshold = threshold
+        self.seed = seed
+        rng = random.Random(seed)
+        self._permutations = [(rng.randrange(1, _PRIME), rng.randrange(_PRIME)) for _ in range(num_perm)]
+        self._entries: Dict[UUID, _Entry] = {}
+        self._postings: Dict[str, Set[UUID]] = defaultdict(set)
+        self._by_type: Dict[QuestionType, Set[UUID]] = defaultdict(set)
+        self._by_skill: Dict[str, Set[UUID]] = defaultdict(set)
+        self._by_level: Dict[Level, Set[UUID]] = defaultdict(set)
+        self._buckets: Dict[Tuple[int, Tuple[int, ...]], Set[UUID]] = defaultdict(set)
+        self._counter = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, question_id: UUID) -> bool:
+        return question_id in self._entries
+
+    def get(self, question_id: UUID) -> Optional[QuestionSchema]:
+        entry = self._entries.get(question_id)
+        return entry.question if entry is not None else None
+
+    def signature(self, text: str) -> Tuple[int, ...]:
+        """
+        MinHash signature of the word shingles of `text`.
+        """
+        words = tokenize(text)
+        size = min(self.shingle_size, len(words)) or 1
+        hashes = {_stable_hash(" ".join(words[index:index + size]))
+                  for index in range(max(len(words) - size + 1, 1))}
+        return tuple(min((a * value + b) % _PRIME for value in hashes) & _MAX_HASH
+                     for a, b in self._permutations)
+
+    def _band_keys(self, signature: Tuple[int, ...]) -> Iterable[Tuple[int, Tuple[int, ...]]]:
+        rows = self.num_perm // self.bands
+        return ((band, signature[band * rows:(band + 1) * rows]) for band in range(self.bands))
+
+    def add(self, question: QuestionSchema, skills: Iterable[str] = (), level: Optional[Level] = None) -> None:
+        """
+        Indexes `question` (replacing a question with the same id) with the skills and level
+        of the test it belongs to.
+        """
+        tokens = tuple(tokenize(question.question_text))
+        entry = _Entry(question, tokens, tuple(sorted({normalize_skill(skill) for skill in skills})),
+                       Level(level) if level is not None else None, self.signature(question.question_text), 0)
+        self._insert(entry)
+
+    def add_test(self, test: TestSchema) -> None:
+        """
+        Indexes the questions of `test` with its skills and level.
+        """
+        for question in test.questions:
+            self.add(question, test.skills_or_tools or (), test.level)
+
+    def _insert(self, entry: _Entry) -> None:
+        question_id = entry.question.id
+        if question_id in self._entries:
+            self.remove(question_id)
+        self._counter += 1
+        entry = entry._replace(order=self._counter)
+        self._entries[question_id] = entry
+        for token in set(entry.tokens):
+            self._postings[token].add(question_id)
+        self._by_type[QuestionType(entry.question.question_type)].add(question_id)
+        for skill in entry.skills:
+            self._by_skill[skill].add(question_id)
+        if entry.level is not None:
+            self._by_level[entry.level].add(question_id)
+        for key in self._band_keys(entry.signature):
+            self._buckets[key].add(question_id)
+
+    def remove(self, question_id: UUID) -> bool:
+        """
+        Removes the question from every index, returns False if it was not indexed.
+        """
+        entry = self._entries.pop(question_id, None)
+        if entry is None:
+            return False
+        indexes = [(self._postings, set(entry.tokens)),
+                   (self._by_type, [QuestionType(entry.question.question_type)]),
+                   (self._by_skill, entry.skills),
+                   (self._by_level, [entry.level] if entry.level is not None else []),
+                   (self._buckets, list(self._band_keys(entry.signature)))]
+        for index, keys in indexes:
+            for key in keys:
+                ids = index[key]
+                ids.discard(question_id)
+                if not ids:
+                    del index[key]
+        return True
+
+    def search(self, text: str, limit: int = 10) -> List[SearchHit]:
+        """
+        Questions sharing tokens with `text`, ranked by the summed IDF of the shared tokens.
+        """
+        scores: Dict[UUID, float] = defaultdict(float)
+        total = len(self._entries)
+        for token in set(tokenize(text)):
+            ids = self._postings.get(token)
+            if ids:
+                idf = log(1 + total / len(ids))
+                for question_id in ids:
+                    scores[question_id] += idf
+        ranked = nsmallest(limit, scores.items(), key=lambda item: (-item[1], self._entries[item[0]].order))
+        return [SearchHit(self._entries[question_id].question, score) for question_id, score in ranked]
+
+    def candidates(self, request: TestCreateSchema, limit: Optional[int] = None,
+                   match_level: bool = True) -> List[QuestionSchema]:
+        """
+        Questions of the requested types (and level), having at least one of the requested skills when
+        the request lists any - ranked by the number of matching skills, then by insertion order.
+        """
+        type_ids = [self._by_type.get(QuestionType(question_type), set())
+                    for question_type in set(request.type_of_question)]
+        groups: List[List[Set[UUID]]] = [type_ids]
+        if match_level:
+            groups.append([self._by_level.get(Level(request.level), set())])
+        skills = {normalize_skill(skill) for skill in request.skills_or_tools or ()}
+        if skills:
+            groups.append([self._by_skill.get(skill, set()) for skill in skills])
+        # A question matches a group when it is in any of its postings. Matching starts from the smallest
+        # group, each intersection iterates at most the current matches.
+        groups.sort(key=lambda group: sum(map(len, group)))
+        matching: Set[UUID] = set().union(*groups[0])
+        for group in groups[1:]:
+            matching = set().union(*(matching.intersection(postings) for postings in group))
+        entries = [self._entries[question_id] for question_id in matching]
+        entries.sort(key=lambda entry: (-len(skills.intersection(entry.skills)), entry.order))
+        return [entry.question for entry in entries[:limit]]
+
+    def near_duplicates(self, question: Union[QuestionSchema, str],
+                        threshold: Optional[float] = None) -> List[SearchHit]:
+        """
+        Indexed questions whose estimated Jaccard similarity of shingles with `question` (a question
+        or text) reaches `threshold`, most similar first. The question itself is not reported.
+        """
+        threshold = self.threshold if threshold is None else threshold
+        text = question if isinstance(question, str) else question.question_text
+        own_id = None if isinstance(question, str) else question.id
+        signature = self.signature(text)
+        found: Set[UUID] = set()
+        for key in self._band_keys(signature):
+            found.update(self._buckets.get(key, ()))
+        found.discard(own_id)
+        hits = []
+        for question_id in found:
+            entry = self._entries[question_id]
+            similarity = sum(a == b for a, b in zip(signature, entry.signature)) / self.num_perm
+            if similarity >= threshold:
+                hits.append((entry, similarity))
+        hits.sort(key=lambda hit: (-hit[1], hit[0].order))
+        return [SearchHit(entry.question, similarity) for entry, similarity in hits]
+
+    def save(self, path: Union[str, PathLike]) -> None:
+        entries = sorted(self._entries.values(), key=lambda entry: entry.order)
+        document = {
+            "version": VERSION,
+            "settings": {"num_perm": self.num_perm, "bands": self.bands, "shingle_size": self.shingle_size,
+                         "threshold": self.threshold, "seed": self.seed},
+            "questions": list_adapter(QuestionSchema).dump_python([entry.question for entry in entries], mode="json"),
+            "entries": [[entry.tokens, entry.skills, entry.level, entry.signature] for entry in entries],
+        }
+        with open(path, "wb") as file:
+            file.write(to_json(document))
+
+    @classmethod
+    def load(cls, path: Union[str, PathLike]) -> "QuestionBank":
+        """
+        Loads a bank written by `save` - questions are validated, tokens and signatures are reused.
+        """
+        with open(path, "rb") as file:
+            document = from_json(file.read())
+        if document.get("version") != VERSION:
+            raise ValueError(f"Unsupported question bank version: {document.get('version')}")
+        bank = cls(**document["settings"])
+        questions = list_adapter(QuestionSchema).validate_python(document["questions"])
+        for question, (tokens, skills, level, signature) in zip(questions, document["entries"]):
+            bank._insert(_Entry(question, tuple(tokens), tuple(skills), Level(level) if level is not None else None,
+                                tuple(signature), 0))
+        return bank
@@ -0,0 +1,142 @@
+"""
+Registry of precomputed JSON Schemas of the exported models.
+
+Every model gets a content hash (SHA-256 of its canonical validation and serialization
+JSON Schemas) and the registry gets a `version` derived from all of them, so services can
+compare hashes at handshake time instead of regenerating schemas. A registry can be
+frozen into a bundle file and loaded back without building any schema.
+"""
+from hashlib import sha256
+from importlib import import_module
+from os import PathLike
+from typing import Any, Dict, List, Optional, Union
+import json
+
+import pydantic
+from pydantic import BaseModel
+from pydantic.json_schema import models_json_schema
+
+BUNDLE_FORMAT = 1
+MODES = ("validation", "serialization")
+OPENAPI_REF_TEMPLATE = "#/components/schemas/{model}"
+
+
+def _canonical(value: Any) -> bytes:
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def exported_models() -> Dict[str, type]:
+    """
+    Models exported by the library, keyed by name.
+    """
+    package = import_module(__package__)
+    result = {}
+    for name in package.__all__:
+        value = getattr(package, name)
+        if isinstance(value, type) and issubclass(value, BaseModel):
+            result[name] = value
+    return result
+
+
+class SchemaRegistry:
+    """
+    Lazily computed, cached JSON Schemas and hashes of a set of models.
+    """
+
+    def __init__(self, models: Optional[Dict[str, type]] = None):
+        self._models = models
+        self._schemas: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._hashes: Dict[str, str] = {}
+        self._openapi: Optional[Dict[str, Any]] = None
+
+    @property
+    def models(self) -> Dict[str, type]:
+        if self._models is None:
+            self._models = exported_models()
+        return self._models
+
+    def names(self) -> List[str]:
+        return sorted(set(self._schemas) | set(self.models))
+
+    def _entry(self, name: str) -> Dict[str, Dict[str, Any]]:
+        entry = self._schemas.get(name)
+        if entry is None:
+            model = self.models.get(name)
+            if model is None:
+                raise KeyError(f"Unknown model: {name}")
+            entry = self._schemas[name] = {mode: model.model_json_schema(mode=mode) for mode in MODES}
+        return entry
+
+    def json_schema(self, name: str, mode: str = "validation") -> Dict[str, Any]:
+        return self._entry(name)[mode]
+
+    def schema_hash(self, name: str) -> str:
+        schema_hash = self._hashes.get(name)
+        if schema_hash is None:
+            schema_hash = self._hashes[name] = sha256(_canonical(self._entry(name))).hexdigest()
+        return schema_hash
+
+    def hashes(self) -> Dict[str, str]:
+        return {name: self.schema_hash(name) for name in self.names()}
+
+    @property
+    def version(self) -> str:
+        """
+        Hash of all model hashes - changes whenever any schema changes.
+        """
+        return sha256(_canonical(self.hashes())).hexdigest()
+
+    def diff(self, hashes: Dict[str, str]) -> List[str]:
+        """
+        Names of models whose hashes differ from (or are missing in) the given ones.
+        """
+        own = self.hashes()
+        return sorted(name for name in set(own) | set(hashes) if own.get(name) != hashes.get(name))
+
+    def precompute(self) -> "SchemaRegistry":
+        self.hashes()
+        self.openapi_components()
+        return self
+
+    def openapi_components(self) -> Dict[str, Any]:
+        """
+        `components.schemas` of an OpenAPI document holding every model (validation mode).
+        """
+        if self._openapi is None:
+            models = [(model, "validation") for _, model in sorted(self.models.items())]
+            _, schema = models_json_schema(models, ref_template=OPENAPI_REF_TEMPLATE)
+            self._openapi = schema.get("$defs", {})
+        return self._openapi
+
+    def to_bundle(self) -> Dict[str, Any]:
+        self.precompute()
+        return {
+            "format": BUNDLE_FORMAT,
+            "pydantic": pydantic.VERSION,
+            "version": self.version,
+            "models": {name: {"hash": self.schema_hash(name), **self._entry(name)} for name in self.names()},
+            "openapi_components": self.openapi_components(),
+        }
+
+    def write_bundle(self, path: Union[str, PathLike]) -> None:
+        with open(path, "wb") as file:
+            file.write(_canonical(self.to_bundle()))
+
+    @classmethod
+    def from_bundle(cls, bundle: Dict[str, Any]) -> "SchemaRegistry":
+        if bundle.get("format") != BUNDLE_FORMAT:
+            raise ValueError(f"Unsupported schema bundle format: {bundle.get('format')}")
+        registry = cls(models={})
+        for name, entry in bundle["models"].items():
+            registry._schemas[name] = {mode: entry[mode] for mode in MODES}
+            registry._hashes[name] = entry["hash"]
+        registry._openapi = bundle["openapi_components"]
+        return registry
+
+    @classmethod
+    def load_bundle(cls, path: Union[str, PathLike]) -> "SchemaRegistry":
+        with open(path, "rb") as file:
+            return cls.from_bundle(json.load(file))
+
+
+schema_registry = SchemaRegistry()
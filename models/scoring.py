@@ -0,0 +1,126 @@
+"""
+Test scoring. Every question is encoded as bitmasks over its `possible_answers` keys
+(bit i = i-th key), so grading is integer arithmetic instead of list scans.
+
+A question scores 1.0 when the chosen answers equal the correct ones, 0.0 otherwise.
+With `partial_credit` a MULTIPLE_CHOICE question scores
+(correct choices - wrong choices) / number of correct answers, but not less than 0.0.
+Unanswered questions score 0.0. The test result is the mean question score (0.0 - 1.0).
+
+`score_tests` grades batches with NumPy when it is installed, otherwise in pure Python.
+"""
+from array import array
+from typing import Iterable, List, Sequence, Tuple, Union
+
+from .tests import QuestionSchema, QuestionType, TestSchema
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# (is_multiple_choice, correct mask, answered mask, number of chosen keys outside possible_answers)
+EncodedQuestion = Tuple[bool, int, int, int]
+
+_MAX_NUMPY_OPTIONS = 63
+
+
+def encode_question(question: QuestionSchema, answer_choice: Sequence[str] = ()) -> EncodedQuestion:
+    bits = {key: 1 << index for index, key in enumerate(question.possible_answers)}
+    correct = 0
+    for key in question.correct_answers:
+        correct |= bits.get(key, 0)
+    answered = 0
+    unknown = 0
+    for key in answer_choice:
+        bit = bits.get(key)
+        if bit is None:
+            unknown += 1
+        else:
+            answered |= bit
+    return question.question_type is QuestionType.MULTIPLE_CHOICE, correct, answered, unknown
+
+
+def encode_test(test: TestSchema) -> List[EncodedQuestion]:
+    if isinstance(test, TestSchema):
+        answers = test.index.answers
+    else:
+        answers = {answer.question_id: answer for answer in test.answers}
+    encoded = []
+    for question in test.questions:
+        answer = answers.get(question.id)
+        encoded.append(encode_question(question, answer.answer_choice if answer is not None else ()))
+    return encoded
+
+
+def question_score(question: EncodedQuestion, partial_credit: bool) -> float:
+    """
+    Score (0.0 - 1.0) of one question encoded by `encode_question`.
+    """
+    is_multiple, correct, answered, unknown = question
+    if partial_credit and is_multiple and correct:
+        hits = (answered & correct).bit_count()
+        misses = (answered & ~correct).bit_count() + unknown
+        return max(0.0, (hits - misses) / correct.bit_count())
+    return 1.0 if answered == correct and not unknown else 0.0
+
+
+def _score_encoded(questions: List[EncodedQuestion], partial_credit: bool) -> float:
+    if not questions:
+        return 0.0
+    return sum(question_score(question, partial_credit) for question in questions) / len(questions)
+
+
+def score_test(test: TestSchema, partial_credit: bool = False) -> float:
+    """
+    Result of a single test, 0.0 - 1.0.
+    """
+    return _score_encoded(encode_test(test), partial_credit)
+
+
+def with_result(test: TestSchema, partial_credit: bool = False) -> TestSchema:
+    """
+    Copy of the test with `result` set by `score_test`.
+    """
+    return test.model_copy(update={"result": score_test(test, partial_credit)})
+
+
+def _score_numpy(encoded: List[List[EncodedQuestion]], partial_credit: bool):
+    counts = np.fromiter((len(questions) for questions in encoded), dtype=np.int64, count=len(encoded))
+    flat = [question for questions in encoded for question in questions]
+    total = len(flat)
+    test_index = np.repeat(np.arange(len(encoded)), counts)
+    is_multiple = np.fromiter((question[0] for question in flat), dtype=bool, count=total)
+    correct = np.fromiter((question[1] for question in flat), dtype=np.uint64, count=total)
+    answered = np.fromiter((question[2] for question in flat), dtype=np.uint64, count=total)
+    unknown = np.fromiter((question[3] for question in flat), dtype=np.int64, count=total)
+
+    scores = ((answered == correct) & (unknown == 0)).astype(np.float64)
+    if partial_credit and is_multiple.any():
+        width = max(int(correct.max()).bit_length(), int(answered.max()).bit_length(), 1)
+        shifts = np.arange(width, dtype=np.uint64)
+        correct_bits = ((correct[:, None] >> shifts) & np.uint64(1)).astype(bool)
+        answered_bits = ((answered[:, None] >> shifts) & np.uint64(1)).astype(bool)
+        hits = (answered_bits & correct_bits).sum(axis=1)
+        misses = (answered_bits & ~correct_bits).sum(axis=1) + unknown
+        number_correct = correct_bits.sum(axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            partial = np.clip((hits - misses) / number_correct, 0.0, None)
+        use_partial = is_multiple & (number_correct > 0)
+        scores = np.where(use_partial, partial, scores)
+
+    totals = np.bincount(test_index, weights=scores, minlength=len(encoded))
+    return totals / np.maximum(counts, 1)
+
+
+def score_tests(tests: Iterable[TestSchema], partial_credit: bool = False) -> Union[array, "np.ndarray"]:
+    """
+    Results of a batch of tests in input order - a float64 NumPy array when NumPy is installed,
+    `array('d')` otherwise.
+    """
+    encoded = [encode_test(test) for test in tests]
+    if np is not None and all(
+            (question[1] | question[2]).bit_length() <= _MAX_NUMPY_OPTIONS
+            for questions in encoded for question in questions):
+        return _score_numpy(encoded, partial_credit)
+    return array("d", (_score_encoded(questions, partial_credit) for questions in encoded))
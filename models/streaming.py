@@ -0,0 +1,228 @@
+from concurrent.futures import Executor
+from contextlib import contextmanager
+from os import PathLike
+from typing import IO, Any, AsyncIterable, AsyncIterator, Callable, Iterable, Iterator, List, Optional, Type, TypeVar, Union
+import asyncio
+import re
+
+from pydantic import BaseModel
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+Source = Union[str, PathLike, IO[bytes]]
+Target = Union[str, PathLike, IO[bytes], Any]
+
+CHUNK_SIZE = 64 * 1024
+
+_STRUCTURAL = re.compile(rb'[\[\]{}",\\]')
+_QUOTE, _BACKSLASH, _COMMA = ord('"'), ord("\\"), ord(",")
+_OPENING, _CLOSING = frozenset(b"[{"), frozenset(b"]}")
+
+
+class JsonArraySplitter:
+    """
+    Incremental splitter of a top-level JSON array into raw item documents.
+    Feed it chunks of bytes, it returns the items completed so far and keeps
+    only the unfinished item in memory.
+    """
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._item_start: Optional[int] = None
+        self._after_comma = False
+        self.done = False
+
+    def feed(self, chunk: bytes) -> List[bytes]:
+        buffer = self._buffer
+        if self.done:
+            if chunk.strip():
+                raise ValueError("Unexpected data after the end of the JSON array.")
+            return []
+        buffer += chunk
+        items: List[bytes] = []
+        pos = self._pos
+        while True:
+            match = _STRUCTURAL.search(buffer, pos)
+            if match is None:
+                pos = len(buffer)
+                break
+            index = match.start()
+            char = buffer[index]
+            pos = index + 1
+            if self._in_string:
+                if char == _BACKSLASH:
+                    if index + 1 == len(buffer):
+                        pos = index
+                        break
+                    pos = index + 2
+                elif char == _QUOTE:
+                    self._in_string = False
+            elif self._depth == 0:
+                if char != ord("[") or buffer[:index].strip():
+                    raise ValueError("Expected a top-level JSON array.")
+                self._item_start = index + 1
+                self._depth = 1
+            elif char == _QUOTE:
+                self._in_string = True
+            elif char in _OPENING:
+                self._depth += 1
+            elif char in _CLOSING:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._take_item(buffer, index, items, last=True)
+                    if buffer[index + 1:].strip():
+                        raise ValueError("Unexpected data after the end of the JSON array.")
+                    self.done = True
+                    self._item_start = None
+                    buffer.clear()
+                    pos = 0
+                    break
+            elif char == _COMMA and self._depth == 1:
+                self._take_item(buffer, index, items, last=False)
+                self._item_start = index + 1
+
+        if self._item_start:
+            del buffer[:self._item_start]
+            pos -= self._item_start
+            self._item_start = 0
+        self._pos = pos
+        return items
+
+    def _take_item(self, buffer: bytearray, end: int, items: List[bytes], last: bool) -> None:
+        item = bytes(buffer[self._item_start:end]).strip()
+        if item:
+            items.append(item)
+        elif not last or self._after_comma:
+            raise ValueError("Empty item in JSON array.")
+        self._after_comma = not last
+
+    def close(self) -> None:
+        if not self.done:
+            raise ValueError("Unexpected end of JSON array.")
+
+
+@contextmanager
+def _open_source(source: Source) -> Iterator[IO[bytes]]:
+    if isinstance(source, (str, PathLike)):
+        with open(source, "rb") as file:
+            yield file
+    else:
+        yield source
+
+
+def iter_json_array(model: Type[ModelT], source: Source, chunk_size: int = CHUNK_SIZE) -> Iterator[ModelT]:
+    """
+    Yields validated models one at a time from a file holding a top-level JSON array.
+    """
+    splitter = JsonArraySplitter()
+    with _open_source(source) as file:
+        while True:
+            chunk = file.read(chunk_size)
+            if not chunk:
+                break
+            for item in splitter.feed(chunk):
+                yield model.model_validate_json(item)
+    splitter.close()
+
+
+def _validate_items(model: Type[ModelT], items: List[bytes]) -> List[ModelT]:
+    return [model.model_validate_json(item) for item in items]
+
+
+async def aiter_json_array(model: Type[ModelT], stream: AsyncIterable[bytes], offload: bool = False,
+                           executor: Optional[Executor] = None) -> AsyncIterator[ModelT]:
+    """
+    Yields validated models one at a time from an async byte stream holding a top-level JSON array,
+    e.g. aiohttp `request.content.iter_any()` or Starlette/FastAPI `request.stream()`.
+    * control returns to the event loop after every chunk,
+    * offload=True (or an explicit `executor`) validates the items of each chunk in `executor`,
+      the loop's default thread pool when None - a process pool needs a picklable `model`.
+    """
+    splitter = JsonArraySplitter()
+    loop = asyncio.get_running_loop()
+    async for chunk in stream:
+        items = splitter.feed(chunk)
+        if items and (offload or executor is not None):
+            models = await loop.run_in_executor(executor, _validate_items, model, items)
+        else:
+            models = _validate_items(model, items)
+        for validated in models:
+            yield validated
+        await asyncio.sleep(0)
+    splitter.close()
+
+
+def iter_ndjson(model: Type[ModelT], source: Source) -> Iterator[ModelT]:
+    """
+    Yields validated models one at a time from a newline-delimited JSON file, blank lines are skipped.
+    """
+    with _open_source(source) as file:
+        for line in file:
+            if line.strip():
+                yield model.model_validate_json(line)
+
+
+class _BufferedWriter:
+    def __init__(self, target: Any, buffer_size: int):
+        self._write: Callable[[bytes], Any] = target.write if hasattr(target, "write") else target.sendall
+        self._buffer_size = buffer_size
+        self._parts: List[bytes] = []
+        self._size = 0
+
+    def write(self, data: bytes) -> None:
+        self._parts.append(data)
+        self._size += len(data)
+        if self._size >= self._buffer_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._parts:
+            self._write(b"".join(self._parts))
+            self._parts.clear()
+            self._size = 0
+
+
+@contextmanager
+def _open_target(target: Target, buffer_size: int) -> Iterator[_BufferedWriter]:
+    if isinstance(target, (str, PathLike)):
+        with open(target, "wb") as file:
+            writer = _BufferedWriter(file, buffer_size)
+            yield writer
+            writer.flush()
+    else:
+        writer = _BufferedWriter(target, buffer_size)
+        yield writer
+        writer.flush()
+
+
+def write_ndjson(models: Iterable[BaseModel], target: Target, buffer_size: int = CHUNK_SIZE) -> int:
+    """
+    Writes models as newline-delimited JSON to a path, binary file or socket.
+    Returns the number of written models.
+    """
+    count = 0
+    with _open_target(target, buffer_size) as writer:
+        for model in models:
+            writer.write(model.model_dump_json().encode())
+            writer.write(b"\n")
+            count += 1
+    return count
+
+
+def write_json_array(models: Iterable[BaseModel], target: Target, buffer_size: int = CHUNK_SIZE) -> int:
+    """
+    Writes models as a top-level JSON array to a path, binary file or socket.
+    Returns the number of written models.
+    """
+    count = 0
+    with _open_target(target, buffer_size) as writer:
+        writer.write(b"[")
+        for model in models:
+            if count:
+                writer.write(b",")
+            writer.write(model.model_dump_json().encode())
+            count += 1
+        writer.write(b"]")
+    return count
@@ -1,8 +1,13 @@
-from pydantic import BaseModel, Field, conint, field_validator, model_validator
+from pydantic import ConfigDict, Field, PrivateAttr, TypeAdapter, ValidationInfo, conint, field_validator, model_validator
 from enum import Enum
-from typing import List, Optional, Dict
+from hashlib import sha256
+import json
+from typing import Annotated, Any, ClassVar, List, Literal, Optional, Dict, Union
 from uuid import UUID
 
+from .base import BaseSchema
+from .lazy import LazyList, LazyModelList
+
 
 class Level(str, Enum):
     JUNIOR = "JUNIOR"
@@ -17,7 +22,14 @@ class QuestionType(str, Enum):
     MULTIPLE_CHOICE = "MULTIPLE CHOICE"
 
 
-class TestCreateSchema(BaseModel):
+def normalize_skill(skill: str) -> str:
+    """
+    Case-insensitive form of a skill with surrounding and repeated whitespace removed.
+    """
+    return " ".join(skill.split()).casefold()
+
+
+class TestCreateSchema(BaseSchema):
     user_id: UUID
     position: str = Field(..., max_length=100)
     level: Level
@@ -34,8 +46,40 @@ class TestCreateSchema(BaseModel):
             raise ValueError("Question types must contain unique elements.")
         return value
 
+    def fingerprint(self) -> str:
+        """
+        Hex digest identifying the generation request, equal for logically identical requests:
+        * user_id is ignored,
+        * type_of_question and skills_or_tools are order-insensitive,
+        * skills are compared case-insensitively, with surrounding and repeated whitespace
+          ignored, duplicates and None/[] are equivalent.
+        """
+        skills = sorted({normalize_skill(skill) for skill in self.skills_or_tools or ()})
+        question_types = sorted(QuestionType(question_type).value for question_type in self.type_of_question)
+        canonical = ["v1", self.position, Level(self.level).value, self.number_of_question, question_types, skills]
+        return sha256(json.dumps(canonical, separators=(",", ":")).encode()).hexdigest()
+
+
+SINGLE_ANSWER_TYPES = frozenset({QuestionType.TRUE_FALSE, QuestionType.SINGLE_CHOICE})
 
-class QuestionCreateSchema(BaseModel):
+
+def check_correct_answer_keys(question: "QuestionCreateSchema") -> None:
+    """
+    Every key in correct_answers has to be one of the possible_answers keys.
+    """
+    possible_answers = question.possible_answers
+    for key in question.correct_answers:
+        if key not in possible_answers:
+            invalid_keys = [key for key in question.correct_answers if key not in possible_answers]
+            raise ValueError(f"Invalid keys in correct_answers: {invalid_keys}")
+
+
+class QuestionCreateSchema(BaseSchema):
+    """
+    Question of any type, answer rules checked by the Python `validate_answers` validator.
+    This is also the path of QuestionSchema and TestSchema.questions - only `question_create_adapter`
+    validates through the core-level variants below.
+    """
     test_id: UUID
     question_number: int
     question_text: str
@@ -43,30 +87,74 @@ class QuestionCreateSchema(BaseModel):
     possible_answers: Dict[str, str] = Field(..., min_items=2)
     correct_answers: List[str] = Field(..., min_items=1)
 
+    patch_dependencies = {"validate_answers": frozenset({"question_type", "possible_answers", "correct_answers"})}
+
     @model_validator(mode="after")
     def validate_answers(self):
         """
         Checks the validity of the relationship between possible_answers and correct_answers.
         """
-        invalid_keys = [key for key in self.correct_answers if key not in self.possible_answers]
-        if invalid_keys:
-            raise ValueError(f"Invalid keys in correct_answers: {invalid_keys}")
-
-        if self.question_type == QuestionType.TRUE_FALSE and len(self.possible_answers) != 2:
+        check_correct_answer_keys(self)
+        question_type = self.question_type
+        if question_type is QuestionType.TRUE_FALSE and len(self.possible_answers) != 2:
             raise ValueError("For TRUE_FALSE question, possible answers have only two options: TRUE or FALSE")
 
-        if self.question_type in {QuestionType.TRUE_FALSE, QuestionType.SINGLE_CHOICE}:
-            if len(self.correct_answers) != 1:
-                raise ValueError(f"For question_type '{self.question_type}' requires exactly one correct answer.")
+        if question_type in SINGLE_ANSWER_TYPES and len(self.correct_answers) != 1:
+            raise ValueError(f"For question_type '{question_type}' requires exactly one correct answer.")
 
         return self
 
 
+class _QuestionVariant(QuestionCreateSchema):
+    """
+    Base of the variants selected by `question_type`. Option and answer counts are field constraints
+    enforced by pydantic-core, only the correct_answers keys are checked in Python.
+    """
+
+    @model_validator(mode="after")
+    def validate_answers(self):
+        check_correct_answer_keys(self)
+        return self
+
+
+class TrueFalseQuestion(_QuestionVariant):
+    """
+    TRUE_FALSE question - exactly two options and one correct answer.
+    """
+    question_type: Literal[QuestionType.TRUE_FALSE]
+    possible_answers: Dict[str, str] = Field(..., min_length=2, max_length=2)
+    correct_answers: List[str] = Field(..., min_length=1, max_length=1)
+
+
+class SingleChoiceQuestion(_QuestionVariant):
+    """
+    SINGLE_CHOICE question - exactly one correct answer.
+    """
+    question_type: Literal[QuestionType.SINGLE_CHOICE]
+    correct_answers: List[str] = Field(..., min_length=1, max_length=1)
+
+
+class MultipleChoiceQuestion(_QuestionVariant):
+    """
+    MULTIPLE_CHOICE question - any non-empty subset of possible answers is correct.
+    """
+    question_type: Literal[QuestionType.MULTIPLE_CHOICE]
+
+
+# The variants are distinct classes with their own error locations, so they are not substituted into
+# QuestionSchema or TestSchema.questions.
+QuestionCreateVariant = Annotated[
+    Union[TrueFalseQuestion, SingleChoiceQuestion, MultipleChoiceQuestion],
+    Field(discriminator="question_type"),
+]
+question_create_adapter = TypeAdapter(QuestionCreateVariant, config=ConfigDict(defer_build=True))
+
+
 class QuestionSchema(QuestionCreateSchema):
     id: UUID
 
 
-class AnswerCreateSchema(BaseModel):
+class AnswerCreateSchema(BaseSchema):
     question_id: UUID
     answer_choice: List[str] = []
 
@@ -81,3 +169,105 @@ class TestSchema(TestCreateSchema):
     questions: List[QuestionSchema] = Field(..., min_items=1)
     answers: List[AnswerSchema] = []
     result: Optional[float] = None
+
+    check_integrity: ClassVar[bool] = False
+    patch_dependencies = {"validate_integrity": frozenset({"questions", "answers"})}
+
+    _index: Optional["TestIndex"] = PrivateAttr(default=None)
+
+    @model_validator(mode="after")
+    def validate_integrity(self, info: ValidationInfo):
+        """
+        Optional check, enabled by `check_integrity` or the `check_integrity` validation context key:
+        * question ids and question_number values are unique,
+        * every answer refers to a question of this test,
+        * there is at most one answer per question.
+        """
+        enabled = self.check_integrity
+        if info.context and "check_integrity" in info.context:
+            enabled = info.context["check_integrity"]
+        if not enabled:
+            return self
+
+        index = self.index
+        if len(index.by_number) != len(self.questions):
+            raise ValueError("Question numbers must be unique.")
+        if len(index.by_id) != len(self.questions):
+            raise ValueError("Question ids must be unique.")
+        orphans = [str(question_id) for question_id in index.answers if question_id not in index.by_id]
+        if orphans:
+            raise ValueError(f"Answers refer to questions outside the test: {orphans}")
+        if len(index.answers) != len(self.answers):
+            raise ValueError("Each question can have only one answer.")
+        return self
+
+    @property
+    def index(self) -> "TestIndex":
+        """
+        Lookup tables of questions and answers, built once and rebuilt when the `questions` or `answers`
+        list is replaced or resized. Items replaced in place (`test.questions[0] = other`) are not
+        detected - assign a new list instead.
+        """
+        index = self._index
+        if index is None or not index.is_current(self):
+            index = self._index = TestIndex(self)
+        return index
+
+    def get_question(self, question_id: UUID) -> Optional[QuestionSchema]:
+        return self.index.by_id.get(question_id)
+
+    def get_question_by_number(self, question_number: int) -> Optional[QuestionSchema]:
+        return self.index.by_number.get(question_number)
+
+    def answer_for(self, question: Union[QuestionSchema, UUID]) -> Optional[AnswerSchema]:
+        question_id = question.id if isinstance(question, QuestionSchema) else question
+        return self.index.answers.get(question_id)
+
+    def __eq__(self, other: Any) -> bool:
+        """
+        Model equality without the lazily built `index` - it is derived from the compared fields.
+        """
+        if isinstance(other, TestSchema) and (self._index is not None or other._index is not None):
+            return super(TestSchema, self._without_index()).__eq__(other._without_index())
+        return super().__eq__(other)
+
+    def _without_index(self) -> "TestSchema":
+        if self._index is None:
+            return self
+        copy = self.model_copy()
+        copy._index = None
+        return copy
+
+
+class TestIndex:
+    """
+    Question id -> question, question_number -> question and question id -> answer tables of a test.
+    For duplicated keys the last item wins.
+    """
+    __slots__ = ("by_id", "by_number", "answers", "_questions", "_answers", "_sizes")
+
+    def __init__(self, test: TestSchema):
+        questions = test.questions
+        answers = test.answers
+        self.by_id: Dict[UUID, QuestionSchema] = {question.id: question for question in questions}
+        self.by_number: Dict[int, QuestionSchema] = {question.question_number: question for question in questions}
+        self.answers: Dict[UUID, AnswerSchema] = {answer.question_id: answer for answer in answers}
+        self._questions = questions
+        self._answers = answers
+        self._sizes = (len(questions), len(answers))
+
+    def is_current(self, test: TestSchema) -> bool:
+        return (test.questions is self._questions and test.answers is self._answers
+                and (len(test.questions), len(test.answers)) == self._sizes)
+
+
+class TestSummarySchema(TestCreateSchema):
+    """
+    TestSchema with lazily validated questions and answers - header fields are validated,
+    nested payloads only when `questions` / `answers` items are accessed.
+    """
+    id: UUID
+    is_solved: bool = False
+    questions: Annotated[LazyModelList[QuestionSchema], LazyList(QuestionSchema, min_length=1)]
+    answers: LazyList[AnswerSchema] = Field(default_factory=list, validate_default=True)
+    result: Optional[float] = None
@@ -0,0 +1,62 @@
+"""
+Timestamp fields. Validation stays on Pydantic's native datetime parser - it accepts datetimes,
+epoch seconds/milliseconds and ISO 8601 strings without calling into Python, which measured faster
+than a cached Python parser even for inputs repeating the same strings (see benchmarks/timestamps.py).
+"""
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Any
+
+from pydantic import GetCoreSchemaHandler, GetJsonSchemaHandler
+from pydantic.json_schema import JsonSchemaValue
+from pydantic_core import core_schema
+
+
+class TimestampFormat(str, Enum):
+    ISO = "ISO"
+    EPOCH_MILLIS = "EPOCH_MILLIS"
+
+
+def utc_now() -> datetime:
+    """
+    Default factory of creation timestamps - evaluated per instance, timezone aware.
+    """
+    return datetime.now(timezone.utc)
+
+
+def to_epoch_millis(value: datetime) -> int:
+    """
+    Milliseconds since the Unix epoch, naive datetimes are read as UTC.
+    """
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return round(value.timestamp() * 1000)
+
+
+class Timestamp:
+    """
+    Annotation of datetime fields, e.g. `Annotated[datetime, Timestamp(TimestampFormat.EPOCH_MILLIS)]`.
+    `format` selects the JSON output:
+    * ISO - ISO 8601 string, serialized natively,
+    * EPOCH_MILLIS - integer milliseconds since the epoch, the compact form for large responses.
+    Python dumps keep the datetime, both formats are accepted on input.
+    """
+
+    def __init__(self, format: TimestampFormat = TimestampFormat.ISO):
+        self.format = TimestampFormat(format)
+
+    def __repr__(self) -> str:
+        return f"Timestamp({self.format.value})"
+
+    def __get_pydantic_core_schema__(self, source: Any, handler: GetCoreSchemaHandler) -> core_schema.CoreSchema:
+        schema = handler(source)
+        if self.format is TimestampFormat.EPOCH_MILLIS:
+            schema = {**schema, "serialization": core_schema.plain_serializer_function_ser_schema(
+                to_epoch_millis, when_used="json", return_schema=core_schema.int_schema())}
+        return schema
+
+    def __get_pydantic_json_schema__(self, schema: core_schema.CoreSchema,
+                                     handler: GetJsonSchemaHandler) -> JsonSchemaValue:
+        if handler.mode == "serialization" and self.format is TimestampFormat.EPOCH_MILLIS:
+            return {"type": "integer", "description": "Milliseconds since the Unix epoch"}
+        return handler(schema)
@@ -1,12 +1,25 @@
-from pydantic import BaseModel, EmailStr, Field, field_validator, ValidationInfo
-from typing import Optional, List
+from pydantic import Field, field_validator, ValidationInfo, GetCoreSchemaHandler, GetJsonSchemaHandler
+from pydantic.json_schema import JsonSchemaValue
+from pydantic.networks import import_email_validator, validate_email
+from pydantic_core import PydanticCustomError, core_schema
+from typing import Annotated, Any, ClassVar, Dict, FrozenSet, Iterable, Optional, List, NamedTuple, Tuple, Union
 from uuid import UUID
 from enum import Enum
-from datetime import datetime, timezone
-import re
+from collections import OrderedDict
+from collections.abc import Set
+from datetime import datetime
+from threading import Lock
+
+from .base import BaseSchema, ModelView
+from .passwords import PasswordPolicy
+from .timestamps import Timestamp, utc_now
 
 
 class Role(str, Enum):
+    """
+    Bit of a role is given by its declaration order - new roles have to be appended at the end,
+    integer role sets stored in tokens or databases depend on it.
+    """
     REGULAR = 'REGULAR'
     MANAGER = 'MANAGER'
     ADMIN = 'ADMIN'
@@ -14,40 +27,279 @@ class Role(str, Enum):
     AUTH_SERVICE = 'AUTH_SERVICE'
     TESTS_SERVICE = 'TESTS_SERVICE'
 
+    @property
+    def bit(self) -> int:
+        return self._bit
+
+
+_ROLES: Tuple[Role, ...] = tuple(Role)
+# Keyed by role values - Enum.__hash__ is a Python function, plain str lookups avoid it.
+_ROLE_BITS: Dict[str, int] = {role.value: 1 << index for index, role in enumerate(_ROLES)}
+for _role in _ROLES:
+    _role._bit = _ROLE_BITS[_role.value]
+del _role
+_ALL_ROLES_MASK = (1 << len(_ROLES)) - 1
+
+
+def _role_bit(role: Union[Role, str]) -> int:
+    return role._bit if type(role) is Role else _ROLE_BITS[role]
+
+
+class RoleSet(Set):
+    """
+    Immutable set of roles stored as an integer bit mask:
+    * membership, subset and intersection checks are single integer operations,
+    * `int(roles)` / `RoleSet.from_int(mask)` - compact form for tokens and storage,
+    * one shared instance per mask,
+    * validated from and serialized to the list of role names, as `List[Role]` is,
+    * compares equal to lists and sets holding the same roles, hashes like `frozenset(roles)`.
+    """
+    __slots__ = ("_mask", "_values", "_hash")
+    _instances: ClassVar[Dict[int, "RoleSet"]] = {}
+
+    def __new__(cls, roles: Iterable[Union[Role, str]] = ()) -> "RoleSet":
+        if isinstance(roles, RoleSet):
+            return roles
+        mask = 0
+        for role in roles:
+            try:
+                mask |= _role_bit(role)
+            except (KeyError, TypeError):
+                raise ValueError(f"Unknown role: {role!r}") from None
+        return cls.from_int(mask)
+
+    @classmethod
+    def from_int(cls, mask: int) -> "RoleSet":
+        instance = cls._instances.get(mask)
+        if instance is None:
+            if not isinstance(mask, int) or not 0 <= mask <= _ALL_ROLES_MASK:
+                raise ValueError(f"Invalid role mask: {mask!r}")
+            instance = object.__new__(cls)
+            object.__setattr__(instance, "_mask", mask)
+            object.__setattr__(instance, "_values", tuple(role.value for role in _ROLES if mask & role._bit))
+            # Equal sets have equal hashes - roles hash as their names.
+            object.__setattr__(instance, "_hash", hash(frozenset(instance._values)))
+            cls._instances[mask] = instance
+        return instance
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("RoleSet is immutable")
+
+    def __reduce__(self):
+        return RoleSet.from_int, (self._mask,)
+
+    def __int__(self) -> int:
+        return self._mask
+
+    def __contains__(self, role: Any) -> bool:
+        try:
+            return bool(self._mask & _role_bit(role))
+        except (KeyError, TypeError):
+            return False
+
+    def __iter__(self):
+        mask = self._mask
+        return (role for role in _ROLES if mask & role._bit)
+
+    def __len__(self) -> int:
+        return bin(self._mask).count("1")
+
+    def __bool__(self) -> bool:
+        return bool(self._mask)
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, RoleSet):
+            return self._mask == other._mask
+        # Not tuples - their hash cannot match.
+        if isinstance(other, (list, Set)):
+            try:
+                return self._mask == RoleSet(other)._mask
+            except ValueError:
+                return False
+        return NotImplemented
+
+    def __le__(self, other: Any) -> bool:
+        if isinstance(other, RoleSet):
+            return not self._mask & ~other._mask
+        return super().__le__(other)
+
+    def __ge__(self, other: Any) -> bool:
+        if isinstance(other, RoleSet):
+            return not other._mask & ~self._mask
+        return super().__ge__(other)
+
+    def __and__(self, other: Any) -> "RoleSet":
+        if isinstance(other, RoleSet):
+            return RoleSet.from_int(self._mask & other._mask)
+        return super().__and__(other)
+
+    def __or__(self, other: Any) -> "RoleSet":
+        if isinstance(other, RoleSet):
+            return RoleSet.from_int(self._mask | other._mask)
+        return super().__or__(other)
+
+    def __sub__(self, other: Any) -> "RoleSet":
+        if isinstance(other, RoleSet):
+            return RoleSet.from_int(self._mask & ~other._mask)
+        return super().__sub__(other)
+
+    def issubset(self, roles: Iterable[Union[Role, str]]) -> bool:
+        return not self._mask & ~RoleSet(roles)._mask
+
+    def issuperset(self, roles: Iterable[Union[Role, str]]) -> bool:
+        mask = RoleSet(roles)._mask
+        return self._mask & mask == mask
+
+    def isdisjoint(self, roles: Iterable[Union[Role, str]]) -> bool:
+        mask = roles._mask if type(roles) is RoleSet else RoleSet(roles)._mask
+        return not self._mask & mask
+
+    def __repr__(self) -> str:
+        return f"RoleSet({[role.value for role in self]!r})"
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source: Any, handler: GetCoreSchemaHandler) -> core_schema.CoreSchema:
+        list_schema = handler.generate_schema(List[Role])
+
+        def validate(value: Any, validate_list: core_schema.ValidatorFunctionWrapHandler) -> "RoleSet":
+            if isinstance(value, RoleSet):
+                return value
+            return cls(validate_list(value))
+
+        def serialize(value: Any, info: core_schema.SerializationInfo) -> Any:
+            roles = RoleSet(value)
+            # Role names are precomputed per mask, JSON output needs no enum serialization.
+            return roles._values if info.mode == "json" else list(roles)
+
+        return core_schema.no_info_wrap_validator_function(
+            validate, list_schema,
+            serialization=core_schema.plain_serializer_function_ser_schema(serialize, info_arg=True),
+        )
+
+
+class EmailCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
 
-class UserCreateSchema(BaseModel):
+class EmailValidationCache:
+    """
+    Thread-safe bounded LRU cache of email validation outcomes keyed on the raw input string.
+    Stores the normalized email or the validation error. Disabled while `maxsize` is 0.
+    """
+
+    def __init__(self, maxsize: int = 0):
+        self._lock = Lock()
+        self._entries: "OrderedDict[str, Union[str, PydanticCustomError]]" = OrderedDict()
+        self.maxsize = 0
+        self.hits = 0
+        self.misses = 0
+        self.configure(maxsize)
+
+    def configure(self, maxsize: int) -> None:
+        if maxsize < 0:
+            raise ValueError("Email cache size cannot be negative.")
+        with self._lock:
+            self.maxsize = maxsize
+            while len(self._entries) > maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> EmailCacheInfo:
+        with self._lock:
+            return EmailCacheInfo(self.hits, self.misses, self.maxsize, len(self._entries))
+
+    def validate(self, value: str) -> str:
+        """
+        Returns the normalized email, raising the (cached) validation error for invalid input.
+        """
+        if not self.maxsize:
+            return validate_email(value)[1]
+
+        with self._lock:
+            entry = self._entries.get(value)
+            if entry is not None:
+                self._entries.move_to_end(value)
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        if entry is None:
+            try:
+                entry = validate_email(value)[1]
+            except PydanticCustomError as error:
+                entry = error
+            with self._lock:
+                if self.maxsize:
+                    self._entries[value] = entry
+                    if len(self._entries) > self.maxsize:
+                        self._entries.popitem(last=False)
+
+        if isinstance(entry, PydanticCustomError):
+            raise PydanticCustomError(entry.type, entry.message_template, entry.context)
+        return entry
+
+
+email_cache = EmailValidationCache()
+
+
+def configure_email_cache(maxsize: int) -> None:
+    """
+    Process-wide size of the email validation cache, 0 disables caching.
+    """
+    email_cache.configure(maxsize)
+
+
+class CachedEmailStr:
+    """
+    Drop-in replacement for `EmailStr` validating through the process-wide `email_cache`.
+    """
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, _source: Any, _handler: GetCoreSchemaHandler) -> core_schema.CoreSchema:
+        import_email_validator()
+        return core_schema.no_info_after_validator_function(email_cache.validate, core_schema.str_schema())
+
+    @classmethod
+    def __get_pydantic_json_schema__(cls, schema: core_schema.CoreSchema,
+                                     handler: GetJsonSchemaHandler) -> JsonSchemaValue:
+        field_schema = handler(schema)
+        field_schema.update(type='string', format='email')
+        return field_schema
+
+
+class UserCreateSchema(BaseSchema):
     first_name: str = Field(max_length=50)
     surname: str = Field(max_length=50)
-    email: EmailStr
+    email: CachedEmailStr
     password: str
     confirm_password: str
 
+    password_policy: ClassVar[PasswordPolicy] = PasswordPolicy()
+    patch_dependencies = {"validate_confirm_password": frozenset({"password", "confirm_password"})}
+
     @field_validator("password")
     @classmethod
     def validate_password(cls, value: str) -> str:
         """
-        Password validation:
+        Password validation with `password_policy`, by default:
         * at least 10 characters,
         * at least one lowercase letter,
         * at least one uppercase letter,
         * at least one digit,
         * at least one special character.
         """
-        message = ""
-        if len(value) < 10:
-            message += "Password must be at least 10 characters long.\n"
-        if not re.search(r"[a-z]", value):
-            message += "Password must contain at least one lowercase letter.\n"
-        if not re.search(r"[A-Z]", value):
-            message += "Password must contain at least one uppercase letter.\n"
-        if not re.search(r"\d", value):
-            message += "Password must contain at least one digit.\n"
-        if not re.search(r"[!@#$%^&*(),.?\":{}|<>]", value):
-            message += "Password must contain at least one special character.\n"
-
-        if message != "":
-            raise ValueError(message)
-        return value
+        return cls.password_policy.validate(value)
 
     @field_validator("confirm_password")
     @classmethod
@@ -60,17 +312,47 @@ class UserCreateSchema(BaseModel):
         return confirm_password
 
 
-class UserSchema(BaseModel):
+class UserSchema(BaseSchema):
     id: UUID
     first_name: str = Field(..., max_length=50)
     surname: str = Field(..., max_length=50)
-    username_email: EmailStr
-    roles: List[Role] = Field(..., default_factory=lambda: [Role.REGULAR])
+    username_email: CachedEmailStr
+    roles: RoleSet = Field(..., default_factory=lambda: RoleSet([Role.REGULAR]))
     tests: Optional[List] = Field(default_factory=list)
-    create_datetime: datetime = Field(default=datetime.now(timezone.utc).isoformat())
+    create_datetime: Annotated[datetime, Timestamp()] = Field(default_factory=utc_now)
+
+    # Fields left out of responses for other users, see `public_view`.
+    internal_fields: ClassVar[FrozenSet[str]] = frozenset({"roles"})
+
+    @classmethod
+    def public_view(cls) -> ModelView:
+        """
+        Cached serializer of the user without internal fields.
+        """
+        return cls.view(exclude=cls.internal_fields)
+
+    def has_role(self, role: Union[Role, str]) -> bool:
+        """
+        True if the user has `role`.
+        """
+        user_roles = self.roles
+        if type(user_roles) is RoleSet and type(role) is Role:
+            return bool(user_roles._mask & role._bit)
+        return role in user_roles
+
+    def has_any(self, *roles: Union[Role, str, RoleSet]) -> bool:
+        """
+        True if the user has at least one of `roles`. Checks repeated per request are cheapest
+        with a RoleSet built once, e.g. `user.has_any(SERVICE_ROLES)`.
+        """
+        required = roles[0] if len(roles) == 1 and type(roles[0]) is RoleSet else RoleSet(roles)
+        user_roles = self.roles
+        if type(user_roles) is not RoleSet:
+            user_roles = RoleSet(user_roles)
+        return bool(user_roles._mask & required._mask)
 
 
-class UserLoginSchema(BaseModel):
+class UserLoginSchema(BaseSchema):
     username: str
     password: str
 
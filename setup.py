@@ -9,8 +9,9 @@ def read_requirements():
 setup(
     name="interview_prep_models_library",
     version="0.1.0",
-    packages=find_packages(),
+    packages=find_packages(exclude=["benchmarks", "benchmarks.*"]),
     install_requires=read_requirements(),
+    extras_require={"numpy": ["numpy"], "arrow": ["pyarrow"]},
     description="Shared Pydantic models for Interview Prep App",
     url="https://github.com/nataliagwardjan/interview_prep_models_library",
 )
@@ -0,0 +1,82 @@
+import unittest
+from pydantic import model_validator
+from models import QuestionSchema, TestSchema, QuestionType, Level
+
+
+def question_data(**overrides):
+    data = {
+        'id': '3f97fc69-9253-40c2-94c7-f8307ff70301',
+        'test_id': '3f97fc69-9253-40c2-94c7-f8307ff70302',
+        'question_number': 1,
+        'question_text': 'Example question text',
+        'question_type': QuestionType.TRUE_FALSE,
+        'possible_answers': {'A': 'TRUE', 'B': 'FALSE'},
+        'correct_answers': ['B']
+    }
+    data.update(overrides)
+    return data
+
+
+def make_test_data(**overrides):
+    data = {
+        'id': '3f97fc69-9253-40c2-94c7-f8307ff70302',
+        'user_id': '3f97fc69-9253-40c2-94c7-f8307ff70309',
+        'position': 'Software Developer',
+        'type_of_question': [QuestionType.TRUE_FALSE],
+        'level': Level.JUNIOR,
+        'questions': [question_data()]
+    }
+    data.update(overrides)
+    return data
+
+
+class BulkValidationTestWithUnitTest(unittest.TestCase):
+
+    def test_question_validate_many_all_valid(self):
+        """Test for batch of valid QuestionSchema rows"""
+        result = QuestionSchema.validate_many([question_data(question_number=i) for i in range(1, 4)])
+        self.assertEqual(result.errors, {})
+        self.assertEqual(sorted(result.valid), [0, 1, 2])
+        self.assertEqual(result.valid[2].question_number, 3)
+
+    def test_question_validate_many_collects_errors_per_index(self):
+        """Test for batch with invalid rows - errors are reported per index without stopping"""
+        rows = [
+            question_data(),
+            question_data(correct_answers=['C']),
+            question_data(question_number=2),
+            question_data(id='not-a-uuid')
+        ]
+        result = QuestionSchema.validate_many(rows)
+        self.assertEqual(sorted(result.valid), [0, 2])
+        self.assertEqual(sorted(result.errors), [1, 3])
+        self.assertIn('Invalid keys in correct_answers', result.errors[1][0]['msg'])
+        self.assertEqual(result.errors[3][0]['loc'], ('id',))
+
+    def test_validate_many_single_pass(self):
+        """Test for valid rows validated once when other rows of the batch fail"""
+        calls = []
+
+        class CountingQuestionSchema(QuestionSchema):
+            @model_validator(mode="after")
+            def count(self):
+                calls.append(self.question_number)
+                return self
+
+        rows = [question_data(question_number=i) for i in range(1, 6)]
+        rows[2] = question_data(id='not-a-uuid')
+        result = CountingQuestionSchema.validate_many(rows)
+        self.assertEqual(sorted(result.valid), [0, 1, 3, 4])
+        self.assertEqual(sorted(result.errors), [2])
+        self.assertEqual(sorted(calls), [1, 2, 4, 5])
+
+    def test_test_validate_many(self):
+        """Test for batch of TestSchema rows with nested question errors"""
+        rows = [make_test_data(), make_test_data(questions=[question_data(), question_data(correct_answers=[])])]
+        result = TestSchema.validate_many(rows)
+        self.assertIsInstance(result.valid[0], TestSchema)
+        self.assertEqual(result.errors[1][0]['loc'], ('questions', 1, 'correct_answers'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,141 @@
+import os
+import tempfile
+import unittest
+from models import (FileQuestionSetCache,
+                    MemoryQuestionSetCache,
+                    QuestionCreateSchema,
+                    QuestionSchema,
+                    QuestionType,
+                    TrueFalseQuestion,
+                    TestCreateSchema,
+                    Level)
+from models.cache import STALE_TEMPORARY_SECONDS
+from bulk_tests import question_data
+
+
+def create_data(**overrides):
+    data = {
+        'user_id': '3f97fc69-9253-40c2-94c7-f8307ff70309',
+        'position': 'Software Developer',
+        'level': Level.JUNIOR,
+        'type_of_question': [QuestionType.TRUE_FALSE, QuestionType.SINGLE_CHOICE],
+        'skills_or_tools': ['Python', 'Django']
+    }
+    data.update(overrides)
+    return TestCreateSchema(**data)
+
+
+def generated_questions(request):
+    data = question_data()
+    del data['id']
+    return [QuestionCreateSchema(**data)]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FingerprintTestWithUnitTest(unittest.TestCase):
+
+    def test_equivalent_requests(self):
+        """Test for fingerprint ignoring user, order, case and whitespace of skills"""
+        fingerprint = create_data().fingerprint()
+        self.assertEqual(fingerprint, create_data(
+            user_id='3f97fc69-9253-40c2-94c7-f8307ff70300',
+            type_of_question=[QuestionType.SINGLE_CHOICE, QuestionType.TRUE_FALSE],
+            skills_or_tools=['  django', 'PYTHON ', 'Python']).fingerprint())
+        self.assertEqual(create_data(skills_or_tools=None).fingerprint(), create_data(skills_or_tools=[]).fingerprint())
+
+    def test_different_requests(self):
+        """Test for fingerprint distinguishing requests for other questions"""
+        fingerprint = create_data().fingerprint()
+        for overrides in [{'level': Level.SENIOR}, {'number_of_question': 10}, {'position': 'Data Engineer'},
+                          {'type_of_question': [QuestionType.TRUE_FALSE]}, {'skills_or_tools': ['Python']}]:
+            self.assertNotEqual(create_data(**overrides).fingerprint(), fingerprint)
+
+
+class QuestionSetCacheTestWithUnitTest(unittest.TestCase):
+
+    def test_memory_cache_lru_and_ttl(self):
+        """Test for in-memory cache eviction and expiry"""
+        clock = FakeClock()
+        cache = MemoryQuestionSetCache(maxsize=2, ttl=60, clock=clock)
+        first, second, third = (create_data(number_of_question=number) for number in (1, 2, 3))
+        questions = cache.get_or_generate(first, generated_questions)
+        self.assertIs(cache.get_or_generate(create_data(number_of_question=1, skills_or_tools=['django', 'python']),
+                                            lambda request: self.fail('regenerated'))[0], questions[0])
+        cache.set(second, questions)
+        cache.get(first)
+        cache.set(third, questions)
+        self.assertIsNone(cache.get(second))
+        self.assertIsNotNone(cache.get(first.fingerprint()))
+        clock.now += 61
+        self.assertIsNone(cache.get(first))
+        self.assertEqual(len(cache), 1)
+
+    def test_file_cache(self):
+        """Test for file cache round trip, expiry and clearing"""
+        clock = FakeClock()
+        with tempfile.TemporaryDirectory() as directory:
+            cache = FileQuestionSetCache(directory, ttl=60, clock=clock)
+            request = create_data()
+            self.assertIsNone(cache.get(request))
+            questions = cache.get_or_generate(request, generated_questions)
+            self.assertEqual(FileQuestionSetCache(directory).get(request), questions)
+            cache.delete(request)
+            self.assertIsNone(cache.get(request))
+            cache.set(request, questions)
+            clock.now += 10 ** 10
+            self.assertIsNone(cache.get(request))
+            cache.set(request, questions)
+            cache.clear()
+            self.assertIsNone(FileQuestionSetCache(directory).get(request))
+
+    def test_file_cache_keeps_question_types(self):
+        """Test for file cache restoring ids and question subclasses"""
+        with tempfile.TemporaryDirectory() as directory:
+            cache = FileQuestionSetCache(directory)
+            request = create_data()
+            data = question_data()
+            questions = [QuestionSchema(**data), TrueFalseQuestion(**{**data, 'question_number': 2})]
+            cache.set(request, questions)
+            restored = FileQuestionSetCache(directory).get(request)
+            self.assertEqual(restored, questions)
+            self.assertEqual([type(question) for question in restored], [QuestionSchema, TrueFalseQuestion])
+
+    def test_file_cache_rejects_unknown_types(self):
+        """Test for file cache refusing question classes it cannot restore"""
+        class CustomQuestion(QuestionCreateSchema):
+            pass
+
+        with tempfile.TemporaryDirectory() as directory:
+            data = question_data()
+            del data['id']
+            with self.assertRaises(TypeError):
+                FileQuestionSetCache(directory).set(create_data(), [CustomQuestion(**data)])
+            cache = FileQuestionSetCache(directory, models=(CustomQuestion,))
+            cache.set(create_data(), [CustomQuestion(**data)])
+            self.assertIsInstance(cache.get(create_data())[0], CustomQuestion)
+            self.assertEqual(len(os.listdir(directory)), 1)
+
+    def test_file_cache_clear_leaves_other_files(self):
+        """Test for clear removing only cache files and stale temporary files"""
+        clock = FakeClock()
+        with tempfile.TemporaryDirectory() as directory:
+            cache = FileQuestionSetCache(directory, clock=clock)
+            cache.set(create_data(), generated_questions(None))
+            for name in ('settings.json', '.qset-left.tmp', '.qset-writing.tmp'):
+                open(os.path.join(directory, name), 'w').close()
+            os.utime(os.path.join(directory, '.qset-left.tmp'), (0, 0))
+            clock.now = 2 * STALE_TEMPORARY_SECONDS
+            os.utime(os.path.join(directory, '.qset-writing.tmp'), (clock.now, clock.now))
+            cache.clear()
+            self.assertEqual(sorted(os.listdir(directory)), ['.qset-writing.tmp', 'settings.json'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+from datetime import datetime, timezone
+from uuid import uuid4
+from pydantic import ValidationError
+from models import (TestSchema,
+                    QuestionSchema,
+                    AnswerSchema,
+                    UserSchema,
+                    QuestionType,
+                    Level,
+                    Role)
+
+
+def make_test():
+    question = QuestionSchema(
+        id=uuid4(),
+        test_id=uuid4(),
+        question_number=1,
+        question_text='Which are Python web frameworks? Zażółć gęślą jaźń',
+        question_type=QuestionType.MULTIPLE_CHOICE,
+        possible_answers={'A': 'Django', 'B': 'Flask', 'C': 'Spring'},
+        correct_answers=['A', 'B']
+    )
+    return TestSchema(
+        id=uuid4(),
+        user_id=uuid4(),
+        position='Software Developer',
+        type_of_question=[QuestionType.MULTIPLE_CHOICE, QuestionType.TRUE_FALSE],
+        level=Level.SENIOR,
+        number_of_question=1,
+        is_solved=True,
+        questions=[question],
+        answers=[AnswerSchema(id=uuid4(), question_id=question.id, answer_choice=['A'])],
+        result=-0.25
+    )
+
+
+class CodecTestWithUnitTest(unittest.TestCase):
+
+    def test_test_schema_round_trip(self):
+        """Test for TestSchema binary round trip matching the JSON form"""
+        test = make_test()
+        payload = test.to_bytes()
+        self.assertLess(len(payload), len(test.model_dump_json()) / 2)
+        decoded = TestSchema.from_bytes(payload)
+        self.assertEqual(decoded, test)
+        self.assertEqual(decoded.model_dump_json(), test.model_dump_json())
+        self.assertIs(decoded.questions[0].question_type, QuestionType.MULTIPLE_CHOICE)
+
+    def test_int_round_trip_beyond_64_bits(self):
+        """Test for question numbers outside the 64-bit range decoded exactly"""
+        question = make_test().questions[0]
+        for number in (0, -1, 2 ** 63 - 1, 2 ** 63, -2 ** 63, -2 ** 63 - 1, 2 ** 70, -2 ** 70):
+            decoded = QuestionSchema.from_bytes(question.model_copy(update={'question_number': number}).to_bytes())
+            self.assertEqual(decoded.question_number, number)
+
+    def test_user_schema_round_trip(self):
+        """Test for UserSchema binary round trip with untyped tests list"""
+        user = UserSchema(id=uuid4(), first_name='Alice', surname='Smith', username_email='alice@example.com',
+                          roles=[Role.ADMIN, Role.TESTS_SERVICE], tests=[{'id': 1}, 'x', str(uuid4())],
+                          create_datetime=datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc))
+        decoded = UserSchema.from_bytes(user.to_bytes(), validate=True)
+        self.assertEqual(decoded.model_dump_json(), user.model_dump_json())
+
+    def test_from_bytes_invalid_payload(self):
+        """Test for from_bytes with foreign, truncated or invalid payloads"""
+        payload = make_test().to_bytes()
+        for data in [b'{}', payload[:-1], payload + b'\x00']:
+            with self.assertRaises(ValueError):
+                TestSchema.from_bytes(data)
+        test = make_test()
+        test.position = 'x' * 200
+        with self.assertRaises(ValidationError):
+            TestSchema.from_bytes(test.to_bytes(), validate=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import os
+import tempfile
+import unittest
+from uuid import UUID
+from models import (TestSchema,
+                    QuestionType,
+                    Level,
+                    iter_chunks,
+                    read_columnar,
+                    score_test,
+                    write_columnar,
+                    write_parquet)
+from models import columnar
+from bulk_tests import question_data, make_test_data
+
+
+def make_tests(count):
+    tests = []
+    for number in range(count):
+        test_id = f'3f97fc69-9253-40c2-94c7-f8307ff7{number:04d}'
+        question = question_data(id=f'3f97fc69-9253-40c2-94c7-f8307ff8{number:04d}', test_id=test_id)
+        answers = [{'id': f'3f97fc69-9253-40c2-94c7-f8307ff9{number:04d}', 'question_id': question['id'],
+                    'answer_choice': ['B' if number % 2 else 'A']}] if number % 3 else []
+        tests.append(TestSchema(**make_test_data(id=test_id, questions=[question], answers=answers,
+                                            result=0.5 if number % 2 else None,
+                                            skills_or_tools=['Python', 'SQL'] if number % 2 else None)))
+    return tests
+
+
+def without_nested(test):
+    return {name: value for name, value in test.model_dump().items() if name not in ('questions', 'answers')}
+
+
+class ColumnarTestWithUnitTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tests = make_tests(7)
+
+    def test_chunks_and_column_layouts(self):
+        """Test for typed columns of in-memory chunks"""
+        chunks = list(iter_chunks(self.tests, chunk_size=3))
+        self.assertEqual([(chunk.table, len(chunk)) for chunk in chunks],
+                         [('tests', 3), ('questions', 3), ('answers', 3), ('tests', 3), ('questions', 3),
+                          ('tests', 1), ('questions', 1), ('answers', 1)])
+        tests_chunk = chunks[0]
+        self.assertEqual(tests_chunk['level'].kind, 'dictionary')
+        self.assertEqual(tests_chunk['level'][0], Level.JUNIOR)
+        self.assertEqual(bytes(tests_chunk['id'].buffers['data'][:16]), UUID(self.tests[0].id.hex).bytes)
+        self.assertEqual(tests_chunk['result'].to_pylist(), [None, 0.5, None])
+        self.assertEqual(tests_chunk['skills_or_tools'][1], ['Python', 'SQL'])
+        self.assertEqual(chunks[1]['question_type'][0], QuestionType.TRUE_FALSE)
+        self.assertEqual(chunks[1]['score'].to_pylist(), [0.0, 1.0, 0.0])
+        with self.assertRaises(ValueError):
+            next(iter_chunks(self.tests, chunk_size=0))
+
+    def test_file_round_trip(self):
+        """Test for memory-mapped columnar file matching the models"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'tests.col')
+            self.assertEqual(write_columnar(self.tests, path, chunk_size=4),
+                             {'tests': 7, 'questions': 7, 'answers': 4})
+            with read_columnar(path) as stored:
+                self.assertEqual(stored.tables, ['tests', 'questions', 'answers'])
+                self.assertEqual(stored.to_pylist('tests'), [without_nested(test) for test in self.tests])
+                questions = stored.to_pylist('questions')
+                self.assertEqual([row.pop('score') for row in questions], [score_test(test) for test in self.tests])
+                self.assertEqual(questions, [test.questions[0].model_dump() for test in self.tests])
+                answers = stored.to_pylist('answers')
+                self.assertEqual([row['test_id'] for row in answers],
+                                 [test.id for test in self.tests if test.answers])
+                del questions, answers
+
+    def test_rejects_other_files(self):
+        """Test for reader refusing files of another format"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'tests.json')
+            with open(path, 'wb') as file:
+                file.write(b'[]' * 20)
+            with self.assertRaises(ValueError):
+                read_columnar(path)
+
+    @unittest.skipIf(columnar.np is None, 'NumPy is not installed')
+    def test_numpy_views(self):
+        """Test for NumPy views of numeric, dictionary and UUID columns"""
+        chunk = next(iter_chunks(self.tests))
+        self.assertEqual(chunk['number_of_question'].to_numpy().tolist(), [20] * 7)
+        self.assertEqual(chunk['level'].to_numpy().tolist(), [0] * 7)
+        self.assertEqual(chunk['id'].to_numpy().shape, (7, 16))
+        self.assertEqual(chunk['is_solved'].to_numpy().tolist(), [False] * 7)
+
+    @unittest.skipIf(columnar.pa is None, 'pyarrow is not installed')
+    def test_arrow_and_parquet(self):
+        """Test for Arrow tables and Parquet files"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'tests.col')
+            write_columnar(self.tests, path, chunk_size=4)
+            table = read_columnar(path).to_arrow('tests')
+            self.assertEqual(table.num_rows, 7)
+            self.assertEqual(table.column('result').null_count, 4)
+            self.assertEqual(table.column('level').to_pylist(), ['JUNIOR'] * 7)
+            counts = write_parquet(self.tests, directory)
+            self.assertEqual(counts['answers'], 4)
+            parquet = columnar.pq.read_table(os.path.join(directory, 'questions.parquet'))
+            self.assertEqual(parquet.column('possible_answers').to_pylist()[0], [('A', 'TRUE'), ('B', 'FALSE')])
+
+
+if __name__ == '__main__':
+    unittest.main()
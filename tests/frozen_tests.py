@@ -0,0 +1,119 @@
+import copy
+import gc
+import pickle
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from uuid import uuid4
+from pydantic import ValidationError
+from models import (FrozenAnswerSchema, FrozenDict, FrozenQuestionSchema, FrozenUserSchema, QuestionSchema, Role,
+                    trusted_mode, validate_parallel)
+from models.frozen import pool_size
+from bulk_tests import question_data
+
+
+def user_data(**overrides):
+    data = {
+        'id': '3f97fc69-9253-40c2-94c7-f8307ff70305',
+        'first_name': 'Anna',
+        'surname': 'Nowak',
+        'username_email': 'anna.nowak@example.com',
+        'create_datetime': '2024-01-01T00:00:00+00:00'
+    }
+    data.update(overrides)
+    return data
+
+
+class FrozenSchemaTestWithUnitTest(unittest.TestCase):
+
+    def test_intern_returns_shared_instance(self):
+        """Test for equal payloads interned to one hashable instance"""
+        question = FrozenQuestionSchema.intern(question_data())
+        self.assertIs(FrozenQuestionSchema.intern(question_data()), question)
+        self.assertIs(FrozenQuestionSchema.intern(question), question)
+        self.assertEqual(len({question, FrozenQuestionSchema.model_validate(question_data())}), 1)
+        self.assertEqual(question.model_dump_json(), QuestionSchema.model_validate(question_data()).model_dump_json())
+
+    def test_containers_are_shared_and_immutable(self):
+        """Test for possible and correct answers shared between different questions"""
+        first = FrozenQuestionSchema.intern(question_data())
+        second = FrozenQuestionSchema.intern(question_data(id='3f97fc69-9253-40c2-94c7-f8307ff70303'))
+        self.assertIsNot(first, second)
+        self.assertIsInstance(first.possible_answers, FrozenDict)
+        self.assertIs(first.possible_answers, second.possible_answers)
+        self.assertIs(first.correct_answers, second.correct_answers)
+        with self.assertRaises(TypeError):
+            first.possible_answers['C'] = 'MAYBE'
+        with self.assertRaises(ValidationError):
+            first.question_text = 'Changed'
+
+    def test_validation_rules_kept(self):
+        """Test for frozen question keeping the answers validation"""
+        with self.assertRaises(ValidationError):
+            FrozenQuestionSchema.intern(question_data(correct_answers=['C']))
+        with self.assertRaises(ValidationError):
+            FrozenAnswerSchema.intern({'question_id': '3f97fc69-9253-40c2-94c7-f8307ff70301',
+                                       'answer_choice': ['A']})
+
+    def test_user_and_pool_release(self):
+        """Test for frozen user defaults and weak pool entries"""
+        user = FrozenUserSchema.intern(user_data())
+        self.assertEqual(user.roles, [Role.REGULAR])
+        self.assertEqual(user.tests, ())
+        self.assertIs(FrozenUserSchema.intern(user_data(roles=['REGULAR'])), user)
+        size = pool_size()
+        del user
+        gc.collect()
+        self.assertEqual(pool_size(), size - 1)
+
+    def test_user_tests_deep_frozen(self):
+        """Test for nested test values frozen into hashable containers"""
+        tests = [{'id': str(uuid4()), 'skills_or_tools': ['Python', 'Django']}, str(uuid4())]
+        user = FrozenUserSchema.intern(user_data(tests=tests))
+        self.assertIsInstance(user.tests[0], FrozenDict)
+        self.assertEqual(user.tests[0]['skills_or_tools'], ('Python', 'Django'))
+        self.assertEqual(hash(user), hash(FrozenUserSchema(**user_data(tests=tests))))
+        self.assertIs(FrozenUserSchema.from_bytes(user.to_bytes()), user)
+        with self.assertRaises(ValidationError):
+            FrozenUserSchema.intern(user_data(tests=[bytearray(b'test')]))
+
+    def test_intern_in_trusted_mode(self):
+        """Test for intern validating and sharing containers inside trusted_mode"""
+        with trusted_mode():
+            question = FrozenQuestionSchema.intern(question_data())
+            with self.assertRaises(ValidationError):
+                FrozenQuestionSchema.intern(question_data(correct_answers=['C']))
+        self.assertIsInstance(question.possible_answers, FrozenDict)
+        self.assertIs(FrozenQuestionSchema.intern(question_data()), question)
+        hash(question)
+
+    def test_pickle_and_deepcopy(self):
+        """Test for frozen models surviving pickle and deepcopy with hashable containers"""
+        question = FrozenQuestionSchema.intern(question_data())
+        for restored in (pickle.loads(pickle.dumps(question)), copy.deepcopy(question)):
+            self.assertEqual(restored, question)
+            self.assertIsInstance(restored.possible_answers, FrozenDict)
+            self.assertEqual(hash(restored), hash(question))
+        self.assertEqual(pickle.loads(pickle.dumps(FrozenDict({'A': 'TRUE'}))), {'A': 'TRUE'})
+
+    def test_codec_round_trip(self):
+        """Test for from_bytes returning the pooled instance with shared containers"""
+        question = FrozenQuestionSchema.intern(question_data())
+        self.assertIs(FrozenQuestionSchema.from_bytes(question.to_bytes()), question)
+        user = FrozenUserSchema.intern(user_data(tests=[str(uuid4())]))
+        restored = FrozenUserSchema.from_bytes(user.to_bytes())
+        self.assertIs(restored, user)
+        hash(restored)
+
+    def test_validate_parallel_on_process_pool(self):
+        """Test for frozen models returned from worker processes"""
+        rows = [question_data(id=str(uuid4()), question_number=number) for number in range(1, 13)]
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            results = list(validate_parallel(FrozenQuestionSchema, rows, chunk_size=3, executor=executor))
+        valid = {index: model for result in results for index, model in result.valid.items()}
+        self.assertEqual(len(valid), len(rows))
+        self.assertEqual(len({hash(model) for model in valid.values()}), len(rows))
+        self.assertIsInstance(valid[0].possible_answers, FrozenDict)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_LOGIN_SCHEMA = """
+import json, sys, time
+start = time.perf_counter()
+{import_statement}
+UserLoginSchema(username="testuser", password="StrongP@ssword1")
+# Suffix match - loaded as a package the models are e.g. "interview_prep_models_library.models.tests".
+def loaded(name):
+    return any(module == name or module.endswith("." + name) for module in sys.modules)
+print(json.dumps({{
+    "seconds": time.perf_counter() - start,
+    "modules": [name for name in ("dns", "email_validator", "numpy", "models.tests", "models.scoring")
+                if loaded(name)],
+    "users_loaded": loaded("models.users")
+}}))
+"""
+
+PACKAGE_IMPORT = """
+import importlib.util
+spec = importlib.util.spec_from_file_location(
+    "interview_prep_models_library", {init!r}, submodule_search_locations=[{root!r}])
+package = importlib.util.module_from_spec(spec)
+sys.modules[spec.name] = package
+spec.loader.exec_module(package)
+from interview_prep_models_library import UserLoginSchema
+"""
+
+
+class ImportTestWithUnitTest(unittest.TestCase):
+
+    def run_import(self, import_statement):
+        code = IMPORT_LOGIN_SCHEMA.format(import_statement=import_statement)
+        output = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+        return json.loads(output.stdout)
+
+    def test_user_login_schema_import_is_lazy(self):
+        """Test for importing only UserLoginSchema not loading dns, NumPy or the tests models"""
+        result = self.run_import("from models import UserLoginSchema")
+        self.assertEqual(result["modules"], [])
+        self.assertTrue(result["users_loaded"])
+        print(f"\nImport and first validation of UserLoginSchema: {result['seconds'] * 1000:.1f} ms",
+              file=sys.stderr)
+
+    def test_package_import_is_lazy(self):
+        """Test for the top-level package resolving names lazily"""
+        statement = PACKAGE_IMPORT.format(init=os.path.join(ROOT, "__init__.py"), root=ROOT)
+        result = self.run_import(statement)
+        self.assertEqual(result["modules"], [])
+        self.assertTrue(result["users_loaded"])
+
+    def test_all_names_resolve(self):
+        """Test for every exported name being importable"""
+        import models
+        for name in models.__all__:
+            self.assertIsNotNone(getattr(models, name))
+        with self.assertRaises(AttributeError):
+            models.NotExportedSchema
+
+
+if __name__ == '__main__':
+    unittest.main()
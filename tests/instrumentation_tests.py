@@ -0,0 +1,74 @@
+import unittest
+from pydantic import ValidationError
+from models import (TestSchema,
+                    UserLoginSchema,
+                    enable_instrumentation,
+                    disable_instrumentation,
+                    instrumentation_enabled,
+                    reset_instrumentation,
+                    instrumentation_snapshot,
+                    prometheus_text)
+from bulk_tests import question_data, make_test_data
+
+
+class InstrumentationTestWithUnitTest(unittest.TestCase):
+
+    def setUp(self):
+        reset_instrumentation()
+        enable_instrumentation()
+        self.addCleanup(reset_instrumentation)
+        self.addCleanup(disable_instrumentation)
+
+    def test_counts_and_failures(self):
+        """Test for validation counts and failures by field and error type"""
+        TestSchema(**make_test_data())
+        TestSchema.model_validate_json(TestSchema(**make_test_data()).model_dump_json())
+        with self.assertRaises(ValidationError):
+            TestSchema.model_validate(make_test_data(questions=[question_data(correct_answers=['C'])], level='TRAINEE'))
+        with self.assertRaises(ValidationError):
+            UserLoginSchema(username='', password='StrongP@ssword1')
+        snapshot = instrumentation_snapshot()
+        self.assertEqual(snapshot['TestSchema']['count'], 4)
+        self.assertEqual(snapshot['TestSchema']['failures'], 1)
+        self.assertEqual(snapshot['TestSchema']['errors'], {'level': {'enum': 1}, 'questions': {'value_error': 1}})
+        self.assertEqual(snapshot['UserLoginSchema']['errors'], {'username': {'value_error': 1}})
+        self.assertEqual(snapshot['TestSchema']['buckets'][float('inf')], 4)
+        self.assertGreater(snapshot['TestSchema']['latency_sum'], 0)
+
+    def test_validate_many_rows(self):
+        """Test for validate_many recording every row and per-row failures"""
+        rows = [make_test_data(), make_test_data(level='TRAINEE'), make_test_data()]
+        result = TestSchema.validate_many(iter(rows))
+        self.assertEqual(sorted(result.valid), [0, 2])
+        stats = instrumentation_snapshot()['TestSchema']
+        self.assertEqual((stats['count'], stats['failures']), (3, 1))
+        self.assertEqual(stats['errors'], {'level': {'enum': 1}})
+        self.assertEqual(stats['buckets'][float('inf')], 3)
+        disable_instrumentation()
+        self.assertEqual(TestSchema.validate_many(rows).errors.keys(), {1})
+
+    def test_disabled_records_nothing(self):
+        """Test for no metrics while instrumentation is disabled"""
+        disable_instrumentation()
+        self.assertFalse(instrumentation_enabled())
+        UserLoginSchema(username='testuser', password='StrongP@ssword1')
+        self.assertEqual(instrumentation_snapshot(), {})
+        enable_instrumentation()
+        self.assertTrue(instrumentation_enabled())
+        UserLoginSchema(username='testuser', password='StrongP@ssword1')
+        self.assertEqual(instrumentation_snapshot()['UserLoginSchema']['count'], 1)
+
+    def test_prometheus_text(self):
+        """Test for Prometheus text exposition of the metrics"""
+        with self.assertRaises(ValidationError):
+            UserLoginSchema(username='', password='StrongP@ssword1')
+        text = prometheus_text()
+        self.assertIn('interview_prep_validation_total{model="UserLoginSchema"} 1\n', text)
+        self.assertIn('interview_prep_validation_errors_total{model="UserLoginSchema",field="username",'
+                      'type="value_error"} 1\n', text)
+        self.assertIn('interview_prep_validation_seconds_bucket{model="UserLoginSchema",le="+Inf"} 1\n', text)
+        self.assertIn('# TYPE interview_prep_validation_seconds histogram\n', text)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+from pydantic import ValidationError
+from models import TestSummarySchema, QuestionSchema, AnswerSchema, LazyModelList
+from bulk_tests import question_data, make_test_data
+
+
+class LazyQuestionsTestWithUnitTest(unittest.TestCase):
+
+    def test_header_fields_validated_questions_deferred(self):
+        """Test for TestSummarySchema validating header fields only"""
+        data = make_test_data(questions=[question_data(), question_data(correct_answers=['C'])])
+        summary = TestSummarySchema(**data)
+        self.assertEqual(str(summary.id), '3f97fc69-9253-40c2-94c7-f8307ff70302')
+        self.assertIsInstance(summary.questions, LazyModelList)
+        self.assertFalse(summary.questions.materialized)
+        self.assertEqual(len(summary.questions), 2)
+        self.assertEqual(summary.model_dump()['questions'], data['questions'])
+        with self.assertRaises(ValidationError):
+            summary.questions[0]
+
+    def test_questions_materialized_and_cached(self):
+        """Test for questions validated once on first access"""
+        summary = TestSummarySchema(**make_test_data(answers=[{
+            'id': '3f97fc69-9253-40c2-94c7-f8307ff70303',
+            'question_id': '3f97fc69-9253-40c2-94c7-f8307ff70301',
+            'answer_choice': ['A']
+        }]))
+        question = summary.questions[0]
+        self.assertIsInstance(question, QuestionSchema)
+        self.assertIs(summary.questions[0], question)
+        self.assertTrue(summary.questions.materialized)
+        self.assertIsInstance(list(summary.answers)[0], AnswerSchema)
+        self.assertEqual(summary.model_dump(mode='json')['questions'][0]['id'], '3f97fc69-9253-40c2-94c7-f8307ff70301')
+
+    def test_header_validation_errors(self):
+        """Test for TestSummarySchema rejecting invalid header and question list shape"""
+        for overrides, field in [({'level': 'TRAINEE'}, 'level'),
+                                 ({'questions': []}, 'questions'),
+                                 ({'questions': 'not-a-list'}, 'questions')]:
+            with self.assertRaises(ValidationError) as context:
+                TestSummarySchema(**make_test_data(**overrides))
+            self.assertEqual(context.exception.errors()[0]['loc'][0], field)
+
+    def test_json_round_trip(self):
+        """Test for TestSummarySchema JSON round trip without materializing questions"""
+        summary = TestSummarySchema(**make_test_data())
+        loaded = TestSummarySchema.model_validate_json(summary.model_dump_json())
+        self.assertFalse(loaded.questions.materialized)
+        self.assertEqual(loaded, summary)
+
+    def test_input_list_copied(self):
+        """Test for later changes to the input list not reaching the validated model"""
+        data = make_test_data()
+        questions = data['questions']
+        summary = TestSummarySchema(**data)
+        questions.clear()
+        self.assertEqual(len(summary.questions), 1)
+        self.assertIsInstance(summary.questions[0], QuestionSchema)
+
+    def test_binary_round_trip(self):
+        """Test for TestSummarySchema to_bytes/from_bytes with materialized lazy lists"""
+        summary = TestSummarySchema(**make_test_data())
+        decoded = TestSummarySchema.from_bytes(summary.to_bytes())
+        self.assertIsInstance(decoded.questions, LazyModelList)
+        self.assertTrue(decoded.questions.materialized)
+        self.assertEqual(decoded.model_dump_json(), summary.model_dump_json())
+        self.assertEqual(TestSummarySchema.from_bytes(summary.to_bytes(), validate=True), summary)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import json
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from models import QuestionCreateSchema, QuestionSchema, trusted_mode, validate_parallel
+from bulk_tests import question_data
+
+
+def question_create_data(number, **overrides):
+    data = question_data(question_number=number, **overrides)
+    del data['id']
+    return data
+
+
+def collect(results):
+    valid, errors = {}, {}
+    for result in results:
+        valid.update(result.valid)
+        errors.update(result.errors)
+    return valid, errors
+
+
+class ValidateParallelTestWithUnitTest(unittest.TestCase):
+
+    def setUp(self):
+        self.rows = [question_create_data(number) for number in range(1, 41)]
+        self.rows[5] = question_create_data(6, correct_answers=['C'])
+        self.rows[33] = json.dumps(question_create_data(34)).encode()
+        self.rows[34] = b'{"test_id": '
+
+    def test_in_process_for_small_input(self):
+        """Test for small inputs validated in-process with errors per row"""
+        results = list(validate_parallel(QuestionCreateSchema, self.rows[:10], workers=4, chunk_size=5))
+        self.assertEqual([list(result.valid) for result in results], [[0, 1, 2, 3, 4], [6, 7, 8, 9]])
+        self.assertEqual(list(results[1].errors), [5])
+        self.assertEqual(results[1].errors[5][0]['loc'], ())
+
+    def test_process_pool_keeps_order(self):
+        """Test for results of a process pool streamed back in input order"""
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            results = list(validate_parallel(QuestionCreateSchema, self.rows, chunk_size=4, executor=executor))
+        self.assertEqual(len(results), 10)
+        valid, errors = collect(results)
+        self.assertEqual(sorted(errors), [5, 34])
+        self.assertEqual(errors[34][0]['type'], 'json_invalid')
+        self.assertEqual(len(valid), 38)
+        self.assertEqual(valid[33].question_number, 34)
+        starts = [min(list(result.valid) + list(result.errors)) for result in results]
+        self.assertEqual(starts, list(range(0, 40, 4)))
+
+    def test_trusted_mode_and_invalid_arguments(self):
+        """Test for trusted mode passed to workers and argument checks"""
+        rows = [question_data(question_number=number) for number in range(1, 13)]
+        with trusted_mode(), ProcessPoolExecutor(max_workers=2) as executor:
+            valid, errors = collect(validate_parallel(QuestionSchema, rows, chunk_size=3, executor=executor))
+        self.assertEqual((len(valid), errors), (12, {}))
+        with self.assertRaises(ValueError):
+            validate_parallel(QuestionSchema, rows, chunk_size=0)
+        with self.assertRaises(TypeError):
+            validate_parallel(dict, rows)
+
+
+if __name__ == '__main__':
+    unittest.main()
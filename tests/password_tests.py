@@ -0,0 +1,47 @@
+import unittest
+from pydantic import ValidationError
+from models import PasswordPolicy, UserCreateSchema
+
+
+class PasswordPolicyTestWithUnitest(unittest.TestCase):
+    def test_default_policy_valid_password(self):
+        policy = PasswordPolicy()
+        self.assertEqual(policy.check("StrongP@ssword1"), [])
+        self.assertEqual(policy.validate("StrongP@ssword1"), "StrongP@ssword1")
+
+    def test_default_policy_reports_every_violation(self):
+        violations = PasswordPolicy().check("ABC")
+        self.assertEqual([violation.code for violation in violations],
+                         ["min_length", "lowercase", "digit", "special"])
+        self.assertEqual(violations[0].message, "Password must be at least 10 characters long.")
+
+    def test_configured_policy(self):
+        policy = PasswordPolicy(min_length=4, require_uppercase=False, special_characters="_")
+        self.assertEqual(policy.check("ab_1"), [])
+        self.assertEqual([violation.code for violation in policy.check("ab!1")], ["special"])
+        with self.assertRaises(ValueError) as context:
+            policy.validate("ab")
+        self.assertEqual(str(context.exception),
+                         "Password must be at least 4 characters long.\n"
+                         "Password must contain at least one digit.\n"
+                         "Password must contain at least one special character.\n")
+
+    def test_check_many(self):
+        result = PasswordPolicy().check_many(["StrongP@ssword1", "weakpass", "StrongP@ssword2"])
+        self.assertEqual(list(result), [1])
+
+    def test_user_create_schema_custom_policy(self):
+        class PinUserCreateSchema(UserCreateSchema):
+            password_policy = PasswordPolicy(min_length=6, require_lowercase=False, require_uppercase=False,
+                                             special_characters="")
+
+        user = PinUserCreateSchema(first_name="John", surname="Doe", email="john.doe@example.com",
+                                   password="123456", confirm_password="123456")
+        self.assertEqual(user.password, "123456")
+        with self.assertRaises(ValidationError):
+            UserCreateSchema(first_name="John", surname="Doe", email="john.doe@example.com",
+                             password="123456", confirm_password="123456")
+
+
+if __name__ == "__main__":
+    unittest.main()
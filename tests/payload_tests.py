@@ -0,0 +1,82 @@
+import unittest
+from itertools import islice
+import models
+from models import (
+    PayloadGenerator,
+    QuestionCreateSchema,
+    SingleChoiceQuestion,
+    TestCreateSchema,
+    TestSchema,
+    UserCreateSchema,
+    UserLoginSchema,
+    UserSchema,
+    fuzz,
+    iter_payloads
+)
+from pydantic import BaseModel, ValidationError
+
+EXPORTED_MODELS = [getattr(models, name) for name in models.__all__
+                   if isinstance(getattr(models, name), type) and issubclass(getattr(models, name), BaseModel)]
+MODELS = [UserCreateSchema, UserSchema, TestCreateSchema, QuestionCreateSchema, SingleChoiceQuestion, TestSchema]
+
+
+class PayloadTestWithUnitTest(unittest.TestCase):
+
+    def test_stream_is_deterministic(self):
+        first = [payload.data for payload in iter_payloads(QuestionCreateSchema, 50, seed=7, as_json=True)]
+        second = [payload.data for payload in iter_payloads(QuestionCreateSchema, 50, seed=7, as_json=True)]
+        other = [payload.data for payload in iter_payloads(QuestionCreateSchema, 50, seed=8, as_json=True)]
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, other)
+        self.assertIsInstance(first[0], bytes)
+
+    def test_stream_is_lazy(self):
+        payloads = list(islice(iter_payloads(UserSchema, seed=1), 20))
+        self.assertEqual(len(payloads), 20)
+
+    def test_valid_payloads(self):
+        generator = PayloadGenerator(seed=3)
+        for model in MODELS:
+            for _ in range(50):
+                model.model_validate(generator.valid(model))
+
+    def test_invalid_payloads(self):
+        generator = PayloadGenerator(seed=4, oversized_questions=60)
+        for model in MODELS:
+            for mutation in generator.mutations(model):
+                for _ in range(10):
+                    kind, expected, payload = generator.invalid(model, mutation)
+                    self.assertEqual(kind, mutation)
+                    if expected is False:
+                        with self.assertRaises(ValidationError, msg=f"{model.__name__} {mutation}"):
+                            model.model_validate(payload)
+                    elif expected:
+                        model.model_validate(payload)
+
+    def test_mutations_from_constraints(self):
+        generator = PayloadGenerator()
+        self.assertIn("out_of_range", generator.mutations(TestCreateSchema))
+        self.assertIn("too_long", generator.mutations(UserCreateSchema))
+        self.assertIn("weak_password", generator.mutations(UserCreateSchema))
+        self.assertIn("single_choice_answers", generator.mutations(SingleChoiceQuestion))
+        self.assertIn("oversized_questions", generator.mutations(TestSchema))
+        self.assertNotIn("out_of_range", generator.mutations(UserSchema))
+        self.assertIn("empty_credential", generator.mutations(UserLoginSchema))
+        _, _, payload = generator.invalid(TestSchema, "oversized_questions")
+        self.assertEqual(len(payload["questions"]), generator.oversized_questions)
+        with self.assertRaises(ValueError):
+            generator.invalid(UserSchema, "weak_password")
+        with self.assertRaises(ValueError):
+            PayloadGenerator(mutation_ratio=1.5)
+
+    def test_fuzz(self):
+        self.assertGreaterEqual(len(EXPORTED_MODELS), 16)
+        for model in EXPORTED_MODELS:
+            report = fuzz(model, count=200, seed=5, time_budget=1.0, oversized_questions=100)
+            self.assertTrue(report.ok, msg=f"{model.__name__}: {(report.crashes + report.mismatches)[:1]}")
+            self.assertEqual(report.accepted + report.rejected, 200)
+            self.assertGreater(report.rejected, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import os
+import tempfile
+import unittest
+from models import QuestionBank, QuestionSchema, QuestionType, TestCreateSchema, TestSchema, Level
+from bulk_tests import question_data, make_test_data
+
+
+def make_question(number, text, question_type=QuestionType.TRUE_FALSE):
+    data = question_data(id=f'3f97fc69-9253-40c2-94c7-f8307ff7{number:04d}', question_number=number,
+                         question_text=text)
+    if question_type is not QuestionType.TRUE_FALSE:
+        data.update(question_type=question_type, possible_answers={'A': 'One', 'B': 'Two', 'C': 'Three'},
+                    correct_answers=['A'])
+    return QuestionSchema(**data)
+
+
+def make_request(**overrides):
+    data = {
+        'user_id': '3f97fc69-9253-40c2-94c7-f8307ff70309',
+        'position': 'Software Developer',
+        'level': Level.JUNIOR,
+        'type_of_question': [QuestionType.TRUE_FALSE]
+    }
+    data.update(overrides)
+    return TestCreateSchema(**data)
+
+
+class QuestionBankTestWithUnitTest(unittest.TestCase):
+
+    def setUp(self):
+        self.questions = [
+            make_question(1, 'Is Python a dynamically typed programming language?'),
+            make_question(2, 'Is python a dynamically typed programming language'),
+            make_question(3, 'Which SQL statement removes all rows from a table?', QuestionType.SINGLE_CHOICE),
+            make_question(4, 'Does Docker share the kernel of the host operating system?'),
+        ]
+        self.bank = QuestionBank()
+        self.bank.add(self.questions[0], ['Python'], Level.JUNIOR)
+        self.bank.add(self.questions[1], [' python ', 'Django'], Level.SENIOR)
+        self.bank.add(self.questions[2], ['SQL'], Level.JUNIOR)
+        self.bank.add(self.questions[3], ['Docker', 'Linux'], Level.JUNIOR)
+
+    def test_search(self):
+        """Test for ranked token search over question texts"""
+        hits = self.bank.search('python language', limit=5)
+        self.assertEqual([hit.question.question_number for hit in hits], [1, 2])
+        self.assertEqual(self.bank.search('SQL table rows')[0].question, self.questions[2])
+        self.assertEqual(self.bank.search('kubernetes'), [])
+
+    def test_candidates_for_request(self):
+        """Test for filtering by question type, level and skills"""
+        ids = lambda questions: [question.question_number for question in questions]
+        self.assertEqual(ids(self.bank.candidates(make_request())), [1, 4])
+        self.assertEqual(ids(self.bank.candidates(make_request(skills_or_tools=['PYTHON', 'linux']))), [1, 4])
+        self.assertEqual(ids(self.bank.candidates(make_request(skills_or_tools=['Python'], level=Level.SENIOR))), [2])
+        self.assertEqual(ids(self.bank.candidates(make_request(skills_or_tools=['Python']), match_level=False)), [1, 2])
+        self.assertEqual(ids(self.bank.candidates(make_request(
+            type_of_question=[QuestionType.SINGLE_CHOICE, QuestionType.TRUE_FALSE]), limit=2)), [1, 3])
+
+    def test_near_duplicates(self):
+        """Test for MinHash near-duplicate detection"""
+        duplicates = self.bank.near_duplicates(self.questions[0])
+        self.assertEqual([hit.question for hit in duplicates], [self.questions[1]])
+        self.assertEqual(duplicates[0].score, 1.0)
+        self.assertEqual(self.bank.near_duplicates('Which SQL statement removes all rows from a table'),
+                         [(self.questions[2], 1.0)])
+        self.assertEqual(self.bank.near_duplicates(self.questions[3]), [])
+
+    def test_remove_and_replace(self):
+        """Test for incremental removal and replacement"""
+        self.assertTrue(self.bank.remove(self.questions[1].id))
+        self.assertFalse(self.bank.remove(self.questions[1].id))
+        self.assertEqual(self.bank.near_duplicates(self.questions[0]), [])
+        self.assertEqual(len(self.bank.candidates(make_request(level=Level.SENIOR))), 0)
+        replaced = self.questions[0].model_copy(update={'question_text': 'Is Rust memory safe?'})
+        self.bank.add(replaced)
+        self.assertEqual(len(self.bank), 3)
+        self.assertEqual(self.bank.search('python'), [])
+        self.assertEqual(self.bank.get(replaced.id), replaced)
+
+    def test_add_test_and_save_load(self):
+        """Test for indexing a test and restoring the bank from disk"""
+        test = TestSchema(**make_test_data(skills_or_tools=['Git']))
+        self.bank.add_test(test)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'bank.json')
+            self.bank.save(path)
+            loaded = QuestionBank.load(path)
+        self.assertEqual(len(loaded), 5)
+        request = make_request(skills_or_tools=['git', 'python'])
+        self.assertEqual(loaded.candidates(request), self.bank.candidates(request))
+        self.assertEqual(loaded.near_duplicates(self.questions[0]), self.bank.near_duplicates(self.questions[0]))
+        self.assertEqual(loaded.search('python'), self.bank.search('python'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import os
+import tempfile
+import unittest
+from models import SchemaRegistry, schema_registry, TestSchema, UserSchema, UserLoginSchema
+
+
+class SchemaRegistryTestWithUnitTest(unittest.TestCase):
+
+    def test_exported_models_and_hashes(self):
+        """Test for registry covering exported models with stable hashes"""
+        self.assertIn('TestSchema', schema_registry.names())
+        self.assertIn('UserSchema', schema_registry.names())
+        self.assertNotIn('Level', schema_registry.names())
+        self.assertEqual(schema_registry.json_schema('TestSchema'), TestSchema.model_json_schema())
+        self.assertIs(schema_registry.json_schema('UserSchema'), schema_registry.json_schema('UserSchema'))
+        self.assertEqual(schema_registry.schema_hash('UserSchema'),
+                         SchemaRegistry({'UserSchema': UserSchema}).schema_hash('UserSchema'))
+        self.assertNotEqual(schema_registry.schema_hash('UserSchema'), schema_registry.schema_hash('TestSchema'))
+        with self.assertRaises(KeyError):
+            schema_registry.json_schema('UnknownSchema')
+
+    def test_bundle_round_trip(self):
+        """Test for writing and loading a frozen schema bundle"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'schemas.json')
+            schema_registry.write_bundle(path)
+            loaded = SchemaRegistry.load_bundle(path)
+        self.assertEqual(loaded.version, schema_registry.version)
+        self.assertEqual(loaded.diff(schema_registry.hashes()), [])
+        self.assertEqual(loaded.json_schema('TestSchema', mode='serialization'),
+                         TestSchema.model_json_schema(mode='serialization'))
+        self.assertIn('QuestionSchema', loaded.openapi_components())
+
+    def test_diff_detects_drift(self):
+        """Test for diff reporting changed and missing models"""
+        registry = SchemaRegistry({'UserSchema': UserSchema, 'UserLoginSchema': UserLoginSchema})
+        hashes = registry.hashes()
+        hashes['UserSchema'] = 'changed'
+        hashes['TestSchema'] = 'missing'
+        self.assertEqual(registry.diff(hashes), ['TestSchema', 'UserSchema'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+from array import array
+from unittest import mock
+from uuid import uuid4
+from models import (TestSchema,
+                    QuestionSchema,
+                    AnswerSchema,
+                    QuestionType,
+                    Level,
+                    score_test,
+                    score_tests,
+                    with_result)
+from models import scoring
+
+
+def make_question(question_type, possible_answers, correct_answers):
+    return QuestionSchema(id=uuid4(), test_id=uuid4(), question_number=1, question_text='Question?',
+                          question_type=question_type, possible_answers=possible_answers,
+                          correct_answers=correct_answers)
+
+
+def make_test(choices):
+    questions = [
+        make_question(QuestionType.TRUE_FALSE, {'A': 'TRUE', 'B': 'FALSE'}, ['A']),
+        make_question(QuestionType.SINGLE_CHOICE, {'A': 'Dog', 'B': 'Language', 'C': 'Snake'}, ['B']),
+        make_question(QuestionType.MULTIPLE_CHOICE, {'A': 'Django', 'B': 'Flask', 'C': 'Spring', 'D': 'Rails'},
+                      ['A', 'B']),
+    ]
+    answers = [AnswerSchema(id=uuid4(), question_id=question.id, answer_choice=choice)
+               for question, choice in zip(questions, choices) if choice is not None]
+    return TestSchema(id=uuid4(), user_id=uuid4(), position='Developer', level=Level.JUNIOR,
+                      type_of_question=list(QuestionType), questions=questions, answers=answers)
+
+
+class ScoringTestWithUnitTest(unittest.TestCase):
+
+    def test_score_test(self):
+        """Test for exact-match scoring of a single test"""
+        self.assertEqual(score_test(make_test([['A'], ['B'], ['B', 'A']])), 1.0)
+        self.assertAlmostEqual(score_test(make_test([['A'], ['C'], ['A']])), 1 / 3)
+        self.assertEqual(score_test(make_test([None, None, None])), 0.0)
+        self.assertEqual(score_test(make_test([['A', 'X'], None, None])), 0.0)
+
+    def test_score_test_partial_credit(self):
+        """Test for partial credit of MULTIPLE_CHOICE questions"""
+        test = make_test([None, None, ['A']])
+        self.assertAlmostEqual(score_test(test, partial_credit=True), 0.5 / 3)
+        test = make_test([None, None, ['A', 'C']])
+        self.assertEqual(score_test(test, partial_credit=True), 0.0)
+        test = make_test([None, None, ['A', 'C', 'D']])
+        self.assertEqual(score_test(test, partial_credit=True), 0.0)
+
+    def test_score_tests_matches_single_test_scoring(self):
+        """Test for batch scoring with and without NumPy"""
+        tests = [make_test([['A'], ['B'], ['A']]), make_test([['B'], None, ['A', 'B']]),
+                 make_test([['A'], ['B'], ['A', 'D']])]
+        for partial_credit in (False, True):
+            expected = [score_test(test, partial_credit) for test in tests]
+            with mock.patch.object(scoring, 'np', None):
+                results = score_tests(tests, partial_credit)
+            self.assertIsInstance(results, array)
+            self.assertEqual(list(results), expected)
+            if scoring.np is not None:
+                for result, value in zip(score_tests(tests, partial_credit), expected):
+                    self.assertAlmostEqual(result, value)
+
+    def test_with_result(self):
+        """Test for with_result setting TestSchema.result on a copy"""
+        test = make_test([['A'], ['B'], None])
+        graded = with_result(test)
+        self.assertIsNone(test.result)
+        self.assertAlmostEqual(graded.result, 2 / 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
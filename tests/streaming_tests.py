@@ -0,0 +1,122 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from io import BytesIO
+from pydantic import ValidationError
+from models import (QuestionSchema,
+                    TestSchema,
+                    QuestionType,
+                    Level,
+                    AnswerCreateSchema,
+                    JsonArraySplitter,
+                    aiter_json_array,
+                    iter_json_array,
+                    iter_ndjson,
+                    write_json_array,
+                    write_ndjson)
+
+
+def make_test(number):
+    return TestSchema(
+        id='3f97fc69-9253-40c2-94c7-f8307ff70302',
+        user_id='3f97fc69-9253-40c2-94c7-f8307ff70309',
+        position=f'Developer "{number}", [backend]',
+        type_of_question=[QuestionType.TRUE_FALSE],
+        level=Level.JUNIOR,
+        questions=[QuestionSchema(
+            id='3f97fc69-9253-40c2-94c7-f8307ff70301',
+            test_id='3f97fc69-9253-40c2-94c7-f8307ff70302',
+            question_number=1,
+            question_text='Is {} a dict, \\ or a set?',
+            question_type=QuestionType.TRUE_FALSE,
+            possible_answers={'A': 'TRUE', 'B': 'FALSE'},
+            correct_answers=['B']
+        )]
+    )
+
+
+class StreamingTestWithUnitTest(unittest.TestCase):
+
+    def test_json_array_round_trip(self):
+        """Test for writing and reading back a JSON array in small chunks"""
+        tests = [make_test(number) for number in range(5)]
+        buffer = BytesIO()
+        self.assertEqual(write_json_array(iter(tests), buffer, buffer_size=10), 5)
+        buffer.seek(0)
+        self.assertEqual(list(iter_json_array(TestSchema, buffer, chunk_size=7)), tests)
+
+    def test_ndjson_round_trip_with_path(self):
+        """Test for writing and reading back an NDJSON file"""
+        tests = [make_test(number) for number in range(3)]
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'tests.ndjson')
+            self.assertEqual(write_ndjson(tests, path), 3)
+            self.assertEqual(list(iter_ndjson(TestSchema, path)), tests)
+
+    def test_invalid_item_raises_validation_error(self):
+        """Test for reader yielding valid items before the invalid one"""
+        buffer = BytesIO(b'[' + make_test(1).model_dump_json().encode() + b', {"id": 1}]')
+        reader = iter_json_array(TestSchema, buffer)
+        self.assertIsInstance(next(reader), TestSchema)
+        with self.assertRaises(ValidationError):
+            next(reader)
+
+    def test_splitter_rejects_malformed_arrays(self):
+        """Test for JsonArraySplitter with malformed documents"""
+        for document in [b'{"a": 1}', b'[1,]', b'[1] [2]']:
+            with self.assertRaises(ValueError):
+                splitter = JsonArraySplitter()
+                splitter.feed(document)
+                splitter.close()
+        with self.assertRaises(ValueError):
+            JsonArraySplitter().close()
+
+
+async def byte_stream(payload, chunk_size):
+    for start in range(0, len(payload), chunk_size):
+        yield payload[start:start + chunk_size]
+
+
+class AsyncStreamingTestWithUnitTest(unittest.IsolatedAsyncioTestCase):
+
+    async def test_async_json_array(self):
+        """Test for async reader validating items of a chunked stream, inline and in a thread"""
+        answers = [AnswerCreateSchema(question_id='3f97fc69-9253-40c2-94c7-f8307ff70301', answer_choice=[key])
+                   for key in 'ABCDE']
+        payload = b'[' + b','.join(answer.model_dump_json().encode() for answer in answers) + b']'
+        for offload in (False, True):
+            read = [answer async for answer in aiter_json_array(AnswerCreateSchema, byte_stream(payload, 7),
+                                                                offload=offload)]
+            self.assertEqual(read, answers)
+
+    async def test_async_yields_to_event_loop(self):
+        """Test for other tasks running between chunks"""
+        ticks = []
+
+        async def ticker():
+            while True:
+                ticks.append(len(read))
+                await asyncio.sleep(0)
+
+        read = []
+        task = asyncio.create_task(ticker())
+        payload = b'[' + b','.join([make_test(1).model_dump_json().encode()] * 3) + b']'
+        async for test in aiter_json_array(TestSchema, byte_stream(payload, 64)):
+            read.append(test)
+        task.cancel()
+        self.assertEqual(len(read), 3)
+        self.assertGreater(len(ticks), 3)
+
+    async def test_async_errors(self):
+        """Test for async reader raising on invalid items and truncated arrays"""
+        with self.assertRaises(ValidationError):
+            async for _ in aiter_json_array(TestSchema, byte_stream(b'[{"id": 1}]', 4)):
+                pass
+        with self.assertRaises(ValueError):
+            async for _ in aiter_json_array(TestSchema, byte_stream(b'[', 4)):
+                pass
+
+
+if __name__ == '__main__':
+    unittest.main()
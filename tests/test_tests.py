@@ -8,7 +8,11 @@ from models import (TestCreateSchema,
                     AnswerSchema,
                     TestSchema,
                     Level,
-                    QuestionType)
+                    QuestionType,
+                    TrueFalseQuestion,
+                    SingleChoiceQuestion,
+                    MultipleChoiceQuestion,
+                    question_create_adapter)
 
 
 class TestTestWithUnitTest(unittest.TestCase):
@@ -258,6 +262,81 @@ class TestTestWithUnitTest(unittest.TestCase):
         self.assertEqual(len(schema.correct_answers), 1)
         self.assertEqual(len(schema.possible_answers), 3)
 
+    def test_question_create_schema_invalid_answers(self):
+        """Test for QuestionCreateSchema with answers breaking question type rules"""
+        base = {
+            'test_id': '3f97fc69-9253-40c2-94c7-f8307ff70302',
+            'question_number': 1,
+            'question_text': 'What is Python?',
+        }
+        test_cases = [
+            ({'question_type': QuestionType.SINGLE_CHOICE,
+              'possible_answers': {'A': 'Dog', 'B': 'Snake'},
+              'correct_answers': ['C']},
+             'Invalid keys in correct_answers'),
+            ({'question_type': QuestionType.TRUE_FALSE,
+              'possible_answers': {'A': 'TRUE', 'B': 'FALSE', 'C': 'MAYBE'},
+              'correct_answers': ['A']},
+             'possible answers have only two options'),
+            ({'question_type': QuestionType.SINGLE_CHOICE,
+              'possible_answers': {'A': 'Dog', 'B': 'Snake'},
+              'correct_answers': ['A', 'B']},
+             'requires exactly one correct answer'),
+        ]
+        for data, message in test_cases:
+            with self.assertRaises(ValidationError) as context:
+                QuestionCreateSchema(**base, **data)
+            self.assertIn(message, str(context.exception))
+
+    def test_question_create_variant_discriminator(self):
+        """Test for QuestionCreateVariant selecting the model by question_type"""
+        base = {
+            'test_id': '3f97fc69-9253-40c2-94c7-f8307ff70302',
+            'question_number': 1,
+            'question_text': 'Example question text',
+            'possible_answers': {'A': 'TRUE', 'B': 'FALSE'},
+            'correct_answers': ['A']
+        }
+        expected = [
+            ('TRUE FALSE', TrueFalseQuestion),
+            ('SINGLE CHOICE', SingleChoiceQuestion),
+            ('MULTIPLE CHOICE', MultipleChoiceQuestion),
+        ]
+        for question_type, model in expected:
+            question = question_create_adapter.validate_python({**base, 'question_type': question_type})
+            self.assertIsInstance(question, model)
+            self.assertIsInstance(question, QuestionCreateSchema)
+
+    def test_question_create_variant_invalid(self):
+        """Test for QuestionCreateVariant rejecting answers breaking question type rules"""
+        base = {
+            'test_id': '3f97fc69-9253-40c2-94c7-f8307ff70302',
+            'question_number': 1,
+            'question_text': 'Example question text',
+        }
+        test_cases = [
+            ({'question_type': 'TRUE FALSE',
+              'possible_answers': {'A': 'TRUE', 'B': 'FALSE', 'C': 'MAYBE'},
+              'correct_answers': ['A']},
+             'too_long'),
+            ({'question_type': 'SINGLE CHOICE',
+              'possible_answers': {'A': 'Dog', 'B': 'Snake'},
+              'correct_answers': ['A', 'B']},
+             'too_long'),
+            ({'question_type': 'MULTIPLE CHOICE',
+              'possible_answers': {'A': 'Dog', 'B': 'Snake'},
+              'correct_answers': ['A', 'C']},
+             'value_error'),
+            ({'question_type': 'OPEN',
+              'possible_answers': {'A': 'Dog', 'B': 'Snake'},
+              'correct_answers': ['A']},
+             'union_tag_invalid'),
+        ]
+        for data, error_type in test_cases:
+            with self.assertRaises(ValidationError) as context:
+                question_create_adapter.validate_python({**base, **data})
+            self.assertEqual(context.exception.errors()[0]['type'], error_type)
+
     def test_answer_create_schema_valid(self):
         """Test for valid AnswerCreateSchema"""
         data = {
@@ -302,6 +381,157 @@ class TestTestWithUnitTest(unittest.TestCase):
         self.assertEqual(schema.position, 'Software Developer')
         self.assertEqual(schema.level, Level.JUNIOR)
 
+    def test_test_schema_question_lookup(self):
+        """Test for TestSchema question and answer lookups"""
+        questions = [
+            QuestionSchema(id=uuid4(), test_id='3f97fc69-9253-40c2-94c7-f8307ff70302', question_number=number,
+                           question_text='Example question text', question_type=QuestionType.TRUE_FALSE,
+                           possible_answers={'A': 'TRUE', 'B': 'FALSE'}, correct_answers=['B'])
+            for number in (1, 2)
+        ]
+        answer = AnswerSchema(id=uuid4(), question_id=questions[1].id, answer_choice=['A'])
+        schema = TestSchema(
+            id='3f97fc69-9253-40c2-94c7-f8307ff70302',
+            user_id='3f97fc69-9253-40c2-94c7-f8307ff70309',
+            position='Software Developer',
+            type_of_question=[QuestionType.TRUE_FALSE],
+            level=Level.JUNIOR,
+            questions=questions,
+            answers=[answer]
+        )
+        self.assertIs(schema.get_question(questions[0].id), questions[0])
+        self.assertIs(schema.get_question_by_number(2), questions[1])
+        self.assertIsNone(schema.get_question(uuid4()))
+        self.assertIs(schema.answer_for(questions[1]), answer)
+        self.assertIsNone(schema.answer_for(questions[0].id))
+        self.assertIs(schema.index, schema.index)
+        schema.answers.append(AnswerSchema(id=uuid4(), question_id=questions[0].id, answer_choice=['B']))
+        self.assertEqual(schema.answer_for(questions[0]).answer_choice, ['B'])
+
+    def test_test_schema_equality_ignores_index(self):
+        """Test for TestSchema equality after the index has been built"""
+        data = {
+            'id': '3f97fc69-9253-40c2-94c7-f8307ff70302',
+            'user_id': '3f97fc69-9253-40c2-94c7-f8307ff70309',
+            'position': 'Software Developer',
+            'type_of_question': [QuestionType.TRUE_FALSE],
+            'level': Level.JUNIOR,
+            'questions': [{
+                'id': '3f97fc69-9253-40c2-94c7-f8307ff70301',
+                'test_id': '3f97fc69-9253-40c2-94c7-f8307ff70302',
+                'question_number': 1,
+                'question_text': 'Example question text',
+                'question_type': QuestionType.TRUE_FALSE,
+                'possible_answers': {'A': 'TRUE', 'B': 'FALSE'},
+                'correct_answers': ['B']
+            }]
+        }
+        schema = TestSchema.model_validate(data)
+        schema.get_question_by_number(1)
+        self.assertEqual(schema, TestSchema.model_validate_json(schema.model_dump_json()))
+        self.assertEqual(TestSchema.from_bytes(schema.to_bytes()), schema)
+        self.assertEqual(TestSchema.model_validate(data, context={'check_integrity': True}), schema)
+        self.assertNotEqual(schema, TestSchema.model_validate({**data, 'result': 1.0}))
+
+    def test_test_schema_integrity(self):
+        """Test for optional TestSchema integrity validation"""
+        question_id = '3f97fc69-9253-40c2-94c7-f8307ff70301'
+        question = {
+            'id': question_id,
+            'test_id': '3f97fc69-9253-40c2-94c7-f8307ff70302',
+            'question_number': 1,
+            'question_text': 'Example question text',
+            'question_type': QuestionType.TRUE_FALSE,
+            'possible_answers': {'A': 'TRUE', 'B': 'FALSE'},
+            'correct_answers': ['B']
+        }
+        base = {
+            'id': '3f97fc69-9253-40c2-94c7-f8307ff70302',
+            'user_id': '3f97fc69-9253-40c2-94c7-f8307ff70309',
+            'position': 'Software Developer',
+            'type_of_question': [QuestionType.TRUE_FALSE],
+            'level': Level.JUNIOR,
+        }
+        test_cases = [
+            ({'questions': [question, {**question, 'id': str(uuid4())}]}, 'Question numbers must be unique.'),
+            ({'questions': [question, {**question, 'question_number': 2}]}, 'Question ids must be unique.'),
+            ({'questions': [question], 'answers': [{'id': str(uuid4()), 'question_id': str(uuid4())}]},
+             'Answers refer to questions outside the test'),
+            ({'questions': [question], 'answers': [{'id': str(uuid4()), 'question_id': question_id}] * 2},
+             'Each question can have only one answer.'),
+        ]
+        for data, message in test_cases:
+            TestSchema.model_validate({**base, **data})
+            with self.assertRaises(ValidationError) as context:
+                TestSchema.model_validate({**base, **data}, context={'check_integrity': True})
+            self.assertIn(message, str(context.exception))
+
+        class StrictTestSchema(TestSchema):
+            check_integrity = True
+
+        with self.assertRaises(ValidationError):
+            StrictTestSchema(**base, **test_cases[0][0])
+
+    def test_test_schema_apply_patch(self):
+        """Test for TestSchema.apply_patch validating only patched fields"""
+        question = QuestionSchema(
+            id='3f97fc69-9253-40c2-94c7-f8307ff70301',
+            test_id='3f97fc69-9253-40c2-94c7-f8307ff70302',
+            question_number=1,
+            question_text='Example question text',
+            question_type=QuestionType.TRUE_FALSE,
+            possible_answers={'A': 'TRUE', 'B': 'FALSE'},
+            correct_answers=['B']
+        )
+        schema = TestSchema(
+            id='3f97fc69-9253-40c2-94c7-f8307ff70302',
+            user_id='3f97fc69-9253-40c2-94c7-f8307ff70309',
+            position='Software Developer',
+            type_of_question=[QuestionType.TRUE_FALSE],
+            level=Level.JUNIOR,
+            questions=[question]
+        )
+        patched = schema.apply_patch({
+            'is_solved': 'true',
+            'answers': [{'id': str(uuid4()), 'question_id': str(question.id), 'answer_choice': ['A']}]
+        })
+        self.assertFalse(schema.is_solved)
+        self.assertEqual(schema.answers, [])
+        self.assertTrue(patched.is_solved)
+        self.assertIsInstance(patched.answers[0], AnswerSchema)
+        self.assertIs(patched.questions, schema.questions)
+        self.assertIs(patched.apply_patch({'result': 1.0}).answers[0], patched.answers[0])
+
+        test_cases = [
+            ({'type_of_question': [QuestionType.TRUE_FALSE, QuestionType.TRUE_FALSE]}, 'type_of_question'),
+            ({'questions': []}, 'questions'),
+            ({'unknown': 1}, 'unknown'),
+        ]
+        for patch, field in test_cases:
+            with self.assertRaises(ValidationError) as context:
+                schema.apply_patch(patch)
+            self.assertEqual(context.exception.errors()[0]['loc'], (field,))
+        with self.assertRaises(ValidationError) as context:
+            schema.apply_patch({'answers': [{'id': str(uuid4()), 'question_id': str(uuid4())}]},
+                               context={'check_integrity': True})
+        self.assertIn('Answers refer to questions outside the test', str(context.exception))
+
+    def test_question_schema_apply_patch_runs_model_validator(self):
+        """Test for apply_patch re-running validate_answers when answers change"""
+        question = QuestionSchema(
+            id='3f97fc69-9253-40c2-94c7-f8307ff70301',
+            test_id='3f97fc69-9253-40c2-94c7-f8307ff70302',
+            question_number=1,
+            question_text='Example question text',
+            question_type=QuestionType.TRUE_FALSE,
+            possible_answers={'A': 'TRUE', 'B': 'FALSE'},
+            correct_answers=['B']
+        )
+        self.assertEqual(question.apply_patch({'question_text': 'Changed'}).question_text, 'Changed')
+        with self.assertRaises(ValidationError) as context:
+            question.apply_patch({'correct_answers': ['C']})
+        self.assertIn('Invalid keys in correct_answers', str(context.exception))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,114 @@
+import tempfile
+import unittest
+from datetime import datetime, timezone
+from uuid import UUID
+from pydantic import ValidationError
+from models import (FileQuestionSetCache,
+                    TestSchema,
+                    QuestionSchema,
+                    UserSchema,
+                    QuestionType,
+                    Level,
+                    Role,
+                    trusted_mode,
+                    set_trusted_sample_rate)
+
+
+def trusted_test_row():
+    return {
+        'id': UUID('3f97fc69-9253-40c2-94c7-f8307ff70302'),
+        'user_id': UUID('3f97fc69-9253-40c2-94c7-f8307ff70309'),
+        'position': 'Software Developer',
+        'level': Level.JUNIOR,
+        'number_of_question': 1,
+        'type_of_question': [QuestionType.TRUE_FALSE],
+        'skills_or_tools': None,
+        'is_solved': False,
+        'questions': [{
+            'id': UUID('3f97fc69-9253-40c2-94c7-f8307ff70301'),
+            'test_id': UUID('3f97fc69-9253-40c2-94c7-f8307ff70302'),
+            'question_number': 1,
+            'question_text': 'Example question text',
+            'question_type': QuestionType.TRUE_FALSE,
+            'possible_answers': {'A': 'TRUE', 'B': 'FALSE'},
+            'correct_answers': ['B']
+        }],
+        'answers': [{
+            'id': UUID('3f97fc69-9253-40c2-94c7-f8307ff70303'),
+            'question_id': UUID('3f97fc69-9253-40c2-94c7-f8307ff70301'),
+            'answer_choice': ['A']
+        }],
+        'result': None
+    }
+
+
+class TrustedModeTestWithUnitTest(unittest.TestCase):
+
+    def tearDown(self):
+        set_trusted_sample_rate(0.0)
+
+    def test_from_trusted_builds_nested_models(self):
+        """Test for from_trusted constructing nested questions and answers"""
+        row = trusted_test_row()
+        test = TestSchema.from_trusted(row)
+        self.assertIsInstance(test.questions[0], QuestionSchema)
+        self.assertEqual(test.answers[0].answer_choice, ['A'])
+        self.assertEqual(test.model_dump(), TestSchema.model_validate(row).model_dump())
+
+    def test_from_trusted_skips_validation(self):
+        """Test for from_trusted accepting data that would not pass validation"""
+        user = UserSchema.from_trusted({
+            'id': UUID('3f97fc69-9253-40c2-94c7-f8307ff70309'),
+            'first_name': 'Alice',
+            'surname': 'Smith',
+            'username_email': 'not-an-email',
+            'roles': [Role.ADMIN],
+            'create_datetime': datetime.now(timezone.utc)
+        })
+        self.assertEqual(user.username_email, 'not-an-email')
+        self.assertEqual(user.tests, [])
+
+    def test_trusted_mode_model_validate_and_validate_many(self):
+        """Test for trusted_mode switching model_validate and validate_many to construction"""
+        row = trusted_test_row()
+        row['questions'][0]['correct_answers'] = ['C']
+        with self.assertRaises(ValidationError):
+            TestSchema.model_validate(row)
+        with trusted_mode():
+            self.assertEqual(TestSchema.model_validate(row).questions[0].correct_answers, ['C'])
+            result = TestSchema.validate_many([row, trusted_test_row()])
+        self.assertEqual(sorted(result.valid), [0, 1])
+        with self.assertRaises(ValidationError):
+            TestSchema.model_validate(row)
+
+    def test_trusted_mode_keeps_validating_paths(self):
+        """Test for from_bytes(validate=True) and the file cache validating inside trusted_mode"""
+        row = trusted_test_row()
+        row['questions'][0]['correct_answers'] = ['C']
+        test = TestSchema.from_trusted(row)
+        with tempfile.TemporaryDirectory() as directory:
+            cache = FileQuestionSetCache(directory)
+            cache.set(test.fingerprint(), test.questions)
+            with trusted_mode():
+                with self.assertRaises(ValidationError):
+                    TestSchema.from_bytes(test.to_bytes(), validate=True)
+                with self.assertRaises(ValidationError):
+                    cache.get(test.fingerprint())
+                self.assertEqual(TestSchema.from_bytes(test.to_bytes()), test)
+
+    def test_trusted_sample_rate(self):
+        """Test for sampled validation of trusted rows"""
+        row = trusted_test_row()
+        row['questions'][0]['correct_answers'] = ['C']
+        set_trusted_sample_rate(1.0)
+        with self.assertRaises(ValidationError):
+            TestSchema.from_trusted(row)
+        with trusted_mode():
+            result = TestSchema.validate_many([row, trusted_test_row()])
+        self.assertEqual(sorted(result.errors), [0])
+        with self.assertRaises(ValueError):
+            set_trusted_sample_rate(1.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,13 +1,24 @@
 import unittest
 from datetime import datetime, timezone
+from typing import Annotated
 from uuid import uuid4
 from models import (
+    Timestamp,
+    TimestampFormat,
+    utc_now,
     UserCreateSchema,
     UserSchema,
     UserLoginSchema,
-    Role
+    Role,
+    RoleSet,
+    configure_email_cache,
+    email_cache
 )
-from pydantic import ValidationError
+from pydantic import Field, ValidationError
+
+
+class CompactUserSchema(UserSchema):
+    create_datetime: Annotated[datetime, Timestamp(TimestampFormat.EPOCH_MILLIS)] = Field(default_factory=utc_now)
 
 
 class UserTestWithUnitest(unittest.TestCase):
@@ -48,6 +59,25 @@ class UserTestWithUnitest(unittest.TestCase):
             )
         self.assertIn("Passwords do not match", str(context.exception))
 
+    def test_user_create_schema_apply_patch_password(self):
+        user = UserCreateSchema(
+            first_name="John",
+            surname="Doe",
+            email="john.doe@example.com",
+            password="StrongP@ssword1",
+            confirm_password="StrongP@ssword1",
+        )
+        with self.assertRaises(ValidationError) as context:
+            user.apply_patch({"password": "OtherStr0ng!Pass"})
+        self.assertIn("Passwords do not match", str(context.exception))
+        for patch in ({"confirm_password": "OtherStr0ng!Pass", "password": "OtherStr0ng!Pass"},
+                      {"password": "OtherStr0ng!Pass", "confirm_password": "OtherStr0ng!Pass"}):
+            patched = user.apply_patch(patch)
+            self.assertEqual(patched.password, "OtherStr0ng!Pass")
+            self.assertEqual(patched.confirm_password, "OtherStr0ng!Pass")
+            self.assertEqual(UserCreateSchema.model_validate(patched.model_dump()), patched)
+        self.assertEqual(user.apply_patch({"first_name": "Jane"}).password, user.password)
+
     def test_user_schema_valid(self):
         create_datetime = datetime.now(timezone.utc)
         user = UserSchema(
@@ -114,6 +144,149 @@ class UserTestWithUnitest(unittest.TestCase):
                 password="StrongP@ssword1"
             )
 
+    def test_email_cache_disabled_by_default(self):
+        email_cache.clear()
+        UserSchema(id=uuid4(), first_name="Bob", surname="Brown", username_email="bob.brown@example.com")
+        self.assertEqual(email_cache.info().currsize, 0)
+        self.assertEqual(email_cache.info().misses, 0)
+
+    def test_email_cache_hits_and_errors(self):
+        configure_email_cache(2)
+        self.addCleanup(configure_email_cache, 0)
+        self.addCleanup(email_cache.clear)
+        for _ in range(3):
+            user = UserSchema(id=uuid4(), first_name="Bob", surname="Brown", username_email="Bob.Brown@Example.com")
+            self.assertEqual(user.username_email, "Bob.Brown@example.com")
+        for _ in range(2):
+            with self.assertRaises(ValidationError) as context:
+                UserSchema(id=uuid4(), first_name="Bob", surname="Brown", username_email="invalid-email")
+            self.assertIn("value is not a valid email address", str(context.exception))
+        info = email_cache.info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (3, 2, 2))
+
+    def test_email_cache_evicts_least_recently_used(self):
+        configure_email_cache(2)
+        self.addCleanup(configure_email_cache, 0)
+        self.addCleanup(email_cache.clear)
+        for email in ["a@example.com", "b@example.com", "a@example.com", "c@example.com", "a@example.com"]:
+            email_cache.validate(email)
+        self.assertEqual(email_cache.info().hits, 2)
+        email_cache.validate("b@example.com")
+        self.assertEqual(email_cache.info().misses, 4)
+
+    def test_role_set_operations(self):
+        roles = RoleSet([Role.ADMIN, "REGULAR", Role.ADMIN])
+        self.assertIs(roles, RoleSet([Role.REGULAR, Role.ADMIN]))
+        self.assertEqual(list(roles), [Role.REGULAR, Role.ADMIN])
+        self.assertEqual(len(roles), 2)
+        self.assertIn("ADMIN", roles)
+        self.assertNotIn(Role.MANAGER, roles)
+        self.assertTrue(RoleSet([Role.ADMIN]) <= roles)
+        self.assertTrue(roles.issuperset([Role.REGULAR]))
+        self.assertEqual(roles | RoleSet([Role.MANAGER]), [Role.REGULAR, Role.MANAGER, Role.ADMIN])
+        self.assertIs(RoleSet.from_int(int(roles)), roles)
+        self.assertEqual(int(RoleSet([Role.REGULAR])), Role.REGULAR.bit)
+        with self.assertRaises(ValueError):
+            RoleSet(["OWNER"])
+        with self.assertRaises(ValueError):
+            RoleSet.from_int(1 << len(Role))
+
+    def test_role_set_hash_matches_equality(self):
+        roles = RoleSet([Role.ADMIN, Role.REGULAR])
+        for other in (frozenset({Role.ADMIN, Role.REGULAR}), frozenset({"ADMIN", "REGULAR"})):
+            self.assertEqual(roles, other)
+            self.assertEqual(hash(roles), hash(other))
+            self.assertIn(other, {roles})
+            self.assertIn(roles, {other})
+        self.assertNotEqual(roles, (Role.REGULAR, Role.ADMIN))
+        self.assertEqual(roles, [Role.REGULAR, Role.ADMIN])
+
+    def test_user_schema_roles(self):
+        user = UserSchema(
+            id=uuid4(),
+            first_name="Alice",
+            surname="Smith",
+            username_email="alice.smith@example.com",
+            roles=["TESTS_SERVICE", "REGULAR"],
+            create_datetime=datetime.now(timezone.utc)
+        )
+        self.assertIsInstance(user.roles, RoleSet)
+        self.assertTrue(user.has_role(Role.TESTS_SERVICE))
+        self.assertFalse(user.has_role(Role.ADMIN))
+        self.assertTrue(user.has_any(Role.ADMIN, "TESTS_SERVICE"))
+        self.assertFalse(user.has_any(Role.ADMIN, Role.AUTH_SERVICE))
+        self.assertIn('"roles":["REGULAR","TESTS_SERVICE"]', user.model_dump_json())
+        self.assertEqual(UserSchema.model_validate_json(user.model_dump_json()).roles, user.roles)
+        with self.assertRaises(ValidationError):
+            UserSchema.model_validate({**user.model_dump(), "roles": ["OWNER"]})
+
+    def test_user_schema_tests_kept_as_given(self):
+        tests = [str(uuid4()), {"id": str(uuid4()), "position": "Developer"}, {"position": "Tester"}, 7]
+        user = UserSchema(
+            id=uuid4(),
+            first_name="Alice",
+            surname="Smith",
+            username_email="alice.smith@example.com",
+            tests=tests,
+            create_datetime=datetime.now(timezone.utc)
+        )
+        self.assertEqual(user.tests, tests)
+        self.assertEqual(UserSchema.public_view().to_python(user, mode="json")["tests"], tests)
+
+    def test_user_schema_views(self):
+        users = [UserSchema(
+            id=uuid4(),
+            first_name=name,
+            surname="Smith",
+            username_email=f"{name.lower()}@example.com",
+            roles=[Role.ADMIN],
+            create_datetime=datetime.now(timezone.utc)
+        ) for name in ("Alice", "Bob")]
+        view = UserSchema.public_view()
+        self.assertIs(view, UserSchema.view(exclude=["roles"]))
+        self.assertEqual(view.to_json(users[0]).decode(), users[0].model_dump_json(exclude={"roles"}))
+        self.assertEqual(view.to_python(users[0]), users[0].model_dump(exclude={"roles"}))
+        self.assertEqual(view.list_to_json(iter(users)).decode(),
+                         "[" + ",".join(user.model_dump_json(exclude={"roles"}) for user in users) + "]")
+        self.assertEqual(UserSchema.view(include={"id"}).to_json(users[1]).decode(),
+                         users[1].model_dump_json(include={"id"}))
+        with self.assertRaises(ValueError):
+            UserSchema.view(exclude={"password"})
+        with self.assertRaises(TypeError):
+            UserSchema.view(include={"id": True})
+
+    def test_user_schema_create_datetime_default(self):
+        before = datetime.now(timezone.utc)
+        users = [UserSchema(id=uuid4(), first_name="Alice", surname="Smith", username_email="alice@example.com")
+                 for _ in range(2)]
+        for user in users:
+            self.assertIsInstance(user.create_datetime, datetime)
+            self.assertIsNotNone(user.create_datetime.tzinfo)
+            self.assertGreaterEqual(user.create_datetime, before)
+        self.assertLessEqual(users[0].create_datetime, users[1].create_datetime)
+
+    def test_user_schema_create_datetime_inputs(self):
+        expected = datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc)
+        for value in (expected, "2024-05-01T12:30:00Z", "2024-05-01T12:30:00+00:00", 1714566600, 1714566600000):
+            user = UserSchema(id=uuid4(), first_name="Alice", surname="Smith", username_email="alice@example.com",
+                              create_datetime=value)
+            self.assertEqual(user.create_datetime, expected)
+        with self.assertRaises(ValidationError):
+            UserSchema(id=uuid4(), first_name="Alice", surname="Smith", username_email="alice@example.com",
+                       create_datetime="yesterday")
+
+    def test_user_schema_epoch_millis_format(self):
+        create_datetime = datetime(2024, 5, 1, 12, 30, 0, 123000, tzinfo=timezone.utc)
+        user = CompactUserSchema(id=uuid4(), first_name="Alice", surname="Smith", username_email="alice@example.com",
+                                 create_datetime=create_datetime)
+        self.assertEqual(user.model_dump(mode="json")["create_datetime"], 1714566600123)
+        self.assertEqual(user.model_dump()["create_datetime"], create_datetime)
+        self.assertEqual(CompactUserSchema.model_validate_json(user.model_dump_json()), user)
+        self.assertEqual(UserSchema.model_validate_json(user.model_dump_json()).create_datetime, create_datetime)
+        schema = CompactUserSchema.model_json_schema(mode="serialization")["properties"]["create_datetime"]
+        self.assertEqual(schema["type"], "integer")
+        self.assertEqual(UserSchema.model_json_schema()["properties"]["create_datetime"]["format"], "date-time")
+
 
 if __name__ == "__main__":
     unittest.main()